@@ -0,0 +1,93 @@
+from argparse import ArgumentParser, Namespace
+from asyncio import run, sleep
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from multiprocessing import get_context
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, AsyncIterator, Sequence
+
+from pynvim_pp.nvim import conn
+from pynvim_pp.rpc_types import Method, MsgType
+
+from chadtree._registry import ____
+from chadtree.registry import rpc
+from chadtree.settings.load import initial as initial_settings
+from chadtree.state.executor import AsyncExecutor, new_pools
+
+from .fs import Shape
+from .measure import Sample, fmt
+from .nvim import serve
+from .tree import bench as tree
+from .vcs import bench as vcs
+
+assert ____ or True
+
+
+def _parse_args() -> Namespace:
+    parser = ArgumentParser()
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument(
+        "--shape",
+        dest="shapes",
+        action="append",
+        choices=tuple(shape.name for shape in Shape),
+    )
+    parser.add_argument("--no-vcs", dest="vcs", action="store_false")
+    return parser.parse_args()
+
+
+async def _default(_: MsgType, method: Method, params: Sequence[Any]) -> None: ...
+
+
+@asynccontextmanager
+async def _nvim() -> AsyncIterator[None]:
+    """
+    Fake nvim in another process, like the real one would be
+    """
+
+    with TemporaryDirectory() as tmp:
+        socket = Path(tmp) / "nvim.sock"
+        proc = get_context("spawn").Process(target=serve, args=(socket,), daemon=True)
+        proc.start()
+        try:
+            while not socket.exists():
+                await sleep(0.01)
+            die: Future = Future()
+            async with conn(die, socket=socket, default=_default):
+                yield None
+        finally:
+            proc.terminate()
+
+
+def _print(sample: Sample) -> None:
+    print(fmt(sample), flush=True)
+
+
+async def _main() -> None:
+    args = _parse_args()
+    shapes = tuple(Shape[name] for name in args.shapes or (s.name for s in Shape))
+
+    async with _nvim():
+        _, handlers = rpc.drain()
+        settings = await initial_settings(handlers.values())
+        exec = AsyncExecutor(pools=new_pools())
+
+        for shape in shapes:
+            async for sample in tree(
+                exec,
+                settings=settings,
+                shape=shape,
+                files=args.files,
+                rounds=args.rounds,
+            ):
+                _print(sample)
+
+    if args.vcs:
+        for sample in await vcs(files=args.files, rounds=args.rounds):
+            _print(sample)
+
+
+if __name__ == "__main__":
+    run(_main())
@@ -0,0 +1,78 @@
+from enum import Enum, auto
+from math import isqrt
+from os import symlink
+from pathlib import Path, PurePath
+from typing import AbstractSet, MutableSet
+
+from std2.types import never
+
+
+class Shape(Enum):
+    wide = auto()
+    deep = auto()
+    links = auto()
+
+
+_DEPTH = 64
+
+
+def _touch(path: Path) -> None:
+    path.write_bytes(b"")
+
+
+def _wide(root: Path, files: int) -> AbstractSet[PurePath]:
+    dirs: MutableSet[PurePath] = {root}
+    width = max(1, isqrt(files))
+    for idx in range(files):
+        parent = root / f"d{idx % width}"
+        if parent not in dirs:
+            parent.mkdir()
+            dirs.add(parent)
+        _touch(parent / f"f{idx}.txt")
+    return dirs
+
+
+def _deep(root: Path, files: int) -> AbstractSet[PurePath]:
+    dirs: MutableSet[PurePath] = {root}
+    parent, per = root, max(1, files // _DEPTH)
+    for idx in range(files):
+        if idx and not idx % per:
+            parent = parent / f"d{idx // per}"
+            parent.mkdir()
+            dirs.add(parent)
+        _touch(parent / f"f{idx}.txt")
+    return dirs
+
+
+def _links(root: Path, files: int) -> AbstractSet[PurePath]:
+    """
+    Half the entries are symlinks, to files, to folders, and every 20th dangling
+    """
+
+    dirs = _wide(root, files=files // 2)
+    targets = sorted(dirs)
+    for idx in range(files - files // 2):
+        parent = targets[idx % len(targets)]
+        if not idx % 20:
+            dst: PurePath = root / f"missing{idx}"
+        elif idx % 2:
+            dst = targets[(idx * 7) % len(targets)]
+        else:
+            dst = parent / f"f{idx * 2}.txt"
+        symlink(dst, parent / f"l{idx}")
+    return dirs
+
+
+def synthesize(root: Path, shape: Shape, files: int) -> AbstractSet[PurePath]:
+    """
+    Populate `root`, returns the folders to expand
+    """
+
+    if shape is Shape.wide:
+        return _wide(root, files=files)
+    elif shape is Shape.deep:
+        return _deep(root, files=files)
+    elif shape is Shape.links:
+        return _links(root, files=files)
+    else:
+        never(shape)
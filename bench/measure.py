@@ -0,0 +1,84 @@
+from asyncio import create_task, sleep
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from statistics import quantiles
+from time import monotonic
+from tracemalloc import get_traced_memory, start, stop
+from typing import Any, AsyncIterator, Awaitable, Callable, MutableSequence, Sequence
+
+from std2.locale import si_prefixed
+
+_TICK = 0.001
+
+
+@dataclass(frozen=True)
+class Sample:
+    name: str
+    latencies: Sequence[float]
+    loop_lag: float
+    peak_mem: int
+
+
+@asynccontextmanager
+async def _loop_lag() -> AsyncIterator[Callable[[], float]]:
+    """
+    Worst delay seen by the event loop, ie. how long the UI would have stalled
+    """
+
+    worst = 0.0
+
+    async def cont() -> None:
+        nonlocal worst
+        while True:
+            t0 = monotonic()
+            await sleep(_TICK)
+            worst = max(worst, monotonic() - t0 - _TICK)
+
+    task = create_task(cont())
+    try:
+        yield lambda: worst
+    finally:
+        task.cancel()
+
+
+async def measure(
+    name: str, rounds: int, run: Callable[[], Awaitable[Any]]
+) -> Sample:
+    """
+    Timed rounds first, then one more under `tracemalloc` for peak memory
+    """
+
+    latencies: MutableSequence[float] = []
+    async with _loop_lag() as lag:
+        for _ in range(rounds):
+            t0 = monotonic()
+            await run()
+            latencies.append(monotonic() - t0)
+
+    start()
+    try:
+        await run()
+        _, peak = get_traced_memory()
+    finally:
+        stop()
+
+    return Sample(name=name, latencies=latencies, loop_lag=lag(), peak_mem=peak)
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}ms"
+
+
+def fmt(sample: Sample) -> str:
+    lat = sample.latencies
+    cuts = quantiles(lat, n=100, method="inclusive") if len(lat) > 1 else (*lat,) * 99
+    return "  ".join(
+        (
+            sample.name.ljust(28),
+            f"p50 {_ms(cuts[49])}".ljust(14),
+            f"p95 {_ms(cuts[94])}".ljust(14),
+            f"max {_ms(max(lat))}".ljust(14),
+            f"lag {_ms(sample.loop_lag)}".ljust(14),
+            f"mem {si_prefixed(sample.peak_mem, precision=1)}B",
+        )
+    )
@@ -0,0 +1,167 @@
+from asyncio import StreamReader, StreamWriter, get_running_loop, run, start_unix_server
+from os import getpid
+from pathlib import PurePath
+from typing import Any, Callable, Mapping, MutableMapping, MutableSequence, Sequence
+
+from msgpack import ExtType, Packer, Unpacker, packb
+
+from chadtree.consts import FM_FILETYPE, URI_SCHEME
+
+_REQUEST, _RESPONSE, _NOTIFY = 0, 1, 2
+_BUF, _WIN, _TAB = 0, 1, 2
+
+_API_INFO = {
+    "version": {"major": 0, "minor": 10, "patch": 0, "api_level": 12},
+    "functions": [],
+    "ui_events": [],
+    "ui_options": [],
+    "error_types": {"Exception": {"id": 0}, "Validation": {"id": 1}},
+    "types": {
+        "Buffer": {"id": _BUF, "prefix": "nvim_buf_"},
+        "Window": {"id": _WIN, "prefix": "nvim_win_"},
+        "Tabpage": {"id": _TAB, "prefix": "nvim_tabpage_"},
+    },
+}
+
+_FUNCTIONS: Mapping[str, Any] = {
+    "has": 1,
+    "line": 1,
+    "getpid": getpid(),
+    "stdpath": "/tmp",
+    "getcwd": "/",
+}
+
+
+class NvimError(Exception): ...
+
+
+def _ext(code: int, num: int) -> ExtType:
+    return ExtType(code, packb(num))
+
+
+class Nvim:
+    """
+    Just enough of nvim for CHADTree to draw into a single window
+    """
+
+    def __init__(self) -> None:
+        self.buf, self.win, self.tab = _ext(_BUF, 1), _ext(_WIN, 1000), _ext(_TAB, 1)
+        self.lines: MutableSequence[str] = [""]
+        self.vars: MutableMapping[Any, MutableMapping[str, Any]] = {}
+        self.namespaces: MutableMapping[str, int] = {}
+        self.calls = 0
+
+        self._handlers: Mapping[str, Callable[..., Any]] = {
+            "nvim_get_api_info": lambda: (1, _API_INFO),
+            "nvim_call_atomic": self._atomic,
+            "nvim_call_function": lambda fn, _: _FUNCTIONS.get(fn),
+            "nvim_create_namespace": self._namespace,
+            "nvim_get_current_buf": lambda: self.buf,
+            "nvim_get_current_win": lambda: self.win,
+            "nvim_get_current_tabpage": lambda: self.tab,
+            "nvim_list_bufs": lambda: (self.buf,),
+            "nvim_list_wins": lambda: (self.win,),
+            "nvim_tabpage_list_wins": lambda _: (self.win,),
+            "nvim_win_get_buf": lambda _: self.buf,
+            "nvim_win_get_cursor": lambda _: (1, 0),
+            "nvim_win_get_height": lambda _: 40,
+            "nvim_win_get_width": lambda _: 40,
+            "nvim_win_get_position": lambda _: (0, 0),
+            "nvim_buf_get_mark": lambda *_: (0, 0),
+            "nvim_buf_get_name": lambda _: f"{URI_SCHEME}://bench",
+            "nvim_buf_line_count": lambda _: len(self.lines),
+            "nvim_buf_get_lines": self._get_lines,
+            "nvim_buf_set_lines": self._set_lines,
+            "nvim_get_option_value": lambda name, _: self._option(name),
+            "nvim_buf_get_option": lambda _, name: self._option(name),
+            "nvim_win_get_option": lambda _, name: self._option(name),
+            "nvim_get_var": lambda name: self._get_var(None, name),
+            "nvim_buf_get_var": self._get_var,
+            "nvim_win_get_var": self._get_var,
+            "nvim_set_var": lambda name, val: self._set_var(None, name, val),
+            "nvim_buf_set_var": self._set_var,
+            "nvim_win_set_var": self._set_var,
+        }
+
+    def _option(self, name: str) -> Any:
+        return FM_FILETYPE if name == "filetype" else False
+
+    def _namespace(self, name: str) -> int:
+        return self.namespaces.setdefault(name, len(self.namespaces) + 1)
+
+    def _get_var(self, owner: Any, name: str) -> Any:
+        try:
+            return self.vars.get(owner, {})[name]
+        except KeyError:
+            raise NvimError(f"Key not found: {name}")
+
+    def _set_var(self, owner: Any, name: str, val: Any) -> None:
+        self.vars.setdefault(owner, {})[name] = val
+
+    def _span(self, start: int, end: int) -> slice:
+        count = len(self.lines)
+        return slice(
+            start if start >= 0 else count + 1 + start,
+            end if end >= 0 else count + 1 + end,
+        )
+
+    def _get_lines(self, _: Any, start: int, end: int, __: bool) -> Sequence[str]:
+        return self.lines[self._span(start, end)]
+
+    def _set_lines(
+        self, _: Any, start: int, end: int, __: bool, lines: Sequence[str]
+    ) -> None:
+        self.lines[self._span(start, end)] = lines
+        if not self.lines:
+            self.lines.append("")
+
+    def _atomic(self, calls: Sequence[Sequence[Any]]) -> Any:
+        results: MutableSequence[Any] = []
+        for idx, (method, params) in enumerate(calls):
+            try:
+                results.append(self.handle(method, params))
+            except NvimError as e:
+                return (results, (idx, 0, str(e)))
+        return (results, None)
+
+    def handle(self, method: str, params: Sequence[Any]) -> Any:
+        self.calls += 1
+        if handler := self._handlers.get(method):
+            return handler(*params)
+        else:
+            return None
+
+
+async def _session(nvim: Nvim, reader: StreamReader, writer: StreamWriter) -> None:
+    packer, unpacker = Packer(), Unpacker(raw=False)
+    while data := await reader.read(1 << 16):
+        unpacker.feed(data)
+        for msg in unpacker:
+            if msg[0] == _REQUEST:
+                _, msg_id, method, params = msg
+                try:
+                    resp = (_RESPONSE, msg_id, None, nvim.handle(method, params))
+                except NvimError as e:
+                    resp = (_RESPONSE, msg_id, (0, str(e)), None)
+                writer.write(packer.pack(resp))
+        await writer.drain()
+    writer.close()
+
+
+async def _serve(socket: PurePath) -> None:
+    nvim = Nvim()
+
+    async def cont(reader: StreamReader, writer: StreamWriter) -> None:
+        await _session(nvim, reader=reader, writer=writer)
+
+    server = await start_unix_server(cont, path=str(socket))
+    async with server:
+        await get_running_loop().create_future()
+
+
+def serve(socket: PurePath) -> None:
+    """
+    Stand in msgpack-RPC nvim, meant to run in its own process
+    """
+
+    run(_serve(socket))
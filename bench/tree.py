@@ -0,0 +1,108 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import AsyncIterator
+from uuid import uuid4
+
+from pynvim_pp.buffer import Buffer
+from pynvim_pp.nvim import Nvim
+from pynvim_pp.types import NoneType
+
+from chadtree.fs.cartographer import new, update
+from chadtree.fs.types import DiskUsage, Node
+from chadtree.nvim.types import Markers
+from chadtree.settings.types import Settings
+from chadtree.state.executor import AsyncExecutor
+from chadtree.state.types import Index
+from chadtree.transitions.redraw import _update
+from chadtree.version_ctl.types import VCStatus
+from chadtree.view.render import render
+from chadtree.view.types import Derived
+
+from .fs import Shape, synthesize
+from .measure import Sample, measure
+
+
+async def _walk(
+    exec: AsyncExecutor, settings: Settings, root: Path, index: Index
+) -> Node:
+    return await new(
+        exec,
+        root=root,
+        follow_links=settings.follow_links,
+        index=index,
+        page_size=settings.max_children,
+        pages={},
+        show_hidden=True,
+        ignores=settings.ignores,
+    )
+
+
+async def _render(settings: Settings, node: Node, index: Index) -> Derived:
+    return await render(
+        node,
+        settings=settings,
+        index=index,
+        selection=frozenset(),
+        filter_pattern=None,
+        markers=Markers(quick_fix={}, bookmarks={}),
+        diagnostics={},
+        disk_usage=DiskUsage(),
+        grep=None,
+        vc=VCStatus(),
+        follow_links=settings.follow_links,
+        show_hidden=True,
+        current=None,
+    )
+
+
+async def bench(
+    exec: AsyncExecutor, settings: Settings, shape: Shape, files: int, rounds: int
+) -> AsyncIterator[Sample]:
+    """
+    Walk, partial re-walk, render and paint a synthetic tree
+    """
+
+    name = f"{shape.name} {files}"
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        index = synthesize(root, shape=shape, files=files)
+        node = await _walk(exec, settings=settings, root=root, index=index)
+        deepest = max(index, key=lambda path: len(path.parts))
+
+        async def walk() -> None:
+            await _walk(exec, settings=settings, root=root, index=index)
+
+        async def rewalk() -> None:
+            await update(
+                exec,
+                root=node,
+                follow_links=settings.follow_links,
+                index=index,
+                page_size=settings.max_children,
+                pages={},
+                show_hidden=True,
+                ignores=settings.ignores,
+                invalidate_dirs={deepest},
+            )
+
+        yield await measure(f"walk {name}", rounds=rounds, run=walk)
+        yield await measure(f"update {name}", rounds=rounds, run=rewalk)
+
+        derived = await _render(settings, node=node, index=index)
+
+        async def rend() -> None:
+            await _render(settings, node=node, index=index)
+
+        yield await measure(f"render {name}", rounds=rounds, run=rend)
+
+        buf = await Buffer.get_current()
+        ns = await Nvim.create_namespace(uuid4())
+
+        async def paint() -> None:
+            atomic, _ = _update(
+                True, buf=buf, ns=ns, derived=derived, hashed_lines=("",)
+            )
+            await atomic.commit(NoneType)
+
+        yield await measure(f"paint {name}", rounds=rounds, run=paint)
+
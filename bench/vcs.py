@@ -0,0 +1,63 @@
+from concurrent.futures import Executor
+from itertools import cycle
+from pathlib import PurePath
+from random import Random
+from typing import Iterator, Sequence
+
+from chadtree.state.executor import MeteredPool, MeteredProcessPool
+from chadtree.version_ctl.git import parse
+from chadtree.version_ctl.types import VCStatus
+
+from .measure import Sample, measure
+
+_ROOT = PurePath("/", "bench")
+_MARKERS = (" M", "M ", "A ", "??", "!!", "MM", " D")
+
+
+def porcelain(files: int, seed: int) -> str:
+    """
+    `git status --porcelain -z`, spread over a few levels of folders
+
+    Same files for every `seed`, only their markers change, like successive polls
+    """
+
+    names, markers = Random(files), Random(seed)
+
+    def cont() -> Iterator[str]:
+        for idx in range(files):
+            parts = (f"d{names.randint(0, 16)}" for _ in range(names.randint(0, 6)))
+            name = PurePath(*parts, f"f{idx}.py")
+            if names.random() < 0.01:
+                yield f"R  {name}.moved"
+                yield str(name)
+            else:
+                yield f"{markers.choice(_MARKERS)} {name}"
+
+    return "\0".join(cont())
+
+
+async def _sample(th: Executor, name: str, outputs: Sequence[str]) -> Sample:
+    mains = cycle(outputs)
+    # Warm up, so that spawning workers is not counted
+    vc = await parse(
+        th, root=_ROOT, main=porcelain(1, seed=-1), submodules="", prev=VCStatus()
+    )
+
+    async def run() -> None:
+        nonlocal vc
+        vc = await parse(th, root=_ROOT, main=next(mains), submodules="", prev=vc)
+
+    return await measure(name, rounds=len(outputs), run=run)
+
+
+async def bench(files: int, rounds: int) -> Sequence[Sample]:
+    """
+    The same porcelain, parsed in threads and then in worker processes
+    """
+
+    outputs = tuple(porcelain(files, seed=seed) for seed in range(rounds))
+    with MeteredPool("thread", workers=2) as th:
+        threads = await _sample(th, name=f"vcs thread {files}", outputs=outputs)
+    with MeteredProcessPool("process", workers=2) as pp:
+        procs = await _sample(pp, name=f"vcs process {files}", outputs=outputs)
+    return threads, procs
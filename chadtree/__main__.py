@@ -1,6 +1,5 @@
 from argparse import ArgumentParser, Namespace
 from asyncio import run as arun
-from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext, redirect_stderr, redirect_stdout
 from io import StringIO
 from pathlib import Path, PurePath
@@ -15,7 +14,6 @@ from sys import (
 )
 from textwrap import dedent
 from typing import Any, Union
-from webbrowser import open as open_w
 
 from .consts import GIL_SWITCH, IS_WIN, MIGRATION_URI, REQUIREMENTS, RT_DIR, RT_PY
 
@@ -29,6 +27,8 @@ try:
 except ImportError:
     msg = "For python < 3.8.2 please install using the branch -- legacy"
     print(msg, file=stderr)
+    from webbrowser import open as open_w
+
     open_w(MIGRATION_URI)
     exit(1)
 
@@ -152,8 +152,9 @@ elif command == "run":
         print(msg, end="", file=stderr)
         exit(1)
     else:
-        with ThreadPoolExecutor() as th:
-            arun(init(args.socket, ppid=args.ppid, th=th))
+        # Process pool workers re-import this module as `__mp_main__`
+        if __name__ == "__main__":
+            arun(init(args.socket, ppid=args.ppid))
 
 
 else:
@@ -1,45 +1,63 @@
 from .transitions import (
     autocmds,
+    background,
+    bulk_rename,
+    cancel,
     click,
     collapse,
     copy_name,
     cut_copy,
     delete,
+    disk_usage,
     filter,
     focus,
+    fuzzy,
+    grep,
     help,
     link,
     marks,
     new,
     noop,
     open_system,
+    profile,
     quit,
+    recover,
     refresh,
     rename,
     resize,
     schedule_update,
     selection,
     stat,
+    stats,
     toggle_exec,
     toggle_open,
     toggles,
+    undo,
 )
 
 assert autocmds
+assert background
+assert bulk_rename
+assert cancel
 assert click
 assert collapse
 assert copy_name
 assert cut_copy
 assert delete
+assert disk_usage
 assert filter
 assert focus
+assert fuzzy
+assert grep
 assert help
 assert link
 assert marks
 assert new
 assert noop
 assert open_system
+assert profile
 assert quit
+assert recover
 assert refresh
 assert refresh
 assert rename
@@ -47,8 +65,10 @@ assert resize
 assert schedule_update
 assert selection
 assert stat
+assert stats
 assert toggle_exec
 assert toggle_open
 assert toggles
+assert undo
 
 ____ = None
@@ -10,22 +10,31 @@ from asyncio import (
     wait,
     wrap_future,
 )
-from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import Future
 from contextlib import AbstractAsyncContextManager
 from dataclasses import replace
 from functools import wraps
 from logging import DEBUG as DEBUG_LVL
 from logging import INFO
 from multiprocessing import cpu_count
+from os import linesep
 from pathlib import Path, PurePath
 from platform import uname
 from string import Template
 from sys import executable, exit
 from textwrap import dedent
 from time import monotonic
-from typing import Any, Optional, Sequence, cast
+from typing import (
+    Any,
+    Awaitable,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
-from pynvim_pp.highlight import highlight
 from pynvim_pp.logging import log, suppress_and_log
 from pynvim_pp.nvim import Nvim, conn
 from pynvim_pp.rpc_types import (
@@ -47,20 +56,27 @@ from std2.sys import autodie
 
 from ._registry import ____
 from .consts import DEBUG, RENDER_RETRIES
-from .registry import autocmd, dequeue_event, enqueue_event, rpc
+from .nvim.highlights import load_defined
+from .registry import autocmd, dequeue_event, enqueue_event, interrupts, rpc
 from .settings.load import initial as initial_settings
 from .settings.localization import init as init_locale
+from .state.executor import Pools, new_pools
 from .state.load import initial as initial_state
 from .state.types import State
 from .timeit import timeit
 from .transitions.autocmds import setup
+from .transitions.disk_usage import schedule_du
+from .transitions.recover import recover
 from .transitions.redraw import redraw
 from .transitions.schedule_update import scheduled_update
 from .transitions.types import Stage
 
 assert ____ or True
 
+_T = TypeVar("_T")
+
 _CB = RPCallable[Optional[Stage]]
+_Phases = MutableSequence[Tuple[str, float]]
 
 _die = Cancellation()
 
@@ -72,23 +88,35 @@ def _autodie(ppid: int) -> AbstractAsyncContextManager:
         return autodie(ppid)
 
 
-async def _profile(t1: float) -> None:
+async def _timed(phases: _Phases, name: str, co: Awaitable[_T]) -> _T:
+    t1 = monotonic()
+    with timeit(f"startup->{name}"):
+        ret = await co
+    phases.append((name, monotonic() - t1))
+    return ret
+
+
+async def _profile(t0: float, t1: float, phases: _Phases) -> None:
     t2 = monotonic()
     info = uname()
-    msg = f"""
-    First msg  {int((t2 - t1) * 1000)}ms
-    Arch       {info.machine}
-    Processor  {info.processor}
-    Cores      {cpu_count()}
-    System     {info.system}
-    Version    {info.version}
-    Python     {Path(executable).resolve(strict=True)}
-    """
-    await Nvim.write(dedent(msg))
+    rows = (
+        ("First paint", f"{int((t2 - t0) * 1000)}ms"),
+        *((f"  {name}", f"{int(secs * 1000)}ms") for name, secs in phases),
+        ("First msg", f"{int((t2 - t1) * 1000)}ms"),
+        ("Arch", info.machine),
+        ("Processor", info.processor),
+        ("Cores", str(cpu_count())),
+        ("System", info.system),
+        ("Version", info.version),
+        ("Python", str(Path(executable).resolve(strict=True))),
+    )
+    msg = linesep.join(f"{key.ljust(12)} {val}" for key, val in rows)
+    await Nvim.write(msg)
 
 
 async def _sched(ref: RefCell[State]) -> None:
     await enqueue_event(False, method=scheduled_update.method, params=(True,))
+    await enqueue_event(True, method=recover.method)
 
     async for _ in aticker(ref.val.settings.polling_rate, immediately=False):
         if ref.val.vim_focus:
@@ -103,15 +131,26 @@ def _trans(handler: _CB) -> _CB:
     return cast(_CB, f)
 
 
+def _interrupt(handler: _CB, ref: RefCell[State]) -> _CB:
+    @wraps(handler)
+    async def f(*params: Any) -> None:
+        with suppress_and_log():
+            await handler(ref.val, *params)
+
+    return cast(_CB, f)
+
+
 async def _default(_: MsgType, method: Method, params: Sequence[Any]) -> None:
     await enqueue_event(True, method=method, params=params)
 
 
-async def _go(loop: AbstractEventLoop, client: RPClient) -> None:
-    th = ThreadPoolExecutor()
+async def _go(
+    loop: AbstractEventLoop, client: RPClient, pools: Pools, t0: float
+) -> None:
+    phases: _Phases = []
     atomic, handlers = rpc.drain()
     try:
-        settings = await initial_settings(handlers.values())
+        settings = await _timed(phases, "settings", initial_settings(handlers.values()))
     except DecodeError as e:
         tpl = """
                 Some options may have changed.
@@ -124,16 +163,24 @@ async def _go(loop: AbstractEventLoop, client: RPClient) -> None:
         await Nvim.write(ms, error=True)
         exit(1)
     else:
-        hl = highlight(*settings.view.hl_context.groups)
-        await (atomic + autocmd.drain() + hl).commit(NoneType)
-        state_ref = RefCell(await initial_state(settings, th=th))
-
         init_locale(settings.lang)
-        with suppress_and_log():
-            await setup(settings)
+
+        async def ui() -> None:
+            await (atomic + autocmd.drain()).commit(NoneType)
+            await load_defined()
+            with suppress_and_log():
+                await setup(settings)
+
+        state, _ = await gather(
+            _timed(phases, "state", initial_state(settings, pools=pools)),
+            _timed(phases, "ui", ui()),
+        )
+        state_ref = RefCell(state)
 
         for f in handlers.values():
-            ff = _trans(f)
+            ff = (
+                _interrupt(f, ref=state_ref) if f.method in interrupts else _trans(f)
+            )
             client.register(ff)
 
         focus_ref = RefCell[Optional[PurePath]](None)
@@ -142,7 +189,7 @@ async def _go(loop: AbstractEventLoop, client: RPClient) -> None:
 
         async def step(method: Method, params: Sequence[Any]) -> None:
             if handler := cast(Optional[_CB], handlers.get(method)):
-                with suppress_and_log():
+                with suppress_and_log(), timeit(method):
                     async with lock:
                         if stage := await handler(state_ref.val, *params):
                             state_ref.val = stage.state
@@ -169,8 +216,7 @@ async def _go(loop: AbstractEventLoop, client: RPClient) -> None:
                         sync, method, params = await get
                         task = step(method, params=params)
                         if sync:
-                            with timeit(method):
-                                await task
+                            await task
                         else:
                             transcient = create_task(task)
             finally:
@@ -188,7 +234,8 @@ async def _go(loop: AbstractEventLoop, client: RPClient) -> None:
                     if state := state_ref.val:
                         for attempt in range(1, RENDER_RETRIES + 1):
                             try:
-                                derived = await redraw(state, focus=focus_ref.val)
+                                with timeit("redraw"):
+                                    derived = await redraw(state, focus=focus_ref.val)
                             except NvimError as e:
                                 if attempt == RENDER_RETRIES:
                                     log.warning("%s", e)
@@ -197,11 +244,12 @@ async def _go(loop: AbstractEventLoop, client: RPClient) -> None:
                                     state, node_row_lookup=derived.node_row_lookup
                                 )
                                 focus_ref.val = None
+                                await schedule_du(state)
                                 break
 
                         if settings.profiling and not has_drawn:
                             has_drawn = True
-                            await _profile(t1=t1)
+                            await _profile(t0=t0, t1=t1, phases=phases)
 
             while True:
                 await event.wait()
@@ -214,15 +262,15 @@ async def _go(loop: AbstractEventLoop, client: RPClient) -> None:
         await gather(c1(), c2(), _sched(state_ref))
 
 
-async def init(socket: ServerAddr, ppid: int, th: ThreadPoolExecutor) -> None:
-    loop = get_running_loop()
-    loop.set_default_executor(th)
+async def init(socket: ServerAddr, ppid: int) -> None:
+    t0, loop, pools = monotonic(), get_running_loop(), new_pools()
+    loop.set_default_executor(pools.interactive)
     log.setLevel(DEBUG_LVL if DEBUG else INFO)
 
     die: Future = Future()
 
     async def cont() -> None:
         async with conn(die, socket=socket, default=_default) as client:
-            await _go(loop, client=client)
+            await _go(loop, client=client, pools=pools, t0=t0)
 
     await gather(wrap_future(die), cont())
@@ -0,0 +1,255 @@
+from asyncio import FIRST_COMPLETED, Future, get_running_loop, wait
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from json import dumps, loads
+from os import scandir, stat
+from os.path import sep
+from pathlib import PurePath
+from typing import (
+    AbstractSet,
+    Deque,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from zlib import compress, decompress
+
+from .ignore import Rules, inherit, is_ignored, load, path_ignored
+from .types import Ignored
+
+_VERSION = 1
+
+Listing = Tuple[int, Sequence[str], Sequence[str]]
+
+
+@dataclass(frozen=True)
+class Atlas:
+    root: PurePath
+    ignores: str
+    tree: Mapping[PurePath, Listing]
+    paths: Sequence[str]
+
+
+def _fingerprint(ignores: Ignored) -> str:
+    return repr(
+        (
+            sorted(ignores.name_exact),
+            ignores.name_glob,
+            ignores.path_glob,
+            ignores.gitignore,
+        )
+    )
+
+
+def _listdir(
+    path: PurePath, ignores: Ignored, rules: Rules, top: bool
+) -> Tuple[Listing, Rules]:
+    if ignores.gitignore and not top:
+        rules = (*rules, *load(path))
+    mtime, files, dirs = 0, [], []
+    try:
+        mtime = stat(path, follow_symlinks=False).st_mtime_ns
+        with scandir(path) as it:
+            for dirent in it:
+                child = PurePath(dirent)
+                try:
+                    is_dir = dirent.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if path_ignored(child, ignores=ignores):
+                    pass
+                elif rules and is_ignored(rules, path=child, is_dir=is_dir):
+                    pass
+                elif is_dir:
+                    dirs.append(dirent.name)
+                else:
+                    files.append(dirent.name)
+    except OSError:
+        pass
+
+    return (mtime, tuple(files), tuple(dirs)), rules
+
+
+def _mtimes(paths: Sequence[PurePath]) -> Sequence[int]:
+    def cont() -> Iterator[int]:
+        for path in paths:
+            try:
+                yield stat(path, follow_symlinks=False).st_mtime_ns
+            except OSError:
+                yield -1
+
+    return tuple(cont())
+
+
+def _reachable(
+    root: PurePath, tree: Mapping[PurePath, Listing]
+) -> Iterator[Tuple[PurePath, str, Listing]]:
+    stack = [(root, "")]
+    while stack:
+        path, prefix = stack.pop()
+        if listing := tree.get(path):
+            yield path, prefix, listing
+            _, _, dirs = listing
+            stack.extend((path / name, f"{prefix}{name}{sep}") for name in dirs)
+
+
+def _atlas(root: PurePath, ignores: str, tree: Mapping[PurePath, Listing]) -> Atlas:
+    reachable: MutableMapping[PurePath, Listing] = {}
+    paths = []
+    for path, prefix, listing in _reachable(root, tree=tree):
+        reachable[path] = listing
+        _, files, dirs = listing
+        paths.extend(f"{prefix}{name}" for name in files)
+        paths.extend(f"{prefix}{name}{sep}" for name in dirs)
+
+    return Atlas(root=root, ignores=ignores, tree=reachable, paths=paths)
+
+
+def contains(atlas: Atlas, path: PurePath) -> bool:
+    """
+    Answered from the listings alone, `False` also means "not indexed"
+    """
+
+    if path in atlas.tree:
+        return True
+    elif listing := atlas.tree.get(path.parent):
+        _, files, dirs = listing
+        return path.name in files or path.name in dirs
+    else:
+        return False
+
+
+def _rules(root: PurePath, path: PurePath) -> Rules:
+    rules, parent = [*inherit(root)], root
+    for part in path.relative_to(root).parts:
+        parent = parent / part
+        rules.extend(load(parent))
+    return tuple(rules)
+
+
+async def _walk(
+    th: Executor,
+    tree: MutableMapping[PurePath, Listing],
+    tops: Mapping[PurePath, Rules],
+    ignores: Ignored,
+    concurrency: int,
+) -> None:
+    loop = get_running_loop()
+    known = {**tree}
+    queue: Deque[Tuple[PurePath, Rules, bool]] = deque(
+        (path, rules, True) for path, rules in tops.items()
+    )
+    inflight: MutableMapping[Future, PurePath] = {}
+
+    try:
+        while queue or inflight:
+            while queue and len(inflight) < concurrency:
+                path, rules, top = queue.popleft()
+                fut = loop.run_in_executor(th, _listdir, path, ignores, rules, top)
+                inflight[fut] = path
+
+            done, _ = await wait(inflight.keys(), return_when=FIRST_COMPLETED)
+            for fut in done:
+                path = inflight.pop(fut)
+                listing, rules = fut.result()
+                tree[path] = listing
+                _, _, dirs = listing
+                queue.extend(
+                    (child, rules, False)
+                    for name in dirs
+                    if (child := path / name) not in known
+                )
+    finally:
+        for fut in inflight:
+            fut.cancel()
+
+
+async def build(
+    th: Executor, root: PurePath, ignores: Ignored, concurrency: int
+) -> Atlas:
+    """
+    Every path under `root`, minus the ignored ones
+    """
+
+    loop = get_running_loop()
+    tree: MutableMapping[PurePath, Listing] = {}
+    rules = inherit(root) if ignores.gitignore else ()
+    await _walk(
+        th, tree=tree, tops={root: rules}, ignores=ignores, concurrency=concurrency
+    )
+    return await loop.run_in_executor(th, _atlas, root, _fingerprint(ignores), tree)
+
+
+async def update(
+    th: Executor,
+    atlas: Atlas,
+    ignores: Ignored,
+    concurrency: int,
+    mtimes: Optional[Mapping[PurePath, int]] = None,
+) -> Atlas:
+    """
+    Rescan folders whose mtime moved on, `mtimes` defaults to stat-ing every folder
+    """
+
+    if _fingerprint(ignores) != atlas.ignores:
+        return await build(th, root=atlas.root, ignores=ignores, concurrency=concurrency)
+
+    loop = get_running_loop()
+    if mtimes is None:
+        known = tuple(atlas.tree)
+        chunk = max(1, len(known) // concurrency + 1)
+        chunks = [known[idx : idx + chunk] for idx in range(0, len(known), chunk)]
+        stats = [loop.run_in_executor(th, _mtimes, paths) for paths in chunks]
+        mtimes = {
+            path: mtime
+            for paths, fut in zip(chunks, stats)
+            for path, mtime in zip(paths, await fut)
+        }
+
+    stale: AbstractSet[PurePath] = {
+        path
+        for path, mtime in mtimes.items()
+        if (listing := atlas.tree.get(path)) and listing[0] != mtime
+    }
+    if not stale:
+        return atlas
+    else:
+        tree = {k: v for k, v in atlas.tree.items() if k not in stale}
+        tops = {
+            path: _rules(atlas.root, path=path) if ignores.gitignore else ()
+            for path in stale
+        }
+        await _walk(th, tree=tree, tops=tops, ignores=ignores, concurrency=concurrency)
+        return await loop.run_in_executor(th, _atlas, atlas.root, atlas.ignores, tree)
+
+
+def encode_atlas(atlas: Atlas) -> bytes:
+    root = atlas.root
+    listings = [
+        (prefix, mtime, files, dirs)
+        for _, prefix, (mtime, files, dirs) in _reachable(root, tree=atlas.tree)
+    ]
+    json = {
+        "version": _VERSION,
+        "root": str(root),
+        "ignores": atlas.ignores,
+        "tree": listings,
+    }
+    return compress(dumps(json, ensure_ascii=False, check_circular=False).encode())
+
+
+def decode_atlas(data: bytes) -> Atlas:
+    json = loads(decompress(data).decode())
+    if json["version"] != _VERSION:
+        raise ValueError(json["version"])
+    else:
+        root = PurePath(json["root"])
+        tree = {
+            root / prefix: (mtime, tuple(files), tuple(dirs))
+            for prefix, mtime, files, dirs in json["tree"]
+        }
+        return _atlas(root, ignores=json["ignores"], tree=tree)
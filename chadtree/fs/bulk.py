@@ -0,0 +1,60 @@
+from pathlib import PurePath
+from typing import AbstractSet, Iterator, Mapping, MutableMapping, Sequence
+from uuid import uuid4
+
+
+def _temp(path: PurePath) -> PurePath:
+    return path.with_name(f".{path.name}.{uuid4().hex}")
+
+
+def conflicts(
+    operations: Mapping[PurePath, PurePath], existing: AbstractSet[PurePath]
+) -> AbstractSet[PurePath]:
+    """
+    Destinations that are taken, and will not be vacated by the same batch
+    """
+
+    seen: MutableMapping[PurePath, int] = {}
+    for dst in operations.values():
+        seen[dst] = seen.get(dst, 0) + 1
+
+    dupes = {dst for dst, count in seen.items() if count > 1}
+    taken = {
+        dst
+        for src, dst in operations.items()
+        if dst in existing and dst not in operations and dst != src
+    }
+    nested = {
+        dst
+        for src, dst in operations.items()
+        if not operations.keys().isdisjoint(src.parents)
+        or not operations.keys().isdisjoint(dst.parents)
+    }
+    return dupes | taken | nested
+
+
+def plan_renames(
+    operations: Mapping[PurePath, PurePath],
+) -> Sequence[Mapping[PurePath, PurePath]]:
+    """
+    Renames in phases, each phase can run concurrently
+
+    Swaps and longer cycles are broken by parking one member under a temp name
+    """
+
+    def cont() -> Iterator[Mapping[PurePath, PurePath]]:
+        pending = {src: dst for src, dst in operations.items() if src != dst}
+        while pending:
+            ready = {src: dst for src, dst in pending.items() if dst not in pending}
+            if ready:
+                for src in ready:
+                    pending.pop(src)
+                yield ready
+            else:
+                src, dst = next(iter(pending.items()))
+                tmp = _temp(src)
+                pending.pop(src)
+                pending[tmp] = dst
+                yield {src: tmp}
+
+    return tuple(cont())
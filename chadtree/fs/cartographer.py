@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-from asyncio import sleep
+from asyncio import get_running_loop, sleep
 from concurrent.futures import Executor
 from contextlib import suppress
-from fnmatch import fnmatch
+from itertools import islice
 from os import DirEntry, scandir, stat, stat_result
-from os.path import normcase
 from pathlib import Path, PurePath
 from stat import (
     S_IFDOOR,
@@ -24,10 +23,12 @@ from stat import (
 )
 from typing import (
     AbstractSet,
+    Callable,
     Iterator,
     Mapping,
     MutableMapping,
     Optional,
+    Sequence,
     Tuple,
     Union,
     cast,
@@ -38,8 +39,9 @@ from std2.pathlib import is_relative_to
 
 from ..consts import BATCH_FACTOR
 from ..state.executor import AsyncExecutor
-from ..state.types import Index
+from ..state.types import Index, Pages
 from ..timeit import timeit
+from .ignore import Rules, inherit, is_ignored, load, path_ignored
 from .nt import is_junction
 from .types import Ignored, Mode, Node
 
@@ -53,18 +55,89 @@ _FILE_MODES: Mapping[int, Mode] = {
     S_IWOTH | S_ISVTX: Mode.sticky_other_writable,
 }
 
+# NUL cannot appear in a file name, so this never collides with a real entry
+_MORE = "\0"
+
+
+def _page_order(dirent: DirEntry[str]) -> Tuple[bool, str, str]:
+    return not dirent.is_dir(), dirent.name.casefold(), dirent.name
+
+
+def _scan(
+    dirent: Union[PurePath, DirEntry[str]],
+    limit: Optional[int],
+    index: Index,
+    keep: Callable[[DirEntry[str]], bool],
+) -> Tuple[Sequence[DirEntry[str]], int]:
+    """
+    Pages are cut folders first, then by name, not by the view's `sort_by`
+    """
+
+    with scandir(dirent) as it:
+        dirents = filter(keep, it)
+        if limit is None:
+            return tuple(dirents), 0
+        else:
+            ordered = sorted(dirents, key=_page_order)
+            shown = ordered[:limit]
+            truncated = 0
+            for child in islice(ordered, limit, None):
+                if PurePath(child) in index:
+                    shown.append(child)
+                else:
+                    truncated += 1
+            return shown, truncated
+
 
 def _iter(
-    dirent: Union[PurePath, DirEntry[str]], follow: bool, index: Index, lv: int = 0
-) -> Iterator[PurePath]:
-    if not lv:
-        yield PurePath(dirent)
-    with suppress(NotADirectoryError, FileNotFoundError, PermissionError):
-        with scandir(dirent) as dirents:
-            for child in dirents:
-                yield (path := PurePath(child))
-                if child.is_dir(follow_symlinks=follow) and path in index:
-                    yield from _iter(child, follow=follow, index=index, lv=lv + 1)
+    dirent: Union[PurePath, DirEntry[str]],
+    follow: bool,
+    index: Index,
+    page_size: int,
+    pages: Pages,
+    prune: Optional[Ignored],
+    rules: Rules,
+) -> Iterator[Tuple[PurePath, int]]:
+    path = PurePath(dirent)
+    limit = page_size * pages.get(path, 1) if page_size else None
+
+    def keep(child: DirEntry[str]) -> bool:
+        if prune is None:
+            return True
+        else:
+            child_path = PurePath(child)
+            return not (
+                path_ignored(child_path, ignores=prune)
+                or bool(rules)
+                and is_ignored(
+                    rules, path=child_path, is_dir=child.is_dir(follow_symlinks=False)
+                )
+            )
+
+    try:
+        children, truncated = _scan(dirent, limit=limit, index=index, keep=keep)
+    except (NotADirectoryError, FileNotFoundError, PermissionError):
+        children, truncated = (), 0
+
+    yield path, truncated
+    for child in children:
+        child_path = PurePath(child)
+        if child.is_dir(follow_symlinks=follow) and child_path in index:
+            yield from _iter(
+                child,
+                follow=follow,
+                index=index,
+                page_size=page_size,
+                pages=pages,
+                prune=prune,
+                rules=(
+                    (*rules, *load(child_path))
+                    if prune and prune.gitignore
+                    else rules
+                ),
+            )
+        else:
+            yield child_path, 0
 
 
 def _fs_modes(stat: stat_result) -> Iterator[Mode]:
@@ -88,51 +161,97 @@ def _fs_modes(stat: stat_result) -> Iterator[Mode]:
             yield mode
 
 
-def _fs_stat(path: PurePath) -> Tuple[AbstractSet[Mode], Optional[PurePath]]:
+def _fs_stat(
+    path: PurePath,
+) -> Tuple[AbstractSet[Mode], Optional[PurePath], Optional[stat_result]]:
     try:
         info = stat(path, follow_symlinks=False)
     except (FileNotFoundError, PermissionError):
-        return {Mode.orphan_link}, None
+        return {Mode.orphan_link}, None, None
     else:
         if S_ISLNK(info.st_mode) or is_junction(info):
             try:
                 pointed = Path(path).resolve(strict=True)
                 link_info = stat(pointed, follow_symlinks=False)
             except (FileNotFoundError, NotADirectoryError, RuntimeError):
-                return {Mode.orphan_link}, None
+                return {Mode.orphan_link}, None, info
             else:
                 mode = {*_fs_modes(link_info)}
-                return mode | {Mode.link}, pointed
+                return mode | {Mode.link}, pointed, link_info
         else:
             mode = {*_fs_modes(info)}
-            return mode, None
+            return mode, None, info
 
 
-def _fs_node(path: PurePath) -> Node:
-    mode, pointed = _fs_stat(path)
+def _fs_node(path: PurePath, truncated: int) -> Node:
+    mode, pointed, info = _fs_stat(path)
     node = Node(
         path=path,
         mode=mode,
         pointed=pointed,
         children={},
+        truncated=truncated,
+        st_size=info.st_size if info else 0,
+        st_mtime_ns=info.st_mtime_ns if info else 0,
     )
     return node
 
 
 def _iter_single_nodes(
-    th: Executor, root: PurePath, follow: bool, index: Index
+    th: Executor,
+    root: PurePath,
+    follow: bool,
+    index: Index,
+    page_size: int,
+    pages: Pages,
+    show_hidden: bool,
+    ignores: Ignored,
 ) -> Iterator[Node]:
     with timeit("fs->_iter"):
-        dir_stream = batched(_iter(root, index=index, follow=follow), n=BATCH_FACTOR)
-        for seq in th.map(lambda x: tuple(map(_fs_node, x)), dir_stream):
+        prune = None if show_hidden else ignores
+        rules = inherit(root) if prune and prune.gitignore else ()
+        dir_stream = batched(
+            _iter(
+                root,
+                index=index,
+                follow=follow,
+                page_size=page_size,
+                pages=pages,
+                prune=prune,
+                rules=rules,
+            ),
+            n=BATCH_FACTOR,
+        )
+        for seq in th.map(
+            lambda x: tuple(_fs_node(path, truncated=t) for path, t in x), dir_stream
+        ):
             yield from seq
 
 
-async def _new(th: Executor, root: PurePath, follow_links: bool, index: Index) -> Node:
+async def _new(
+    th: Executor,
+    root: PurePath,
+    follow_links: bool,
+    index: Index,
+    page_size: int,
+    pages: Pages,
+    show_hidden: bool,
+    ignores: Ignored,
+) -> Node:
     nodes: MutableMapping[PurePath, Node] = {}
 
     for idx, node in enumerate(
-        _iter_single_nodes(th, root=root, follow=follow_links, index=index), start=1
+        _iter_single_nodes(
+            th,
+            root=root,
+            follow=follow_links,
+            index=index,
+            page_size=page_size,
+            pages=pages,
+            show_hidden=show_hidden,
+            ignores=ignores,
+        ),
+        start=1,
     ):
         if idx % BATCH_FACTOR == 0:
             await sleep(0)
@@ -154,10 +273,23 @@ async def _update(
     root: Node,
     follow_links: bool,
     index: Index,
+    page_size: int,
+    pages: Pages,
+    show_hidden: bool,
+    ignores: Ignored,
     invalidate_dirs: AbstractSet[PurePath],
 ) -> Node:
     if any((_cross_over(root.path, invalid=invalid) for invalid in invalidate_dirs)):
-        return await _new(th, root=root.path, follow_links=follow_links, index=index)
+        return await _new(
+            th,
+            root=root.path,
+            follow_links=follow_links,
+            index=index,
+            page_size=page_size,
+            pages=pages,
+            show_hidden=show_hidden,
+            ignores=ignores,
+        )
     else:
         children: MutableMapping[PurePath, Node] = {}
         for path, node in root.children.items():
@@ -166,6 +298,10 @@ async def _update(
                 root=node,
                 follow_links=follow_links,
                 index=index,
+                page_size=page_size,
+                pages=pages,
+                show_hidden=show_hidden,
+                ignores=ignores,
                 invalidate_dirs=invalidate_dirs,
             )
             children[path] = new_node
@@ -174,15 +310,34 @@ async def _update(
             mode=root.mode,
             pointed=root.pointed,
             children=children,
+            truncated=root.truncated,
+            st_size=root.st_size,
+            st_mtime_ns=root.st_mtime_ns,
         )
 
 
 async def new(
-    exec: AsyncExecutor, root: PurePath, follow_links: bool, index: Index
+    exec: AsyncExecutor,
+    root: PurePath,
+    follow_links: bool,
+    index: Index,
+    page_size: int,
+    pages: Pages,
+    show_hidden: bool,
+    ignores: Ignored,
 ) -> Node:
     with timeit("fs->new"):
         return await exec.submit(
-            _new(exec.threadpool, root=root, follow_links=follow_links, index=index)
+            _new(
+                exec.pools.walk,
+                root=root,
+                follow_links=follow_links,
+                index=index,
+                page_size=page_size,
+                pages=pages,
+                show_hidden=show_hidden,
+                ignores=ignores,
+            )
         )
 
 
@@ -192,37 +347,133 @@ async def update(
     *,
     follow_links: bool,
     index: Index,
+    page_size: int,
+    pages: Pages,
+    show_hidden: bool,
+    ignores: Ignored,
     invalidate_dirs: AbstractSet[PurePath],
 ) -> Node:
     with timeit("fs->_update"):
         try:
             return await exec.submit(
                 _update(
-                    exec.threadpool,
+                    exec.pools.walk,
                     root=root,
                     follow_links=follow_links,
                     index=index,
+                    page_size=page_size,
+                    pages=pages,
+                    show_hidden=show_hidden,
+                    ignores=ignores,
                     invalidate_dirs=invalidate_dirs,
                 )
             )
         except FileNotFoundError:
             return await new(
-                exec, follow_links=follow_links, root=root.path, index=index
+                exec,
+                follow_links=follow_links,
+                root=root.path,
+                index=index,
+                page_size=page_size,
+                pages=pages,
+                show_hidden=show_hidden,
+                ignores=ignores,
             )
 
 
+def _page(path: PurePath, page_size: int) -> int:
+    """
+    Page of the parent's listing `path` falls on, unfiltered so never too early
+    """
+
+    try:
+        with scandir(path.parent) as it:
+            dirents = tuple(it)
+        target = next(dirent for dirent in dirents if dirent.name == path.name)
+        key = _page_order(target)
+        before = sum(_page_order(dirent) < key for dirent in dirents)
+    except (OSError, StopIteration):
+        return 1
+    else:
+        return before // page_size + 1
+
+
+async def reveal(
+    exec: AsyncExecutor,
+    root: Node,
+    paths: AbstractSet[PurePath],
+    index: Index,
+    page_size: int,
+    pages: Pages,
+) -> Pages:
+    """
+    Grow `pages` until each of `paths` is past the cut, same `pages` if unchanged
+    """
+
+    hidden = tuple(
+        path
+        for path in paths
+        if (path.parent == root.path or path.parent in index)
+        and is_relative_to(path.parent, root.path)
+        and not lookup(root, path=path)
+    )
+    if not page_size or not hidden:
+        return pages
+    else:
+
+        def cont() -> Pages:
+            acc = {**pages}
+            for path in hidden:
+                page = _page(path, page_size=page_size)
+                if page > acc.get(path.parent, 1):
+                    acc[path.parent] = page
+            return acc
+
+        grown = await get_running_loop().run_in_executor(exec.pools.walk, cont)
+        return pages if grown == pages else grown
+
+
 def user_ignored(node: Node, ignores: Ignored) -> bool:
-    return (
-        node.path.name in ignores.name_exact
-        or any(fnmatch(node.path.name, pattern) for pattern in ignores.name_glob)
-        or any(fnmatch(normcase(node.path), pattern) for pattern in ignores.path_glob)
+    return path_ignored(node.path, ignores=ignores)
+
+
+def more_node(parent: Node) -> Node:
+    return Node(
+        path=parent.path / _MORE,
+        mode=frozenset(),
+        pointed=None,
+        children={},
+        truncated=0,
+        st_size=0,
+        st_mtime_ns=0,
     )
 
 
+def is_more(node: Node) -> bool:
+    return node.path.name == _MORE
+
+
 def is_dir(node: Node) -> bool:
     return Mode.folder in node.mode
 
 
+def lookup(root: Node, path: PurePath) -> Optional[Node]:
+    """
+    Descend the already walked tree, no syscalls
+    """
+
+    if path == root.path:
+        return root
+    elif root.path not in path.parents:
+        return None
+    else:
+        node = root
+        for part in path.relative_to(root.path).parts:
+            if not (node := node.children.get(node.path / part)):
+                return None
+        return node
+
+
 def act_like_dir(node: Node, follow_links: bool) -> bool:
     if node.pointed and not follow_links:
         return False
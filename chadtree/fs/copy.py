@@ -0,0 +1,268 @@
+from asyncio import FIRST_COMPLETED, Future, get_running_loop, wait
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import suppress
+from dataclasses import dataclass, field
+from os import (
+    SEEK_SET,
+    lseek,
+    makedirs,
+    read,
+    readlink,
+    remove,
+    scandir,
+    stat,
+    symlink,
+    write,
+)
+from pathlib import PurePath
+from shutil import SpecialFileError, copystat
+from stat import S_ISDIR, S_ISLNK, S_ISREG
+from typing import (
+    AbstractSet,
+    Callable,
+    Deque,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .progress import Progress
+
+_CHUNK = 2**23
+
+try:
+    from fcntl import ioctl
+
+    # linux/fs.h
+    _FICLONE = 0x40049409
+
+    def _clone(src: int, dst: int) -> bool:
+        try:
+            ioctl(dst, _FICLONE, src)
+        except OSError:
+            return False
+        else:
+            return True
+
+except ImportError:
+
+    def _clone(src: int, dst: int) -> bool:
+        return False
+
+
+def _copy_file_range(src: int, dst: int, offset: int) -> int:
+    from os import copy_file_range
+
+    return copy_file_range(src, dst, _CHUNK, offset, offset)
+
+
+def _sendfile(src: int, dst: int, offset: int) -> int:
+    from os import sendfile
+
+    lseek(dst, offset, SEEK_SET)
+    return sendfile(dst, src, offset, _CHUNK)
+
+
+def _read_write(src: int, dst: int, offset: int) -> int:
+    lseek(src, offset, SEEK_SET)
+    lseek(dst, offset, SEEK_SET)
+    buf = read(src, _CHUNK)
+    view, done = memoryview(buf), 0
+    while done < len(buf):
+        done += write(dst, view[done:])
+    return done
+
+
+_STRATEGIES: Tuple[Callable[[int, int, int], int], ...] = (
+    _copy_file_range,
+    _sendfile,
+    _read_write,
+)
+
+
+def _transfer(src: int, dst: int, size: int, progress: Progress) -> None:
+    """
+    `copy_file_range` can come back with 0 short of `size` (some FUSE / procfs),
+    only a `read` of 0 is a sure EOF
+    """
+
+    strategies = iter(_STRATEGIES)
+    strategy = next(strategies)
+    offset = 0
+    while True:
+        progress.check()
+        try:
+            sent = strategy(src, dst, offset)
+        except (ImportError, OSError):
+            if strategy is _read_write:
+                raise
+            strategy = next(strategies)
+        else:
+            if sent:
+                offset += sent
+                progress.advance(0, size=sent)
+            elif offset >= size or strategy is _read_write:
+                break
+            else:
+                strategy = next(strategies)
+
+
+def _copy_file(src: PurePath, dst: PurePath, size: int, progress: Progress) -> None:
+    progress.check()
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        if _clone(s.fileno(), d.fileno()):
+            progress.advance(0, size=size)
+        else:
+            _transfer(s.fileno(), d.fileno(), size=size, progress=progress)
+    copystat(src, dst, follow_symlinks=False)
+    progress.advance(1, size=0)
+
+
+@dataclass(frozen=True)
+class _Plan:
+    dirs: MutableSequence[Tuple[PurePath, PurePath]] = field(default_factory=list)
+    files: MutableSequence[Tuple[PurePath, PurePath, int]] = field(
+        default_factory=list
+    )
+    links: MutableSequence[Tuple[PurePath, PurePath]] = field(default_factory=list)
+
+
+def _classify(src: PurePath, dst: PurePath, plan: _Plan) -> bool:
+    info = stat(src, follow_symlinks=False)
+    if S_ISLNK(info.st_mode):
+        plan.links.append((src, dst))
+        return False
+    elif S_ISDIR(info.st_mode):
+        plan.dirs.append((src, dst))
+        return True
+    elif S_ISREG(info.st_mode):
+        plan.files.append((src, dst, info.st_size))
+        return False
+    else:
+        raise SpecialFileError(f"`{src}` is not a regular file")
+
+
+def _listdir(src: PurePath, dst: PurePath) -> _Plan:
+    plan = _Plan()
+    with scandir(src) as it:
+        for dirent in it:
+            _classify(PurePath(dirent), dst / dirent.name, plan=plan)
+    return plan
+
+
+async def _plan(
+    th: Executor, operations: Mapping[PurePath, PurePath], concurrency: int
+) -> _Plan:
+    loop = get_running_loop()
+    plan = _Plan()
+    queue: Deque[Tuple[PurePath, PurePath]] = deque()
+    for src, dst in operations.items():
+        if await loop.run_in_executor(th, _classify, src, dst, plan):
+            queue.append((src, dst))
+
+    inflight: MutableMapping[Future, None] = {}
+    try:
+        while queue or inflight:
+            while queue and len(inflight) < concurrency:
+                src, dst = queue.popleft()
+                inflight[loop.run_in_executor(th, _listdir, src, dst)] = None
+
+            done, _ = await wait(inflight.keys(), return_when=FIRST_COMPLETED)
+            for fut in done:
+                inflight.pop(fut)
+                found: _Plan = fut.result()
+                plan.dirs.extend(found.dirs)
+                plan.files.extend(found.files)
+                plan.links.extend(found.links)
+                queue.extend(found.dirs)
+    finally:
+        for fut in inflight:
+            fut.cancel()
+
+    return plan
+
+
+def _mkdirs(dirs: Iterable[Tuple[PurePath, PurePath]]) -> None:
+    for _, dst in dirs:
+        makedirs(dst, exist_ok=True)
+
+
+def _symlinks(links: Iterable[Tuple[PurePath, PurePath]]) -> None:
+    """
+    Links are recreated as links, never followed, with their target text as is
+    """
+
+    for src, dst in links:
+        makedirs(dst.parent, exist_ok=True)
+        with suppress(FileNotFoundError):
+            remove(dst)
+        symlink(readlink(src), dst)
+
+
+def _copy_dir_stats(dirs: Iterable[Tuple[PurePath, PurePath]]) -> None:
+    for src, dst in reversed(tuple(dirs)):
+        copystat(src, dst, follow_symlinks=False)
+
+
+async def copy_tree(
+    th: Executor,
+    operations: Mapping[PurePath, PurePath],
+    concurrency: int,
+    progress: Progress,
+    skip: AbstractSet[PurePath] = frozenset(),
+    copied: Optional[Callable[[PurePath, PurePath, int], None]] = None,
+) -> Sequence[Tuple[PurePath, PurePath, int]]:
+    """
+    Copy files and folders, folders are walked and files transferred in parallel
+
+    Symlinks stay symlinks, like the `copytree(symlinks=True)` this replaced.
+    Files whose `dst` is in `skip` are taken as done, `copied` runs on the worker
+    after each file
+    """
+
+    loop = get_running_loop()
+    plan = await _plan(th, operations=operations, concurrency=concurrency)
+    progress.plan(
+        files=len(plan.files) + len(plan.links),
+        size=sum(size for _, _, size in plan.files),
+    )
+
+    await loop.run_in_executor(th, _mkdirs, plan.dirs)
+    await loop.run_in_executor(th, _symlinks, plan.links)
+    progress.advance(len(plan.links), size=0)
+
+    skipped = tuple(size for _, dst, size in plan.files if dst in skip)
+    progress.advance(len(skipped), size=sum(skipped))
+
+    def cont(src: PurePath, dst: PurePath, size: int) -> None:
+        _copy_file(src, dst, size=size, progress=progress)
+        if copied:
+            copied(src, dst, size)
+
+    files = deque(file for file in plan.files if file[1] not in skip)
+    inflight: MutableMapping[Future, None] = {}
+    try:
+        while files or inflight:
+            while files and len(inflight) < concurrency:
+                src, dst, size = files.popleft()
+                fut = loop.run_in_executor(th, cont, src, dst, size)
+                inflight[fut] = None
+
+            done, _ = await wait(inflight.keys(), return_when=FIRST_COMPLETED)
+            for fut in done:
+                inflight.pop(fut)
+                fut.result()
+    except BaseException:
+        progress.cancelled.set()
+        raise
+    finally:
+        for fut in inflight:
+            fut.cancel()
+
+    await loop.run_in_executor(th, _copy_dir_stats, plan.dirs)
+    return plan.files
@@ -0,0 +1,136 @@
+from asyncio import FIRST_COMPLETED, Future, get_running_loop, wait
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import suppress
+from os import remove, rmdir, scandir, stat
+from pathlib import PurePath
+from stat import S_ISDIR
+from typing import Deque, Iterable, MutableMapping, MutableSequence, Sequence, Tuple
+
+from .nt import is_junction
+from .progress import Progress
+
+_CHUNK = 256
+
+
+def _is_tree(path: PurePath) -> bool:
+    info = stat(path, follow_symlinks=False)
+    return S_ISDIR(info.st_mode) and not is_junction(info)
+
+
+def _unlink(path: PurePath) -> None:
+    if S_ISDIR(stat(path, follow_symlinks=False).st_mode):
+        rmdir(path)
+    else:
+        remove(path)
+
+
+def _sweep(path: PurePath, progress: Progress) -> Sequence[PurePath]:
+    """
+    Unlink everything in `path` except sub folders, which are returned
+    """
+
+    dirs: MutableSequence[PurePath] = []
+    leaves: MutableSequence[Tuple[PurePath, bool]] = []
+    with scandir(path) as it:
+        for dirent in it:
+            child = PurePath(dirent.path)
+            if dirent.is_dir(follow_symlinks=False):
+                if is_junction(dirent.stat(follow_symlinks=False)):
+                    leaves.append((child, True))
+                else:
+                    dirs.append(child)
+            else:
+                leaves.append((child, False))
+
+    progress.plan(files=len(leaves) + len(dirs), size=0)
+    for idx in range(0, len(leaves), _CHUNK):
+        progress.check()
+        chunk = leaves[idx : idx + _CHUNK]
+        for leaf, junction in chunk:
+            with suppress(FileNotFoundError):
+                if junction:
+                    rmdir(leaf)
+                else:
+                    remove(leaf)
+        progress.advance(len(chunk), size=0)
+    return dirs
+
+
+def _rmdirs(dirs: Iterable[PurePath], progress: Progress) -> None:
+    for path in dirs:
+        progress.check()
+        with suppress(FileNotFoundError):
+            rmdir(path)
+        progress.advance(1, size=0)
+
+
+async def _walk(
+    th: Executor, roots: Iterable[PurePath], concurrency: int, progress: Progress
+) -> Sequence[Tuple[int, PurePath]]:
+    loop = get_running_loop()
+    queue: Deque[Tuple[int, PurePath]] = deque((0, root) for root in roots)
+    seen: MutableSequence[Tuple[int, PurePath]] = [*queue]
+    inflight: MutableMapping[Future, int] = {}
+    try:
+        while queue or inflight:
+            while queue and len(inflight) < concurrency:
+                depth, path = queue.popleft()
+                fut = loop.run_in_executor(th, _sweep, path, progress)
+                inflight[fut] = depth + 1
+
+            done, _ = await wait(inflight.keys(), return_when=FIRST_COMPLETED)
+            for fut in done:
+                depth = inflight.pop(fut)
+                found = tuple((depth, path) for path in fut.result())
+                queue.extend(found)
+                seen.extend(found)
+    except BaseException:
+        progress.cancelled.set()
+        raise
+    finally:
+        for fut in inflight:
+            fut.cancel()
+
+    return seen
+
+
+async def delete_tree(
+    th: Executor, paths: Iterable[PurePath], concurrency: int, progress: Progress
+) -> None:
+    """
+    Unlink files in parallel while walking, then remove folders deepest first
+    """
+
+    loop = get_running_loop()
+    roots: MutableSequence[PurePath] = []
+    for path in paths:
+        with suppress(FileNotFoundError):
+            if await loop.run_in_executor(th, _is_tree, path):
+                roots.append(path)
+            else:
+                await loop.run_in_executor(th, _unlink, path)
+                progress.plan(files=1, size=0)
+                progress.advance(1, size=0)
+
+    progress.plan(files=len(roots), size=0)
+    seen = await _walk(th, roots=roots, concurrency=concurrency, progress=progress)
+
+    levels: MutableMapping[int, MutableSequence[PurePath]] = {}
+    for depth, path in seen:
+        levels.setdefault(depth, []).append(path)
+
+    for depth in sorted(levels, reverse=True):
+        dirs = levels[depth]
+        chunks = (dirs[idx : idx + _CHUNK] for idx in range(0, len(dirs), _CHUNK))
+        futs = tuple(
+            loop.run_in_executor(th, _rmdirs, chunk, progress) for chunk in chunks
+        )
+        try:
+            for fut in futs:
+                await fut
+        except BaseException:
+            progress.cancelled.set()
+            for fut in futs:
+                fut.cancel()
+            raise
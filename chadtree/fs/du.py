@@ -0,0 +1,124 @@
+from asyncio import FIRST_COMPLETED, Future, get_running_loop, wait
+from collections import deque
+from concurrent.futures import Executor
+from os import scandir, stat
+from pathlib import PurePath
+from time import monotonic
+from typing import (
+    AbstractSet,
+    Awaitable,
+    Callable,
+    Deque,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+    Tuple,
+)
+
+from .ops import unify_ancestors
+from .types import DiskUsage
+
+_Listing = Tuple[int, Sequence[PurePath], Sequence[PurePath]]
+
+_CACHE: MutableMapping[PurePath, _Listing] = {}
+
+
+def _listdir(path: PurePath, mtime: int) -> _Listing:
+    files: MutableSequence[PurePath] = []
+    dirs: MutableSequence[PurePath] = []
+    try:
+        with scandir(path) as it:
+            for dirent in it:
+                try:
+                    is_dir = dirent.is_dir(follow_symlinks=False)
+                except OSError:
+                    pass
+                else:
+                    (dirs if is_dir else files).append(PurePath(dirent))
+    except OSError:
+        pass
+    return mtime, tuple(files), tuple(dirs)
+
+
+def _size(path: PurePath) -> int:
+    try:
+        return stat(path, follow_symlinks=False).st_size
+    except OSError:
+        return 0
+
+
+def _scan(path: PurePath) -> Tuple[int, Sequence[PurePath]]:
+    """
+    Listings are cached on the folder's mtime, file sizes are not: writing to a
+    file leaves its folder's mtime alone
+    """
+
+    try:
+        mtime = stat(path, follow_symlinks=False).st_mtime_ns
+    except OSError:
+        _CACHE.pop(path, None)
+        return 0, ()
+
+    if not (cached := _CACHE.get(path)) or cached[0] != mtime:
+        cached = _CACHE[path] = _listdir(path, mtime=mtime)
+
+    _, files, dirs = cached
+    return sum(map(_size, files)), dirs
+
+
+async def disk_usage(
+    th: Executor,
+    roots: AbstractSet[PurePath],
+    concurrency: int,
+    interval: float,
+    report: Callable[[DiskUsage], Awaitable[None]],
+) -> DiskUsage:
+    """
+    Recursive size of each root, streaming partial totals every `interval`
+    """
+
+    loop = get_running_loop()
+    sizes: MutableMapping[PurePath, int] = {root: 0 for root in roots}
+    outstanding: MutableMapping[PurePath, int] = {root: 0 for root in roots}
+    queue: Deque[Tuple[PurePath, Sequence[PurePath]]] = deque()
+    inflight: MutableMapping[Future, Tuple[PurePath, Sequence[PurePath]]] = {}
+
+    def push(path: PurePath, owners: Sequence[PurePath]) -> None:
+        for owner in owners:
+            outstanding[owner] += 1
+        queue.append((path, owners))
+
+    def snapshot() -> DiskUsage:
+        pending = {root for root, count in outstanding.items() if count}
+        return DiskUsage(sizes={**sizes}, pending=pending)
+
+    for root in unify_ancestors(roots):
+        push(root, owners=(root,))
+
+    last = monotonic()
+    try:
+        while queue or inflight:
+            while queue and len(inflight) < concurrency:
+                path, owners = queue.popleft()
+                inflight[loop.run_in_executor(th, _scan, path)] = path, owners
+
+            done, _ = await wait(
+                inflight.keys(), timeout=interval, return_when=FIRST_COMPLETED
+            )
+            for fut in done:
+                path, owners = inflight.pop(fut)
+                total, dirs = fut.result()
+                for owner in owners:
+                    sizes[owner] += total
+                    outstanding[owner] -= 1
+                for child in dirs:
+                    push(child, owners=(*owners, child) if child in roots else owners)
+
+            if (now := monotonic()) - last >= interval:
+                last = now
+                await report(snapshot())
+    finally:
+        for fut in inflight:
+            fut.cancel()
+
+    return snapshot()
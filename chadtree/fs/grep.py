@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from asyncio import FIRST_COMPLETED, Future, get_running_loop, wait
+from concurrent.futures import Executor
+from mmap import ACCESS_READ, mmap
+from os import fstat
+from pathlib import PurePath
+from re import Pattern
+from threading import Event
+from time import monotonic
+from typing import (
+    Awaitable,
+    Callable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Sequence,
+    Tuple,
+)
+
+_SNIFF = 1000
+_CHUNK = 32
+
+
+def _is_text(head: bytes) -> bool:
+    if b"\0" in head:
+        return False
+    else:
+        try:
+            head.decode("UTF-8")
+        except UnicodeDecodeError as e:
+            return e.start >= len(head) - 3
+        else:
+            return True
+
+
+def _count(path: PurePath, regex: Pattern[bytes], stop: Event) -> int:
+    """
+    Lines with a match, one spanning lines counts each line it touches
+    """
+
+    with open(path, "rb") as fd:
+        if not fstat(fd.fileno()).st_size:
+            return 0
+        with mmap(fd.fileno(), 0, access=ACCESS_READ) as buf:
+            if not _is_text(buf[:_SNIFF]):
+                return 0
+            else:
+                count, pos = 0, 0
+                while not stop.is_set() and (match := regex.search(buf, pos)):
+                    start, end = match.span()
+                    if start == len(buf) and buf[-1:] == b"\n":
+                        break
+                    last = max(start, end - 1)
+                    count += 1 + buf[start:last].count(b"\n")
+                    pos = buf.find(b"\n", last) + 1
+                    if not pos:
+                        break
+                return count
+
+
+def _count_many(
+    paths: Sequence[PurePath], regex: Pattern[bytes], stop: Event
+) -> Mapping[PurePath, int]:
+    def cont() -> Iterator[Tuple[PurePath, int]]:
+        for path in paths:
+            if stop.is_set():
+                break
+            try:
+                if count := _count(path, regex=regex, stop=stop):
+                    yield path, count
+            except (OSError, ValueError):
+                pass
+
+    return dict(cont())
+
+
+async def grep(
+    th: Executor,
+    paths: Sequence[PurePath],
+    regex: Pattern[bytes],
+    concurrency: int,
+    interval: float,
+    report: Callable[[Mapping[PurePath, int]], Awaitable[None]],
+) -> Mapping[PurePath, int]:
+    """
+    Matching lines per file, streaming partial results every `interval`
+    """
+
+    loop = get_running_loop()
+    stop = Event()
+    chunks = iter(
+        tuple(paths[idx : idx + _CHUNK]) for idx in range(0, len(paths), _CHUNK)
+    )
+    inflight: MutableMapping[Future, None] = {}
+    counts: MutableMapping[PurePath, int] = {}
+
+    last, dirty = monotonic(), False
+    try:
+        while True:
+            while len(inflight) < concurrency and (chunk := next(chunks, None)):
+                fut = loop.run_in_executor(th, _count_many, chunk, regex, stop)
+                inflight[fut] = None
+
+            if not inflight:
+                break
+
+            done, _ = await wait(
+                inflight.keys(), timeout=interval, return_when=FIRST_COMPLETED
+            )
+            for fut in done:
+                inflight.pop(fut)
+                if found := fut.result():
+                    counts.update(found)
+                    dirty = True
+
+            if dirty and (now := monotonic()) - last >= interval:
+                last, dirty = now, False
+                await report({**counts})
+    finally:
+        stop.set()
+        for fut in inflight:
+            fut.cancel()
+
+    return counts
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from os import stat
+from os.path import normcase, sep
+from pathlib import PurePath
+from re import Pattern, compile, escape
+from typing import Iterator, MutableMapping, Optional, Sequence, Tuple
+
+from .types import Ignored
+
+IGNORE_FILES = (".gitignore", ".ignore")
+_GIT_DIR = ".git"
+_EXCLUDE = PurePath(_GIT_DIR) / "info" / "exclude"
+
+
+@dataclass(frozen=True)
+class _Rule:
+    base: str
+    regex: Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+Rules = Sequence[_Rule]
+
+_CACHE: MutableMapping[PurePath, Tuple[Tuple[int, int], Rules]] = {}
+
+
+def _translate(pattern: str) -> str:
+    def cont() -> Iterator[str]:
+        idx, end = 0, len(pattern)
+        while idx < end:
+            char = pattern[idx]
+            if char == "*":
+                if pattern.startswith("**/", idx):
+                    idx += 3
+                    yield "(?:.*/)?"
+                elif pattern.startswith("**", idx):
+                    idx += 2
+                    yield ".*"
+                else:
+                    idx += 1
+                    yield "[^/]*"
+            elif char == "?":
+                idx += 1
+                yield "[^/]"
+            elif char == "[" and (close := pattern.find("]", idx + 2)) != -1:
+                body = pattern[idx + 1 : close].replace("\\", "\\\\")
+                idx = close + 1
+                if body.startswith("!"):
+                    body = f"^{body[1:]}"
+                yield f"[{body}]"
+            elif char == "\\" and idx + 1 < end:
+                yield escape(pattern[idx + 1])
+                idx += 2
+            else:
+                yield escape(char)
+                idx += 1
+
+    return "".join(cont())
+
+
+def _parse_line(base: str, line: str) -> Optional[_Rule]:
+    if line.endswith("\\ "):
+        line = line.rstrip()[:-1] + " "
+    else:
+        line = line.rstrip()
+
+    if not line or line.startswith("#"):
+        return None
+    else:
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        anchored = "/" in line
+        line = line.lstrip("/")
+
+        if not line:
+            return None
+        else:
+            prefix = "" if anchored else "(?:.*/)?"
+            regex = compile(f"{prefix}{_translate(line)}")
+            return _Rule(base=base, regex=regex, negate=negate, dir_only=dir_only)
+
+
+def parse(base: PurePath, text: str) -> Rules:
+    prefix = str(base).rstrip(sep) + sep
+    return tuple(
+        rule for line in text.splitlines() if (rule := _parse_line(prefix, line))
+    )
+
+
+def _read(path: PurePath, base: PurePath) -> Rules:
+    try:
+        st = stat(path)
+    except OSError:
+        _CACHE.pop(path, None)
+        return ()
+    else:
+        key = st.st_mtime_ns, st.st_size
+        if (cached := _CACHE.get(path)) and cached[0] == key:
+            _, rules = cached
+            return rules
+        else:
+            try:
+                with open(path, encoding="UTF-8", errors="replace") as fd:
+                    rules = parse(base, text=fd.read())
+            except OSError:
+                rules = ()
+            _CACHE[path] = key, rules
+            return rules
+
+
+def load(directory: PurePath) -> Rules:
+    """
+    Rules declared inside of `directory`
+    """
+
+    return tuple(
+        rule for name in IGNORE_FILES for rule in _read(directory / name, directory)
+    )
+
+
+def _exists(path: PurePath) -> bool:
+    try:
+        stat(path)
+    except OSError:
+        return False
+    else:
+        return True
+
+
+def inherit(directory: PurePath) -> Rules:
+    """
+    Rules that apply to `directory`, from repo top level downwards
+    """
+
+    chain = (directory, *directory.parents)
+    for idx, parent in enumerate(chain):
+        exclude = _read(parent / _EXCLUDE, parent)
+        if exclude or _exists(parent / _GIT_DIR):
+            lineage = reversed(chain[: idx + 1])
+            return (*exclude, *(rule for p in lineage for rule in load(p)))
+    else:
+        return load(directory)
+
+
+def is_ignored(rules: Rules, path: PurePath, is_dir: bool) -> bool:
+    name = str(path)
+    for rule in reversed(rules):
+        if rule.dir_only and not is_dir:
+            continue
+        elif not name.startswith(rule.base):
+            continue
+        else:
+            rel = name[len(rule.base) :].replace(sep, "/")
+            if rule.regex.fullmatch(rel):
+                return not rule.negate
+    else:
+        return False
+
+
+def path_ignored(path: PurePath, ignores: Ignored) -> bool:
+    return (
+        path.name in ignores.name_exact
+        or any(fnmatch(path.name, pattern) for pattern in ignores.name_glob)
+        or any(fnmatch(normcase(path), pattern) for pattern in ignores.path_glob)
+    )
@@ -0,0 +1,278 @@
+from contextlib import suppress
+from dataclasses import dataclass
+from enum import Enum, auto
+from json import dumps, loads
+from os import fsync, getpid, kill
+from pathlib import Path, PurePath
+from threading import Lock
+from typing import Iterator, Mapping, MutableMapping, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from std2.pickle.decoder import new_decoder
+from std2.pickle.encoder import new_encoder
+from std2.platform import OS, os
+
+
+class Op(Enum):
+    move = auto()
+    copy = auto()
+    new = auto()
+    link = auto()
+    delete = auto()
+    trash = auto()
+    rename = auto()
+
+
+class Phase(Enum):
+    planned = auto()
+    copied = auto()
+    done = auto()
+    undone = auto()
+
+
+@dataclass(frozen=True)
+class Step:
+    batch: str
+    op: Op
+    phase: Phase
+    operations: Sequence[Tuple[PurePath, PurePath]]
+
+
+@dataclass(frozen=True)
+class Advanced:
+    dirs: Sequence[PurePath]
+    files: Mapping[PurePath, PurePath]
+
+
+@dataclass(frozen=True)
+class Journal:
+    path: Path
+    staging: Path
+    keep: int
+
+
+_ENCODER = new_encoder[Step](Step)
+_DECODER = new_decoder[Step](Step)
+_SUFFIX = ".jsonl"
+_OWNER = ".owner"
+_PROGRESS = ".progress"
+_LOCK = Lock()
+_INSTANCE = uuid4().hex
+
+
+def _dir(storage: Path) -> Path:
+    return storage / "journal"
+
+
+def _journal(storage: Path, name: str, keep: int) -> Journal:
+    return Journal(
+        path=(_dir(storage) / name).with_suffix(_SUFFIX),
+        staging=storage / "staging",
+        keep=keep,
+    )
+
+
+def open_journal(storage: Path, keep: int) -> Journal:
+    """
+    Named per instance, pids get reused
+    """
+
+    return _journal(storage, name=_INSTANCE, keep=keep)
+
+
+def _started(pid: int) -> Optional[int]:
+    """
+    Process start time in clock ticks since boot, where `/proc` has it
+    """
+
+    try:
+        stat = Path("/proc", str(pid), "stat").read_text()
+        _, _, fields = stat.rpartition(")")
+        return int(fields.split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _claim(journal: Journal) -> None:
+    owner = journal.path.with_suffix(_OWNER)
+    if not owner.exists():
+        pid = getpid()
+        owner.write_text(dumps({"pid": pid, "started": _started(pid)}))
+
+
+def new_batch() -> str:
+    return uuid4().hex
+
+
+def _line(step: Step) -> str:
+    return dumps(_ENCODER(step), ensure_ascii=False, check_circular=False) + "\n"
+
+
+def record(
+    journal: Journal,
+    batch: str,
+    op: Op,
+    phase: Phase,
+    operations: Mapping[PurePath, PurePath],
+) -> None:
+    step = Step(batch=batch, op=op, phase=phase, operations=tuple(operations.items()))
+    journal.path.parent.mkdir(parents=True, exist_ok=True)
+    with _LOCK, journal.path.open("a", encoding="UTF-8") as fd:
+        _claim(journal)
+        fd.write(_line(step))
+        fd.flush()
+        fsync(fd.fileno())
+
+
+def _progress(journal: Journal, batch: str) -> Path:
+    return journal.path.with_name(f"{journal.path.stem}.{batch}{_PROGRESS}")
+
+
+def advance(
+    journal: Journal,
+    batch: str,
+    dirs: Sequence[PurePath] = (),
+    files: Mapping[PurePath, PurePath] = {},
+) -> None:
+    """
+    Folders about to be made, and files copied + verified, within one batch
+    """
+
+    lines = (
+        *(dumps({"dir": str(path)}) for path in dirs),
+        *(dumps({"src": str(src), "dst": str(dst)}) for src, dst in files.items()),
+    )
+    if lines:
+        journal.path.parent.mkdir(parents=True, exist_ok=True)
+        with _LOCK, _progress(journal, batch).open("a", encoding="UTF-8") as fd:
+            fd.writelines(f"{line}\n" for line in lines)
+            fd.flush()
+            fsync(fd.fileno())
+
+
+def advanced(journal: Journal, batch: str) -> Advanced:
+    dirs: MutableMapping[PurePath, None] = {}
+    files: MutableMapping[PurePath, PurePath] = {}
+    with suppress(OSError):
+        with _progress(journal, batch).open(encoding="UTF-8") as fd:
+            for line in fd:
+                with suppress(Exception):
+                    json = loads(line)
+                    if "dir" in json:
+                        dirs[PurePath(json["dir"])] = None
+                    else:
+                        files[PurePath(json["src"])] = PurePath(json["dst"])
+    return Advanced(dirs=tuple(dirs), files=files)
+
+
+def forget(journal: Journal, batch: str) -> None:
+    with suppress(FileNotFoundError):
+        _progress(journal, batch).unlink()
+
+
+def _read(path: Path) -> Iterator[Step]:
+    with suppress(OSError):
+        with path.open(encoding="UTF-8") as fd:
+            for line in fd:
+                with suppress(Exception):
+                    yield _DECODER(loads(line))
+
+
+def _last(journal: Journal) -> Sequence[Step]:
+    last: MutableMapping[str, Step] = {}
+    for step in _read(journal.path):
+        last.pop(step.batch, None)
+        last[step.batch] = step
+    return tuple(last.values())
+
+
+def unfinished(journal: Journal) -> Sequence[Step]:
+    """
+    Last step of every batch that never got to `done`
+    """
+
+    return tuple(
+        step
+        for step in _last(journal)
+        if step.phase not in {Phase.done, Phase.undone}
+    )
+
+
+def history(journal: Journal) -> Sequence[Step]:
+    """
+    Completed batches that can still be undone, oldest first
+    """
+
+    return tuple(step for step in _last(journal) if step.phase is Phase.done)
+
+
+def compact(journal: Journal) -> Sequence[Step]:
+    """
+    Rewrite the journal down to its last `keep` undoable batches, returns the dropped
+    """
+
+    with _LOCK:
+        return _compact(journal)
+
+
+def _compact(journal: Journal) -> Sequence[Step]:
+    steps = _last(journal)
+    done = tuple(step.batch for step in steps if step.phase is Phase.done)
+    keep = {*done[len(done) - journal.keep :]} if journal.keep > 0 else set()
+    live = tuple(
+        step
+        for step in steps
+        if step.batch in keep or step.phase not in {Phase.done, Phase.undone}
+    )
+    alive = {step.batch for step in live}
+    dropped = tuple(step for step in steps if step.batch not in alive)
+    for step in dropped:
+        forget(journal, batch=step.batch)
+
+    if not live:
+        with suppress(FileNotFoundError):
+            journal.path.unlink()
+        with suppress(FileNotFoundError):
+            journal.path.with_suffix(_OWNER).unlink()
+    elif dropped:
+        tmp = journal.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="UTF-8") as fd:
+            fd.writelines(map(_line, live))
+            fd.flush()
+            fsync(fd.fileno())
+        tmp.replace(journal.path)
+
+    return dropped
+
+
+def _alive(pid: int, started: Optional[int]) -> bool:
+    if os is OS.windows:
+        return True
+    else:
+        try:
+            kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return started is None or _started(pid) in {None, started}
+
+
+def _owner(path: Path) -> Tuple[int, Optional[int]]:
+    json = loads(path.with_suffix(_OWNER).read_text())
+    return int(json["pid"]), json["started"]
+
+
+def orphans(storage: Path) -> Iterator[Journal]:
+    """
+    Journals left behind by instances that are no longer running
+    """
+
+    with suppress(OSError):
+        for path in _dir(storage).glob(f"*{_SUFFIX}"):
+            if path.stem == _INSTANCE:
+                continue
+            with suppress(OSError, ValueError, KeyError, TypeError):
+                pid, started = _owner(path)
+                if not _alive(pid, started=started):
+                    yield _journal(storage, name=path.stem, keep=0)
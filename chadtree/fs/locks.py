@@ -0,0 +1,63 @@
+from asyncio import Condition
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import PurePath
+from typing import AbstractSet, AsyncIterator, Iterable, MutableSequence, Optional
+
+
+@dataclass(frozen=True, eq=False)
+class _Claim:
+    read: AbstractSet[PurePath]
+    write: AbstractSet[PurePath]
+
+
+def _overlaps(lhs: AbstractSet[PurePath], rhs: AbstractSet[PurePath]) -> bool:
+    if not lhs or not rhs:
+        return False
+    elif not lhs.isdisjoint(rhs):
+        return True
+    else:
+        return any(not rhs.isdisjoint(path.parents) for path in lhs) or any(
+            not lhs.isdisjoint(path.parents) for path in rhs
+        )
+
+
+def _conflicts(lhs: _Claim, rhs: _Claim) -> bool:
+    return (
+        _overlaps(lhs.write, rhs.write)
+        or _overlaps(lhs.write, rhs.read)
+        or _overlaps(lhs.read, rhs.write)
+    )
+
+
+class PathLocker:
+    """
+    Readers / writer locks over subtrees, paths conflict with their ancestors
+    """
+
+    def __init__(self) -> None:
+        self._cond: Optional[Condition] = None
+        self._held: MutableSequence[_Claim] = []
+
+    def _condition(self) -> Condition:
+        if not self._cond:
+            self._cond = Condition()
+        return self._cond
+
+    @asynccontextmanager
+    async def __call__(
+        self, read: Iterable[PurePath] = (), write: Iterable[PurePath] = ()
+    ) -> AsyncIterator[None]:
+        claim = _Claim(read=frozenset(read), write=frozenset(write))
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(
+                lambda: not any(_conflicts(claim, held) for held in self._held)
+            )
+            self._held.append(claim)
+        try:
+            yield None
+        finally:
+            async with cond:
+                self._held.remove(claim)
+                cond.notify_all()
@@ -1,27 +1,70 @@
 from asyncio import gather
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass
 from datetime import datetime
-from functools import lru_cache
+from errno import EXDEV
+from functools import lru_cache, partial
 from itertools import chain
-from os import makedirs, readlink
+from math import ceil
+from multiprocessing import cpu_count
+from os import listdir, makedirs, readlink, rename, rmdir
 from os import remove as rm
-from os import stat, symlink
-from os.path import isdir, isfile, normpath
+from os import stat, stat_result, symlink
+from os.path import isdir, isfile, islink, normpath
 from pathlib import Path, PurePath
-from shutil import copy2, copytree
 from shutil import move as mv
 from shutil import rmtree
 from shutil import which as _which
 from stat import S_ISDIR, S_ISLNK, filemode
-from typing import AbstractSet, Iterable, Mapping, Optional
+from typing import (
+    AbstractSet,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    MutableSet,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from std2.asyncio import Locker, to_thread
 from std2.stat import RW_R__R__, RWXR_XR_X
 
+from .atlas import Atlas, contains
+from .bulk import conflicts, plan_renames
+from .cartographer import lookup
+from .copy import copy_tree
+from .delete import delete_tree
+from .journal import (
+    Advanced,
+    Journal,
+    Op,
+    Phase,
+    Step,
+    advance,
+    advanced,
+    compact,
+    forget,
+    history,
+    new_batch,
+    record,
+)
+from .locks import PathLocker
 from .nt import is_junction
+from .progress import Progress
+from .trash import Trashed
+from .trash import restore as fs_restore
+from .trash import trash as fs_trash
+from .types import Mode, Node
 
 _FOLDER_MODE = RWXR_XR_X
 _FILE_MODE = RW_R__R__
+_PURGE = ".purge"
+_MIN_CHUNK = 256
 
 
 def ancestors(*paths: PurePath) -> AbstractSet[PurePath]:
@@ -42,7 +85,8 @@ class FSstat:
     link: Optional[PurePath]
 
 
-_lock = Locker()
+_locks = PathLocker()
+_undoing = Locker()
 
 
 try:
@@ -114,23 +158,80 @@ async def resolve(path: PurePath, strict: bool) -> Path:
     return await to_thread(cont)
 
 
+def exists_sync(path: PurePath, follow: bool) -> bool:
+    try:
+        stat(path, follow_symlinks=follow)
+    except (OSError, ValueError):
+        return False
+    else:
+        return True
+
+
 async def exists(path: PurePath, follow: bool) -> bool:
-    def cont() -> bool:
-        try:
-            stat(path, follow_symlinks=follow)
-        except (OSError, ValueError):
-            return False
-        else:
-            return True
+    return await to_thread(lambda: exists_sync(path, follow=follow))
 
-    return await to_thread(cont)
 
+def _stat_chunk(
+    paths: Sequence[PurePath], follow: bool
+) -> Sequence[Optional[stat_result]]:
+    def cont() -> Iterator[Optional[stat_result]]:
+        for path in paths:
+            try:
+                yield stat(path, follow_symlinks=follow)
+            except (OSError, ValueError):
+                yield None
 
-async def exists_many(
+    return tuple(cont())
+
+
+async def stat_many(
     paths: Iterable[PurePath], follow: bool
+) -> Mapping[PurePath, Optional[stat_result]]:
+    """
+    Deduplicated, and split into a few thread pool jobs instead of one per path
+    """
+
+    uniq = tuple({path: None for path in paths})
+    if not uniq:
+        return {}
+    else:
+        size = max(_MIN_CHUNK, ceil(len(uniq) / cpu_count()))
+        chunks = tuple(uniq[idx : idx + size] for idx in range(0, len(uniq), size))
+        stats = await gather(
+            *(to_thread(partial(_stat_chunk, chunk, follow=follow)) for chunk in chunks)
+        )
+        return {path: info for path, info in zip(uniq, chain.from_iterable(stats))}
+
+
+async def exists_many(
+    paths: Iterable[PurePath],
+    follow: bool,
+    tree: Optional[Node] = None,
+    atlas: Optional[Atlas] = None,
 ) -> Mapping[PurePath, bool]:
-    existence = await gather(*(exists(path, follow=follow) for path in paths))
-    return {path: exi for path, exi in zip(paths, existence)}
+    """
+    Paths present in `tree` or `atlas` are answered without touching the disk
+    """
+
+    uniq = {path: None for path in paths}
+    nodes = {path: lookup(tree, path=path) for path in uniq} if tree else {}
+    known = {
+        path
+        for path, node in nodes.items()
+        if node and Mode.orphan_link not in node.mode
+    }
+    if atlas:
+        known |= {path for path in uniq if path not in known and contains(atlas, path)}
+    stats = await stat_many((path for path in uniq if path not in known), follow)
+    return {path: path in known or stats.get(path) is not None for path in uniq}
+
+
+async def is_dir_many(paths: Iterable[PurePath]) -> Mapping[PurePath, bool]:
+    stats = await stat_many(paths, follow=True)
+    return {
+        path: info is not None and S_ISDIR(info.st_mode)
+        for path, info in stats.items()
+    }
 
 
 async def is_dir(path: PurePath) -> bool:
@@ -145,6 +246,111 @@ def _mkdir_p(path: PurePath) -> None:
     makedirs(path, mode=_FOLDER_MODE, exist_ok=True)
 
 
+def _rm(path: PurePath) -> None:
+    stats = stat(path, follow_symlinks=False)
+    if S_ISDIR(stats.st_mode):
+        rmtree(path)
+    else:
+        rm(path)
+
+
+def _compact(journal: Journal) -> None:
+    """
+    Staging of dropped batches is set aside in one rename, see `purge`
+    """
+
+    for step in compact(journal):
+        staged = journal.staging / step.batch
+        if exists_sync(staged, follow=False):
+            _mkdir_p(journal.staging / _PURGE)
+            rename(staged, journal.staging / _PURGE / step.batch)
+
+
+async def purge(th: Executor, journal: Journal) -> None:
+    bin = journal.staging / _PURGE
+    async with _locks(write=(bin,)):
+        with suppress(FileNotFoundError):
+            paths = await to_thread(lambda: tuple(bin / name for name in listdir(bin)))
+            await delete_tree(
+                th, paths=paths, concurrency=cpu_count(), progress=Progress()
+            )
+
+
+def _unrename(step: Step) -> None:
+    """
+    Hops are undone last to first, those that never happened are skipped
+    """
+
+    hops = tuple(step.operations)
+    if step.phase is Phase.done:
+        refilled = {dst for _, dst in hops}
+        if taken := {
+            src
+            for src, _ in hops
+            if src not in refilled and exists_sync(src, follow=False)
+        }:
+            raise FileExistsError(*sorted(map(str, taken)))
+
+    for src, dst in reversed(hops):
+        if exists_sync(dst, follow=False) and not exists_sync(src, follow=False):
+            _mkdir_p(src.parent)
+            mv(normpath(dst), normpath(src))
+
+
+def _revert(journal: Journal, step: Step) -> None:
+    if step.op in {Op.move, Op.delete}:
+        for src, dst in step.operations:
+            if exists_sync(src, follow=False):
+                if exists_sync(dst, follow=False):
+                    raise FileExistsError(src)
+            else:
+                with suppress(FileNotFoundError):
+                    _mkdir_p(src.parent)
+                    mv(normpath(dst), normpath(src))
+        with suppress(FileNotFoundError):
+            rmtree(journal.staging / step.batch)
+    elif step.op is Op.rename:
+        _unrename(step)
+    elif step.op is Op.trash:
+        fs_restore({src: dst for src, dst in step.operations if src != dst})
+    elif step.op is Op.copy:
+        for _, dst in step.operations:
+            with suppress(FileNotFoundError):
+                _rm(dst)
+    elif step.op is Op.link:
+        for _, dst in step.operations:
+            if islink(dst):
+                rm(dst)
+    elif step.op is Op.new:
+        for _, dst in step.operations:
+            with suppress(FileNotFoundError):
+                if isdir(dst):
+                    if not listdir(dst):
+                        rmdir(dst)
+                elif not stat(dst, follow_symlinks=False).st_size:
+                    rm(dst)
+    else:
+        raise ValueError(step.op)
+
+
+@asynccontextmanager
+async def _journaled(
+    journal: Journal, op: Op, operations: Mapping[PurePath, PurePath]
+) -> AsyncIterator[None]:
+    batch = new_batch()
+
+    def cont(phase: Phase) -> None:
+        record(journal, batch=batch, op=op, phase=phase, operations=operations)
+        if phase is Phase.done:
+            _compact(journal)
+
+    await to_thread(lambda: cont(Phase.planned))
+    try:
+        yield None
+    finally:
+        await to_thread(lambda: cont(Phase.done))
+
+
 async def _mkdir(path: PurePath) -> None:
     def cont() -> None:
         _mkdir_p(path)
@@ -152,8 +358,11 @@ async def _mkdir(path: PurePath) -> None:
     await to_thread(cont)
 
 
-async def mkdir(paths: Iterable[PurePath]) -> None:
-    await gather(*map(_mkdir, paths))
+async def mkdir(paths: Iterable[PurePath], *, journal: Journal) -> None:
+    paths = tuple(paths)
+    async with _locks(write=paths):
+        async with _journaled(journal, op=Op.new, operations={p: p for p in paths}):
+            await gather(*map(_mkdir, paths))
 
 
 async def _new(path: PurePath) -> None:
@@ -164,66 +373,475 @@ async def _new(path: PurePath) -> None:
     await to_thread(cont)
 
 
-async def new(paths: Iterable[PurePath]) -> None:
-    async with _lock():
-        await gather(*map(_new, paths))
+async def new(paths: Iterable[PurePath], *, journal: Journal) -> None:
+    paths = tuple(paths)
+    async with _locks(write=paths):
+        async with _journaled(journal, op=Op.new, operations={p: p for p in paths}):
+            await gather(*map(_new, paths))
 
 
-async def _rename(src: PurePath, dst: PurePath) -> None:
+def _staged(
+    journal: Journal, batch: str, paths: Iterable[PurePath]
+) -> Mapping[PurePath, PurePath]:
+    """
+    Paths that can be renamed into staging, instead of being copied there
+    """
+
+    _mkdir_p(journal.staging)
+    dev = stat(journal.staging).st_dev
+    return {
+        path: journal.staging / batch / str(idx) / path.name
+        for idx, path in enumerate(paths)
+        if stat(path, follow_symlinks=False).st_dev == dev
+    }
+
+
+async def _stage(src: PurePath, dst: PurePath) -> None:
     def cont() -> None:
-        makedirs(dst.parent, mode=_FOLDER_MODE, exist_ok=True)
-        mv(normpath(src), normpath(dst))
+        _mkdir_p(dst.parent)
+        try:
+            rename(src, dst)
+        except OSError as e:
+            if e.errno == EXDEV:
+                _rm(src)
+            else:
+                raise
 
     await to_thread(cont)
 
 
-async def rename(operations: Mapping[PurePath, PurePath]) -> None:
-    async with _lock():
-        await gather(*(_rename(src, dst) for src, dst in operations.items()))
+async def remove(
+    th: Executor,
+    paths: Iterable[PurePath],
+    progress: Progress,
+    *,
+    journal: Journal,
+) -> None:
+    """
+    Deletes on the same device as the staging area can be undone
+    """
+
+    paths = tuple(paths)
+    async with _locks(write=paths):
+        batch = new_batch()
+        staged = await to_thread(lambda: _staged(journal, batch=batch, paths=paths))
+
+        def cont(phase: Phase) -> None:
+            record(journal, batch=batch, op=Op.delete, phase=phase, operations=staged)
+            if phase is Phase.done:
+                _compact(journal)
+
+        await to_thread(lambda: cont(Phase.planned))
+        try:
+            await gather(*(_stage(src, dst) for src, dst in staged.items()))
+            await delete_tree(
+                th,
+                paths=(path for path in paths if path not in staged),
+                concurrency=cpu_count(),
+                progress=progress,
+            )
+        finally:
+            await to_thread(lambda: cont(Phase.done))
 
 
-async def _remove(path: PurePath) -> None:
-    def cont() -> None:
-        stats = stat(path, follow_symlinks=False)
-        if S_ISDIR(stats.st_mode):
-            rmtree(path)
-        else:
-            rm(path)
+async def trash(paths: Iterable[PurePath], *, journal: Journal) -> None:
+    """
+    Trash in one batch, the journal only learns the trashed names once done
+    """
 
-    await to_thread(cont)
+    paths = tuple(paths)
+    async with _locks(write=paths):
+        batch = new_batch()
+        trashed: MutableMapping[PurePath, PurePath] = {}
+
+        def cont(phase: Phase, operations: Mapping[PurePath, PurePath]) -> None:
+            record(
+                journal, batch=batch, op=Op.trash, phase=phase, operations=operations
+            )
+            if phase is Phase.done:
+                _compact(journal)
+
+        await to_thread(lambda: cont(Phase.planned, operations={p: p for p in paths}))
+        try:
+            await to_thread(lambda: fs_trash(paths, trashed=trashed))
+        finally:
+            await to_thread(lambda: cont(Phase.done, operations=trashed))
 
 
-async def remove(paths: Iterable[PurePath]) -> None:
-    async with _lock():
-        await gather(*map(_remove, paths))
+async def restore(items: Iterable[Trashed]) -> None:
+    operations = {item.original: item.trashed for item in items}
+    async with _locks(write=operations):
+        await to_thread(lambda: fs_restore(operations))
 
 
-async def _cut(src: PurePath, dst: PurePath) -> None:
+async def _rename(src: PurePath, dst: PurePath) -> None:
     def cont() -> None:
+        _mkdir_p(dst.parent)
         mv(normpath(src), normpath(dst))
 
     await to_thread(cont)
 
 
-async def cut(operations: Mapping[PurePath, PurePath]) -> None:
-    async with _lock():
-        await gather(*(_cut(src, dst) for src, dst in operations.items()))
+def _same_device(src: PurePath, dst: PurePath) -> bool:
+    src_dev = stat(src, follow_symlinks=False).st_dev
+    return src_dev == stat(dst.parent).st_dev
 
 
-async def _copy(src: PurePath, dst: PurePath) -> None:
-    def cont() -> None:
-        stats = stat(src, follow_symlinks=False)
-        if S_ISDIR(stats.st_mode):
-            copytree(src, dst, symlinks=True, dirs_exist_ok=True)
+def _missing(paths: Iterable[PurePath]) -> Sequence[PurePath]:
+    """
+    Folders that would have to be made to hold `paths`, shallowest first
+    """
+
+    missing: MutableMapping[PurePath, None] = {}
+    for path in paths:
+        for parent in (*reversed(path.parents), path):
+            if parent not in missing and not exists_sync(parent, follow=False):
+                missing[parent] = None
+    return tuple(missing)
+
+
+def _verify(files: Iterable[Tuple[PurePath, PurePath, int]]) -> None:
+    for src, dst, size in files:
+        if stat(dst, follow_symlinks=False).st_size != size:
+            raise OSError(f"{src} -> {dst}")
+
+
+def _same_file(lhs: PurePath, rhs: PurePath) -> bool:
+    try:
+        l, r = stat(lhs, follow_symlinks=False), stat(rhs, follow_symlinks=False)
+    except (OSError, ValueError):
+        return False
+    else:
+        return (l.st_dev, l.st_ino) == (r.st_dev, r.st_ino)
+
+
+def _progressed(
+    operations: Mapping[PurePath, PurePath]
+) -> Tuple[AbstractSet[PurePath], AbstractSet[PurePath]]:
+    """
+    Best guess from disk for journals whose owner died: renamed, partially copied
+    """
+
+    renamed: MutableSet[PurePath] = set()
+    copied: MutableSet[PurePath] = set()
+    for src, dst in operations.items():
+        if not exists_sync(dst, follow=False):
+            pass
+        elif not exists_sync(src, follow=False) or _same_file(src, dst):
+            renamed.add(src)
         else:
-            copy2(src, dst, follow_symlinks=False)
+            copied.add(src)
+    return renamed, copied
+
+
+def _rollback(
+    journal: Journal,
+    batch: str,
+    operations: Mapping[PurePath, PurePath],
+    renamed: AbstractSet[PurePath],
+    copied: AbstractSet[PurePath],
+    made: Iterable[PurePath],
+) -> None:
+    """
+    Only pairs known to have been touched are reverted, other `dst`s may predate us
+
+    Folders made along the way go too, deepest first, if left empty
+    """
+
+    for src, dst in operations.items():
+        with suppress(FileNotFoundError):
+            if src in renamed:
+                mv(normpath(dst), normpath(src))
+            elif src in copied and not _same_file(src, dst):
+                _rm(dst)
+    for path in sorted(made, key=lambda path: len(path.parts), reverse=True):
+        with suppress(OSError):
+            rmdir(path)
+    record(journal, batch=batch, op=Op.move, phase=Phase.undone, operations=operations)
+    forget(journal, batch=batch)
+    _compact(journal)
+
+
+async def _finish(
+    th: Executor,
+    journal: Journal,
+    batch: str,
+    operations: Mapping[PurePath, PurePath],
+    across: Iterable[PurePath],
+) -> None:
+    """
+    Only copied sources go, a case-only rename's source *is* its `dst`; not cancellable
+    """
 
+    def cont() -> None:
+        record(
+            journal, batch=batch, op=Op.move, phase=Phase.done, operations=operations
+        )
+        forget(journal, batch=batch)
+        _compact(journal)
+
+    await delete_tree(th, paths=across, concurrency=cpu_count(), progress=Progress())
     await to_thread(cont)
 
 
-async def copy(operations: Mapping[PurePath, PurePath]) -> None:
-    async with _lock():
-        await gather(*(_copy(src, dst) for src, dst in operations.items()))
+async def finish_move(
+    th: Executor,
+    journal: Journal,
+    batch: str,
+    operations: Mapping[PurePath, PurePath],
+) -> None:
+    """
+    `operations` are those of the `copied` step, which only lists the copies
+    """
+
+    async with _locks(write=chain(operations.keys(), operations.values())):
+        await _finish(
+            th,
+            journal=journal,
+            batch=batch,
+            operations=operations,
+            across=operations.keys(),
+        )
+
+
+async def rollback_move(
+    journal: Journal, batch: str, operations: Mapping[PurePath, PurePath]
+) -> None:
+    def cont() -> None:
+        renamed, copied = _progressed(operations)
+        _rollback(
+            journal,
+            batch=batch,
+            operations=operations,
+            renamed=renamed,
+            copied=copied,
+            made=advanced(journal, batch=batch).dirs,
+        )
+
+    async with _locks(write=chain(operations.keys(), operations.values())):
+        await to_thread(cont)
+
+
+async def _move(
+    th: Executor,
+    journal: Journal,
+    batch: str,
+    operations: Mapping[PurePath, PurePath],
+    progress: Progress,
+    renamed: MutableSet[PurePath],
+    made: MutableSequence[PurePath],
+    done: Mapping[PurePath, PurePath],
+) -> None:
+    """
+    Folders to be made and files copied + verified are journaled as they go
+    """
+
+    copied: AbstractSet[PurePath] = set()
+
+    def prepare() -> Mapping[PurePath, PurePath]:
+        dirs = _missing(
+            dst.parent for src, dst in operations.items() if src not in renamed
+        )
+        advance(journal, batch=batch, dirs=dirs)
+        made.extend(dirs)
+        for path in dirs:
+            _mkdir_p(path)
+        return {
+            src: dst
+            for src, dst in operations.items()
+            if src not in renamed and _same_device(src, dst)
+        }
+
+    def verified(src: PurePath, dst: PurePath, size: int) -> None:
+        _verify(((src, dst, size),))
+        advance(journal, batch=batch, files={src: dst})
+
+    async def rename(src: PurePath, dst: PurePath) -> None:
+        await _rename(src, dst)
+        renamed.add(src)
+
+    try:
+        same = await to_thread(prepare)
+        across = {
+            src: dst
+            for src, dst in operations.items()
+            if src not in renamed and src not in same
+        }
+        results = await gather(
+            *(rename(src, dst) for src, dst in same.items()),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        if across:
+            copied = across.keys()
+            files = await copy_tree(
+                th,
+                operations=across,
+                concurrency=cpu_count(),
+                progress=progress,
+                skip={*done.values()},
+                copied=verified,
+            )
+            await to_thread(lambda: _verify(files))
+    except BaseException:
+        await to_thread(
+            lambda: _rollback(
+                journal,
+                batch=batch,
+                operations=operations,
+                renamed=renamed,
+                copied=copied,
+                made=made,
+            )
+        )
+        raise
+    else:
+        await to_thread(
+            lambda: record(
+                journal, batch=batch, op=Op.move, phase=Phase.copied, operations=across
+            )
+        )
+        await _finish(
+            th,
+            journal=journal,
+            batch=batch,
+            operations=operations,
+            across=across.keys(),
+        )
+
+
+async def move(
+    th: Executor,
+    operations: Mapping[PurePath, PurePath],
+    progress: Progress,
+    *,
+    journal: Journal,
+) -> None:
+    """
+    Rename within a device, across devices copy, verify, then delete sources
+    """
+
+    async with _locks(write=chain(operations.keys(), operations.values())):
+        batch = new_batch()
+        await to_thread(
+            lambda: record(
+                journal,
+                batch=batch,
+                op=Op.move,
+                phase=Phase.planned,
+                operations=operations,
+            )
+        )
+        await _move(
+            th,
+            journal=journal,
+            batch=batch,
+            operations=operations,
+            progress=progress,
+            renamed=set(),
+            made=[],
+            done={},
+        )
+
+
+async def resume_move(
+    th: Executor,
+    orphan: Journal,
+    step: Step,
+    progress: Progress,
+    *,
+    journal: Journal,
+) -> None:
+    """
+    Take over a dead instance's move: its renames, folders and copied files stand
+
+    The new batch is journaled before the old one is let go
+    """
+
+    operations = dict(step.operations)
+    async with _locks(write=chain(operations.keys(), operations.values())):
+        batch = new_batch()
+
+        def cont() -> Tuple[AbstractSet[PurePath], Advanced]:
+            progressed = advanced(orphan, batch=step.batch)
+            renamed = {
+                src
+                for src, dst in operations.items()
+                if not exists_sync(src, follow=False)
+                and exists_sync(dst, follow=False)
+            }
+            record(
+                journal,
+                batch=batch,
+                op=Op.move,
+                phase=Phase.planned,
+                operations=operations,
+            )
+            advance(
+                journal, batch=batch, dirs=progressed.dirs, files=progressed.files
+            )
+            record(
+                orphan,
+                batch=step.batch,
+                op=Op.move,
+                phase=Phase.undone,
+                operations=operations,
+            )
+            forget(orphan, batch=step.batch)
+            return renamed, progressed
+
+        renamed, progressed = await to_thread(cont)
+        await _move(
+            th,
+            journal=journal,
+            batch=batch,
+            operations=operations,
+            progress=progress,
+            renamed={*renamed},
+            made=[*progressed.dirs],
+            done=progressed.files,
+        )
+
+
+def _check_renames(operations: Mapping[PurePath, PurePath]) -> None:
+    existing = {path for path in operations.values() if exists_sync(path, follow=False)}
+    if taken := conflicts(operations, existing=existing):
+        raise FileExistsError(*sorted(map(str, taken)))
+
+
+async def rename_many(
+    operations: Mapping[PurePath, PurePath], *, journal: Journal
+) -> None:
+    """
+    Renames that may swap or cycle amongst each other, checked up front
+
+    Journaled hop by hop in order, temp names that break cycles included
+    """
+
+    operations = {src: dst for src, dst in operations.items() if src != dst}
+    phases = plan_renames(operations)
+    hops = {src: dst for phase in phases for src, dst in phase.items()}
+    async with _locks(write=chain(hops.keys(), hops.values())):
+        await to_thread(lambda: _check_renames(operations))
+        async with _journaled(journal, op=Op.rename, operations=hops):
+            for phase in phases:
+                await gather(*(_rename(src, dst) for src, dst in phase.items()))
+
+
+async def copy(
+    th: Executor,
+    operations: Mapping[PurePath, PurePath],
+    progress: Progress,
+    *,
+    journal: Journal,
+) -> None:
+    async with _locks(read=operations.keys(), write=operations.values()):
+        async with _journaled(journal, op=Op.copy, operations=operations):
+            await copy_tree(
+                th, operations=operations, concurrency=cpu_count(), progress=progress
+            )
 
 
 async def _link(src: PurePath, dst: PurePath) -> None:
@@ -235,6 +853,52 @@ async def _link(src: PurePath, dst: PurePath) -> None:
     await to_thread(cont)
 
 
-async def link(operations: Mapping[PurePath, PurePath]) -> None:
-    async with _lock():
-        await gather(*(_link(src, dst) for dst, src in operations.items()))
+async def link(operations: Mapping[PurePath, PurePath], *, journal: Journal) -> None:
+    async with _locks(write=operations.keys()):
+        links = {path: path for path in operations}
+        async with _journaled(journal, op=Op.link, operations=links):
+            await gather(*(_link(src, dst) for dst, src in operations.items()))
+
+
+def _undone(journal: Journal, step: Step) -> None:
+    _revert(journal, step=step)
+    record(
+        journal,
+        batch=step.batch,
+        op=step.op,
+        phase=Phase.undone,
+        operations=dict(step.operations),
+    )
+    _compact(journal)
+
+
+def _paths(step: Step) -> Iterable[PurePath]:
+    return chain.from_iterable(step.operations)
+
+
+async def rollback(journal: Journal, step: Step) -> None:
+    """
+    Revert a batch that never finished
+    """
+
+    async with _locks(write=_paths(step)):
+        await to_thread(lambda: _undone(journal, step=step))
+
+
+async def undo(journal: Journal) -> Optional[Step]:
+    """
+    Revert the last completed batch
+    """
+
+    async with _undoing():
+        if not (steps := await to_thread(lambda: history(journal))):
+            return None
+        else:
+            *_, step = steps
+            async with _locks(write=_paths(step)):
+                await to_thread(lambda: _undone(journal, step=step))
+            return step
+
+
+async def discard(journal: Journal) -> None:
+    await to_thread(lambda: _compact(journal))
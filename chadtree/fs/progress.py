@@ -0,0 +1,49 @@
+from dataclasses import dataclass, field
+from threading import Event, Lock
+from typing import MutableSet
+
+
+class Cancelled(Exception): ...
+
+
+@dataclass(eq=False)
+class Progress:
+    total_files: int = 0
+    total_bytes: int = 0
+    done_files: int = 0
+    done_bytes: int = 0
+    cancelled: Event = field(default_factory=Event)
+    lock: Lock = field(default_factory=Lock)
+
+    def plan(self, files: int, size: int) -> None:
+        with self.lock:
+            self.total_files += files
+            self.total_bytes += size
+
+    def advance(self, files: int, size: int) -> None:
+        with self.lock:
+            self.done_files += files
+            self.done_bytes += size
+
+    def check(self) -> None:
+        if self.cancelled.is_set():
+            raise Cancelled()
+
+
+_ACTIVE: MutableSet[Progress] = set()
+
+
+def track() -> Progress:
+    progress = Progress()
+    _ACTIVE.add(progress)
+    return progress
+
+
+def untrack(progress: Progress) -> None:
+    _ACTIVE.discard(progress)
+
+
+def cancel_all() -> bool:
+    for progress in _ACTIVE:
+        progress.cancelled.set()
+    return bool(_ACTIVE)
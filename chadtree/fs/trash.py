@@ -0,0 +1,250 @@
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime
+from errno import EXDEV
+from os import O_CREAT, O_EXCL, O_WRONLY, close, environ, lstat, rename
+from os import open as os_open
+from os import stat, write
+from os.path import ismount, lexists
+from pathlib import Path, PurePath
+from shutil import copy2, copytree, rmtree
+from stat import S_ISDIR, S_ISLNK, S_ISVTX
+from typing import Iterator, Mapping, MutableMapping, MutableSet, Optional, Sequence
+from urllib.parse import quote, unquote
+
+try:
+    from os import getuid
+except ImportError:
+
+    def getuid() -> int:
+        return 0
+
+
+_INFO = ".trashinfo"
+_HEADER = "[Trash Info]"
+_DATE_FMT = "%Y-%m-%dT%H:%M:%S"
+
+
+@dataclass(frozen=True)
+class TrashDir:
+    top: Optional[Path]
+    path: Path
+
+    @property
+    def files(self) -> Path:
+        return self.path / "files"
+
+    @property
+    def info(self) -> Path:
+        return self.path / "info"
+
+
+@dataclass(frozen=True)
+class Trashed:
+    original: PurePath
+    trashed: PurePath
+    deleted: datetime
+
+
+def _home_trash() -> TrashDir:
+    data = environ.get("XDG_DATA_HOME") or str(Path.home() / ".local" / "share")
+    return TrashDir(top=None, path=Path(data) / "Trash")
+
+
+def _topdir(path: Path) -> Path:
+    while not ismount(path) and path.parent != path:
+        path = path.parent
+    return path
+
+
+def _shared(top: Path) -> Optional[TrashDir]:
+    """
+    `$topdir/.Trash/$uid`, only if `.Trash` is a sticky folder and not a symlink
+    """
+
+    shared = top / ".Trash"
+    try:
+        info = lstat(shared)
+    except OSError:
+        return None
+    else:
+        mode = info.st_mode
+        if S_ISDIR(mode) and not S_ISLNK(mode) and mode & S_ISVTX:
+            return TrashDir(top=top, path=shared / str(getuid()))
+        else:
+            return None
+
+
+def _trash_dir(path: Path, home: TrashDir) -> TrashDir:
+    home.path.mkdir(parents=True, exist_ok=True)
+    if lstat(path).st_dev == stat(home.path).st_dev:
+        return home
+    else:
+        top = _topdir(path.parent)
+        return _shared(top) or TrashDir(top=top, path=top / f".Trash-{getuid()}")
+
+
+def _prepare(bin: TrashDir) -> None:
+    bin.files.mkdir(mode=0o700, parents=True, exist_ok=True)
+    bin.info.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+
+def _reserve(bin: TrashDir, path: Path, now: datetime) -> Path:
+    """
+    Atomically claim a unique name by creating its `.trashinfo` first
+    """
+
+    original = path.relative_to(bin.top) if bin.top else path
+    body = "".join(
+        f"{line}\n"
+        for line in (
+            _HEADER,
+            f"Path={quote(str(original))}",
+            f"DeletionDate={now.strftime(_DATE_FMT)}",
+        )
+    )
+
+    for idx in range(1, 1 << 16):
+        name = path.name if idx == 1 else f"{path.stem}.{idx}{path.suffix}"
+        info = bin.info / f"{name}{_INFO}"
+        try:
+            fd = os_open(info, O_WRONLY | O_CREAT | O_EXCL, 0o600)
+        except FileExistsError:
+            continue
+        else:
+            try:
+                write(fd, body.encode("UTF-8"))
+            finally:
+                close(fd)
+            return bin.files / name
+    else:
+        raise FileExistsError(path)
+
+
+def _rm(path: Path) -> None:
+    if S_ISDIR(lstat(path).st_mode):
+        rmtree(path)
+    else:
+        path.unlink()
+
+
+def _move(src: Path, dst: Path) -> None:
+    """
+    A rename, or copy then delete when the trash is on another device
+    """
+
+    try:
+        rename(src, dst)
+    except OSError as e:
+        if e.errno != EXDEV:
+            raise
+        try:
+            if S_ISDIR(lstat(src).st_mode):
+                copytree(src, dst, symlinks=True)
+            else:
+                copy2(src, dst, follow_symlinks=False)
+        except BaseException:
+            with suppress(OSError):
+                _rm(dst)
+            raise
+        else:
+            _rm(src)
+
+
+def trash(
+    paths: Sequence[PurePath], trashed: MutableMapping[PurePath, PurePath]
+) -> None:
+    """
+    Move into the freedesktop.org trash, the home trash if the top dir's is unusable
+    """
+
+    home, now = _home_trash(), datetime.now()
+    for path in map(Path, paths):
+        bin = _trash_dir(path, home=home)
+        try:
+            _prepare(bin)
+            dst = _reserve(bin, path=path, now=now)
+        except OSError:
+            if bin == home:
+                raise
+            bin = home
+            _prepare(bin)
+            dst = _reserve(bin, path=path, now=now)
+        try:
+            _move(path, dst)
+        except OSError:
+            info_path(dst).unlink()
+            raise
+        else:
+            trashed[path] = dst
+
+
+def info_path(trashed: PurePath) -> Path:
+    files = Path(trashed).parent
+    return files.parent / "info" / f"{trashed.name}{_INFO}"
+
+
+def restore(operations: Mapping[PurePath, PurePath]) -> None:
+    for original, trashed in operations.items():
+        if lexists(original):
+            raise FileExistsError(original)
+        else:
+            Path(original).parent.mkdir(parents=True, exist_ok=True)
+            _move(Path(trashed), Path(original))
+            with suppress(FileNotFoundError):
+                info_path(trashed).unlink()
+
+
+def _parse(bin: TrashDir, info: Path) -> Optional[Trashed]:
+    fields: MutableMapping[str, str] = {}
+    with suppress(OSError, UnicodeDecodeError):
+        lines = iter(info.read_text("UTF-8").splitlines())
+        if next(lines, None) == _HEADER:
+            for line in lines:
+                key, _, val = line.partition("=")
+                fields[key.strip()] = val.strip()
+
+    if not (path := fields.get("Path")):
+        return None
+    else:
+        original = PurePath(unquote(path))
+        try:
+            deleted = datetime.strptime(fields.get("DeletionDate", ""), _DATE_FMT)
+        except ValueError:
+            deleted = datetime.fromtimestamp(0)
+        return Trashed(
+            original=bin.top / original if bin.top else original,
+            trashed=bin.files / info.name[: -len(_INFO)],
+            deleted=deleted,
+        )
+
+
+def _trash_dirs(roots: Sequence[PurePath]) -> Iterator[TrashDir]:
+    yield _home_trash()
+    seen: MutableSet[Path] = set()
+    for root in roots:
+        top = _topdir(Path(root))
+        if top not in seen:
+            seen.add(top)
+            if shared := _shared(top):
+                yield shared
+            yield TrashDir(top=top, path=top / f".Trash-{getuid()}")
+
+
+def listing(roots: Sequence[PurePath]) -> Sequence[Trashed]:
+    """
+    Trashed items that used to live under `roots`, newest first
+    """
+
+    def cont() -> Iterator[Trashed]:
+        for bin in _trash_dirs(roots):
+            with suppress(OSError):
+                for info in bin.info.glob(f"*{_INFO}"):
+                    if item := _parse(bin, info=info):
+                        if any(
+                            item.original == root or root in item.original.parents
+                            for root in roots
+                        ):
+                            yield item
+
+    return sorted(cont(), key=lambda t: t.deleted, reverse=True)
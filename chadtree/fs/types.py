@@ -42,11 +42,21 @@ class Node:
     path: PurePath
     pointed: Optional[PurePath]
     children: Mapping[PurePath, Node]
+    truncated: int
+    st_size: int
+    st_mtime_ns: int
     cache: _RenderCache = field(default_factory=_RenderCache)
 
 
+@dataclass(frozen=True)
+class DiskUsage:
+    sizes: Mapping[PurePath, int] = field(default_factory=dict)
+    pending: AbstractSet[PurePath] = frozenset()
+
+
 @dataclass(frozen=True)
 class Ignored:
     name_exact: AbstractSet[str]
     name_glob: Sequence[str]
     path_glob: Sequence[str]
+    gitignore: bool
@@ -5,6 +5,7 @@ from typing import Mapping, MutableMapping, cast
 
 from pynvim_pp.nvim import Nvim
 from pynvim_pp.types import NoneType
+from std2.cell import RefCell
 
 from ..fs.ops import ancestors
 from ..state.types import Diagnostics
@@ -12,12 +13,27 @@ from ..state.types import Diagnostics
 _LUA = (
     Path(__file__).resolve(strict=True).with_name("diagnostics.lua").read_text("UTF-8")
 )
+_SUBSCRIBE = (
+    Path(__file__).resolve(strict=True).with_name("subscribe.lua").read_text("UTF-8")
+)
 
 if sys.version_info < (3, 9):
     _C = Counter
 else:
     _C = Counter[int]
 
+_SUBSCRIBED = RefCell(False)
+
+
+def _counts(counts: Mapping[str, int], min_severity: int) -> _C:
+    return Counter(
+        {
+            s: count
+            for severity, count in (counts or {}).items()
+            if (s := int(severity)) <= min_severity
+        }
+    )
+
 
 async def poll(min_severity: int) -> Diagnostics:
     diagnostics: Mapping[str, Mapping[str, int]] = cast(
@@ -25,13 +41,7 @@ async def poll(min_severity: int) -> Diagnostics:
     )
 
     raw = {
-        PurePath(path): Counter(
-            {
-                s: count
-                for severity, count in (counts or {}).items()
-                if (s := int(severity)) <= min_severity
-            }
-        )
+        PurePath(path): _counts(counts, min_severity=min_severity)
         for path, counts in (diagnostics or {}).items()
     }
 
@@ -42,3 +52,43 @@ async def poll(min_severity: int) -> Diagnostics:
             c += counts
 
     return {**acc, **raw}
+
+
+async def subscribe(method: str) -> None:
+    """
+    Have nvim push each buffer's counts on `DiagnosticChanged`, instead of polling
+    """
+
+    subscribed = await Nvim.fn.luaeval(bool, _SUBSCRIBE, (method, "CHADdiagnostics"))
+    _SUBSCRIBED.val = subscribed
+
+
+def subscribed() -> bool:
+    return _SUBSCRIBED.val
+
+
+def patch(
+    diagnostics: Diagnostics,
+    path: PurePath,
+    counts: Mapping[str, int],
+    min_severity: int,
+) -> Diagnostics:
+    """
+    Swap one file's counts into its ancestors' totals, same object if unchanged
+    """
+
+    prev = Counter(diagnostics.get(path, {}))
+    new = _counts(counts, min_severity=min_severity)
+    if new == prev:
+        return diagnostics
+    else:
+        acc = {**diagnostics}
+        for parent in (path, *ancestors(path)):
+            c = Counter(acc.get(parent, {}))
+            c.subtract(prev)
+            c.update(new)
+            if rolled := +c:
+                acc[parent] = rolled
+            else:
+                acc.pop(parent, None)
+        return acc
@@ -0,0 +1,64 @@
+(function(method, group)
+  if not (vim.diagnostic and vim.api.nvim_create_autocmd) then
+    return false
+  end
+
+  local severities = function(buf)
+    local acc = {}
+    for _, row in pairs(vim.diagnostic.get(buf)) do
+      local severity = tostring(row.severity)
+      acc[severity] = (acc[severity] or 0) + 1
+    end
+    return acc
+  end
+
+  local paths = {}
+  for _, buf in ipairs(vim.api.nvim_list_bufs()) do
+    local path = vim.api.nvim_buf_get_name(buf)
+    if path ~= "" then
+      paths[buf] = path
+    end
+  end
+
+  local sync = function(buf)
+    local prev = paths[buf]
+    local path =
+      vim.api.nvim_buf_is_valid(buf) and vim.api.nvim_buf_get_name(buf) or ""
+    if prev and prev ~= path then
+      CHAD[method](prev, {})
+    end
+    if path ~= "" then
+      paths[buf] = path
+      CHAD[method](path, severities(buf))
+    else
+      paths[buf] = nil
+    end
+  end
+
+  local augroup = vim.api.nvim_create_augroup(group, {clear = true})
+
+  vim.api.nvim_create_autocmd(
+    {"DiagnosticChanged", "BufFilePost"},
+    {
+      group = augroup,
+      callback = function(args)
+        sync(args.buf)
+      end
+    }
+  )
+
+  vim.api.nvim_create_autocmd(
+    "BufWipeout",
+    {
+      group = augroup,
+      callback = function(args)
+        local prev = paths[args.buf]
+        paths[args.buf] = nil
+        if prev then
+          CHAD[method](prev, {})
+        end
+      end
+    }
+  )
+  return true
+end)(unpack(_A))
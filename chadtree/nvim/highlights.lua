@@ -0,0 +1,12 @@
+(function(prefix)
+  local acc = {}
+  for _, name in ipairs(vim.fn.getcompletion(prefix, "highlight")) do
+    if vim.startswith(name, prefix) then
+      local defn = vim.fn.execute("highlight " .. name)
+      if not string.find(defn, "cleared", 1, true) then
+        table.insert(acc, name)
+      end
+    end
+  end
+  return acc
+end)(_A)
@@ -0,0 +1,47 @@
+from pathlib import Path
+from typing import Iterable, MutableSet, Sequence, cast
+
+from pynvim_pp.atomic import Atomic
+from pynvim_pp.highlight import HLgroup, highlight
+from pynvim_pp.nvim import Nvim
+from pynvim_pp.types import NoneType
+
+from ..consts import FM_HL_PREFIX
+from ..view.types import HLcontext
+
+_LUA = (
+    Path(__file__).resolve(strict=True).with_name("highlights.lua").read_text("UTF-8")
+)
+
+_DEFINED: MutableSet[str] = set()
+
+
+async def load_defined() -> None:
+    """
+    Names are stable, groups from a previous CHADTree in this nvim are still good
+    """
+
+    names = await Nvim.fn.luaeval(NoneType, _LUA, f"{FM_HL_PREFIX}_")
+    _DEFINED.update(cast(Sequence[str], names or ()))
+
+
+def undefined(context: HLcontext, groups: Iterable[str]) -> Sequence[HLgroup]:
+    return tuple(
+        group
+        for name in groups
+        if name not in _DEFINED and (group := context.groups.get(name))
+    )
+
+
+def mark_defined(groups: Iterable[HLgroup]) -> None:
+    _DEFINED.update(group.name for group in groups)
+
+
+def redefine(context: HLcontext) -> Atomic:
+    """
+    `:colorscheme` clears every group
+    """
+
+    return highlight(
+        *(group for name, group in context.groups.items() if name in _DEFINED)
+    )
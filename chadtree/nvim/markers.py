@@ -1,48 +1,92 @@
 from asyncio import gather
-from collections import Counter
 from itertools import chain
-from pathlib import PurePath
-from typing import AbstractSet, Mapping, MutableMapping, MutableSet, Sequence, cast
+from pathlib import Path, PurePath
+from typing import (
+    AbstractSet,
+    Any,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 
-from pynvim_pp.atomic import Atomic
-from pynvim_pp.buffer import Buffer
 from pynvim_pp.nvim import Marker, Nvim
 from pynvim_pp.types import NoneType
 
 from ..fs.ops import ancestors
 from .types import Markers
 
+_LUA = Path(__file__).resolve(strict=True).with_name("quickfix.lua").read_text("UTF-8")
 
-async def _bookmarks() -> Mapping[PurePath, AbstractSet[Marker]]:
-    acc: MutableMapping[PurePath, MutableSet[Marker]] = {}
-    bookmarks = await Nvim.list_bookmarks()
-    for marker, (path, _, _) in bookmarks.items():
-        if path:
-            for marked_path in chain((path,), ancestors(path)):
-                marks = acc.setdefault(marked_path, set())
-                marks.add(marker)
 
-    return acc
+def _lineage(path: PurePath) -> Sequence[PurePath]:
+    return (path, *ancestors(path))
 
 
-async def _quickfix() -> Mapping[PurePath, int]:
-    qflist = cast(Sequence[Mapping[str, int]], await Nvim.fn.getqflist(NoneType))
+async def _bookmarks(
+    prev: Markers,
+) -> Tuple[Mapping[Marker, PurePath], Mapping[PurePath, AbstractSet[Marker]]]:
+    bookmarks = await Nvim.list_bookmarks()
+    marked = {marker: path for marker, (path, _, _) in bookmarks.items() if path}
+    if marked == prev.marked:
+        return prev.marked, prev.bookmarks
+    else:
+        acc: MutableMapping[PurePath, AbstractSet[Marker]] = {**prev.bookmarks}
+        for marker in prev.marked.keys() | marked.keys():
+            before, after = prev.marked.get(marker), marked.get(marker)
+            if before != after:
+                for path in _lineage(before) if before else ():
+                    if marks := acc.get(path, frozenset()) - {marker}:
+                        acc[path] = marks
+                    else:
+                        acc.pop(path, None)
+                for path in _lineage(after) if after else ():
+                    acc[path] = acc.get(path, frozenset()) | {marker}
+        return marked, acc
 
-    atomic = Atomic()
-    for q in qflist:
-        bufnr = q["bufnr"]
-        buf = Buffer.from_int(bufnr)
-        atomic.buf_get_name(buf)
 
-    bufnames = cast(Sequence[str], await atomic.commit(NoneType))
-    filenames = tuple(map(PurePath, bufnames))
-    parents = (ancestor for fullname in filenames for ancestor in ancestors(fullname))
-    locations = Counter(chain(filenames, parents))
+async def _quickfix(
+    prev: Markers,
+) -> Tuple[Optional[Sequence[int]], Mapping[PurePath, int], Mapping[PurePath, int]]:
+    tick = prev.qf_tick or ()
+    ret = cast(Mapping[str, Any], await Nvim.fn.luaeval(NoneType, _LUA, tick))
+    new_tick = cast(Sequence[int], ret["tick"])
+    if "files" not in ret:
+        return new_tick, prev.qf_files, prev.quick_fix
+    else:
+        files = {
+            PurePath(name): count
+            for name, count in cast(Mapping[str, int], ret["files"] or {}).items()
+        }
+        acc: MutableMapping[PurePath, int] = {**prev.quick_fix}
+        for path in prev.qf_files.keys() | files.keys():
+            if delta := files.get(path, 0) - prev.qf_files.get(path, 0):
+                for parent in _lineage(path):
+                    if count := acc.get(parent, 0) + delta:
+                        acc[parent] = count
+                    else:
+                        acc.pop(parent, None)
+        return new_tick, files, acc
 
-    return locations
 
+async def markers(prev: Markers) -> Markers:
+    """
+    Only the bookmarks and quickfix files that changed since `prev` are re-counted
+    """
 
-async def markers() -> Markers:
-    qf, bm = await gather(_quickfix(), _bookmarks())
-    markers = Markers(quick_fix=qf, bookmarks=bm)
-    return markers
+    (qf_tick, qf_files, qf), (marked, bm) = await gather(
+        _quickfix(prev), _bookmarks(prev)
+    )
+    if qf is prev.quick_fix and bm is prev.bookmarks and qf_tick == prev.qf_tick:
+        return prev
+    else:
+        markers = Markers(
+            quick_fix=qf,
+            bookmarks=bm,
+            qf_tick=qf_tick,
+            qf_files=qf_files,
+            marked=marked,
+        )
+        return markers
@@ -0,0 +1,23 @@
+(function(tick)
+  local info = vim.fn.getqflist({id = 0, changedtick = 0})
+  local now = {info.id, info.changedtick}
+  if tick[1] == now[1] and tick[2] == now[2] then
+    return {tick = now}
+  end
+
+  local names, acc = {}, {}
+  for _, item in ipairs(vim.fn.getqflist()) do
+    local buf = item.bufnr
+    if buf > 0 then
+      local name = names[buf]
+      if not name then
+        name = vim.api.nvim_buf_get_name(buf)
+        names[buf] = name
+      end
+      if name ~= "" then
+        acc[name] = (acc[name] or 0) + 1
+      end
+    end
+  end
+  return {tick = now, files = acc}
+end)(...)
@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import PurePath
-from typing import AbstractSet, Mapping
+from typing import AbstractSet, Mapping, Optional, Sequence
 
 from pynvim_pp.nvim import Marker
 
@@ -9,3 +9,6 @@ from pynvim_pp.nvim import Marker
 class Markers:
     quick_fix: Mapping[PurePath, int]
     bookmarks: Mapping[PurePath, AbstractSet[Marker]]
+    qf_tick: Optional[Sequence[int]] = None
+    qf_files: Mapping[PurePath, int] = field(default_factory=dict)
+    marked: Mapping[Marker, PurePath] = field(default_factory=dict)
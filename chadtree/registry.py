@@ -1,12 +1,13 @@
 from asyncio import Queue
 from functools import lru_cache
-from typing import Any, Awaitable, Callable, Sequence, Tuple
+from typing import Any, Awaitable, Callable, MutableSet, Sequence, Tuple, TypeVar
 
 from pynvim_pp.autocmd import AutoCMD
 from pynvim_pp.handler import RPC
-from pynvim_pp.rpc_types import Method
+from pynvim_pp.rpc_types import Method, RPCallable
 
 _MSG = Tuple[bool, Method, Sequence[Any]]
+_F = TypeVar("_F", bound=RPCallable)
 
 NAMESPACE = "CHAD"
 
@@ -22,6 +23,16 @@ def queue() -> Queue:
 
 autocmd = AutoCMD()
 rpc = RPC(NAMESPACE, name_gen=_name_gen)
+interrupts: MutableSet[Method] = set()
+
+
+def interrupt(fn: _F) -> _F:
+    """
+    Handled as soon as it arrives, instead of waiting for the event queue
+    """
+
+    interrupts.add(fn.method)
+    return fn
 
 
 async def enqueue_event(sync: bool, method: Method, params: Sequence[Any] = ()) -> None:
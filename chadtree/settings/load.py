@@ -1,6 +1,14 @@
+import pickle
+from asyncio import create_task
+from contextlib import suppress
 from dataclasses import dataclass
 from enum import Enum, auto
+from hashlib import blake2b
+from json import loads
 from locale import strxfrm
+from os import environ, getpid
+from pathlib import Path
+from sys import modules
 from typing import (
     AbstractSet,
     Any,
@@ -9,6 +17,7 @@ from typing import (
     Optional,
     Sequence,
     SupportsFloat,
+    Tuple,
     Union,
     cast,
 )
@@ -18,6 +27,7 @@ from pynvim_pp.nvim import Nvim
 from pynvim_pp.rpc_types import RPCallable
 from pynvim_pp.types import NoneType
 from pynvim_pp.window import Window
+from std2.asyncio import to_thread
 from std2.configparser import hydrate
 from std2.graphlib import merge
 from std2.pickle.decoder import new_decoder
@@ -28,19 +38,28 @@ from chad_types import (
     ARTIFACT,
     Artifact,
     IconColourSetEnum,
+    IconGlyphs,
     IconGlyphSetEnum,
     LSColoursEnum,
     TextColourSetEnum,
 )
 
-from ..consts import CONFIG_YML, SETTINGS_VAR
+from ..consts import CONFIG_YML, SESSION_DIR, SETTINGS_VAR
 from ..fs.types import Ignored
 from ..registry import NAMESPACE
 from ..view.load import load_theme
-from ..view.types import HLGroups, Sortby, ViewOptions
+from ..view.types import Column, HLcontext, HLGroups, Sortby, ViewOptions
 from .types import MimetypeOptions, Settings, VersionCtlOpts
 
 
+_THEME_SRC = sorted(
+    (
+        *(Path(__file__).resolve(strict=True).parent.parent / "view").glob("*.py"),
+        Path(cast(str, modules[Artifact.__module__].__file__)),
+    )
+)
+
+
 class _OpenDirection(Enum):
     left = auto()
     right = auto()
@@ -53,12 +72,15 @@ class _UserOptions:
     follow_links: bool
     follow_ignore: bool
     lang: Optional[str]
+    max_children: int
     mimetypes: MimetypeOptions
     page_increment: int
     polling_rate: SupportsFloat
+    process_pool: bool
     session: bool
     show_hidden: bool
     min_diagnostics_severity: int
+    undo_levels: int
     version_control: VersionCtlOpts
 
 
@@ -75,6 +97,7 @@ class _UserTheme:
 class _UserView:
     open_direction: _OpenDirection
     width: int
+    columns: Sequence[Column]
     sort_by: Sequence[Sortby]
     time_format: str
     window_options: Mapping[str, Union[bool, str]]
@@ -92,12 +115,58 @@ class _UserConfig:
     profiling: bool
 
 
+def _theme_key(raw: bytes, theme: _UserTheme) -> str:
+    hashed = blake2b(raw, digest_size=16)
+    hashed.update(repr(theme).encode("UTF-8"))
+    hashed.update(environ.get("LS_COLORS", "").encode("UTF-8"))
+    for src in _THEME_SRC:
+        hashed.update(str(src.stat().st_mtime_ns).encode("UTF-8"))
+    return hashed.hexdigest()
+
+
+def _theme(cache: Path, theme: _UserTheme) -> Tuple[IconGlyphs, HLcontext]:
+    """
+    Decoding the artifact and parsing LS_COLORS is most of startup, keep the result
+    """
+
+    raw = ARTIFACT.read_bytes()
+    path = (cache / _theme_key(raw, theme)).with_suffix(".pickle")
+    with suppress(Exception):
+        icons, context = pickle.loads(path.read_bytes())
+        return icons, context
+
+    decode = new_decoder[Artifact](Artifact)
+    icons, context = load_theme(
+        artifact=decode(loads(raw)),
+        particular_mappings=theme.highlights,
+        discrete_colours=theme.discrete_colour_map,
+        icon_set=theme.icon_glyph_set,
+        icon_colour_set=theme.icon_colour_set,
+        text_colour_set=theme.text_colour_set,
+    )
+
+    with suppress(OSError):
+        cache.mkdir(parents=True, exist_ok=True)
+        for stale in cache.glob("*.pickle"):
+            stale.unlink(missing_ok=True)
+        tmp = path.with_suffix(f".{getpid()}")
+        tmp.write_bytes(pickle.dumps((icons, context)))
+        tmp.replace(path)
+
+    return icons, context
+
+
+async def storage(xdg: bool) -> Path:
+    if xdg:
+        return Path(await Nvim.fn.stdpath(str, "cache")) / "chad_sessions"
+    else:
+        return SESSION_DIR
+
+
 async def initial(specs: Iterable[RPCallable]) -> Settings:
-    a_decode = new_decoder[Artifact](Artifact)
     c_decode = new_decoder[_UserConfig](_UserConfig)
 
     win = await Window.get_current()
-    artifacts = a_decode(safe_load(ARTIFACT.read_text("UTF-8")))
 
     user_config = cast(
         Mapping[str, Any], await Nvim.vars.get(NoneType, SETTINGS_VAR) or {}
@@ -109,20 +178,16 @@ async def initial(specs: Iterable[RPCallable]) -> Settings:
     )
     options, view, theme = config.options, config.view, config.theme
 
+    cache = await storage(config.xdg) / "themes"
+    themed = create_task(to_thread(lambda: _theme(cache, theme=theme)))
+
     atomic = Atomic()
     for opt in view.window_options:
         atomic.win_get_option(win, opt)
     win_opts = cast(Sequence[Union[bool, str]], await atomic.commit(NoneType))
     win_actual_opts = {k: v for k, v in zip(view.window_options, win_opts)}
 
-    icons, hl_context = load_theme(
-        artifact=artifacts,
-        particular_mappings=theme.highlights,
-        discrete_colours=theme.discrete_colour_map,
-        icon_set=theme.icon_glyph_set,
-        icon_colour_set=theme.icon_colour_set,
-        text_colour_set=theme.text_colour_set,
-    )
+    icons, hl_context = await themed
 
     use_icons = theme.icon_glyph_set not in {
         IconGlyphSetEnum.ascii,
@@ -132,6 +197,7 @@ async def initial(specs: Iterable[RPCallable]) -> Settings:
     view_opts = ViewOptions(
         hl_context=hl_context,
         icons=icons,
+        columns=tuple(view.columns),
         sort_by=tuple(view.sort_by),
         use_icons=use_icons,
         time_fmt=view.time_format,
@@ -159,13 +225,16 @@ async def initial(specs: Iterable[RPCallable]) -> Settings:
             idle_timeout=float(config.idle_timeout),
             keymap=keymap,
             lang=options.lang,
+            max_children=options.max_children,
             mime=options.mimetypes,
             min_diagnostics_severity=options.min_diagnostics_severity,
             open_left=view.open_direction is _OpenDirection.left,
             page_increment=options.page_increment,
             polling_rate=float(options.polling_rate),
+            process_pool=options.process_pool,
             session=options.session,
             show_hidden=options.show_hidden,
+            undo_levels=options.undo_levels,
             version_ctl=options.version_control,
             view=view_opts,
             width=view.width,
@@ -25,14 +25,17 @@ class Settings:
     ignores: Ignored
     keymap: Mapping[str, AbstractSet[str]]
     lang: Optional[str]
+    max_children: int
     mime: MimetypeOptions
     open_left: bool
     page_increment: int
     polling_rate: float
+    process_pool: bool
     idle_timeout: float
     profiling: bool
     session: bool
     show_hidden: bool
+    undo_levels: int
     version_ctl: VersionCtlOpts
     view: ViewOptions
     width: int
@@ -5,29 +5,182 @@ from asyncio import (
     run_coroutine_threadsafe,
     wrap_future,
 )
-from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from concurrent.futures import (
+    Future,
+    InvalidStateError,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from contextlib import suppress
-from threading import Thread
-from typing import Any, Awaitable, Callable, Coroutine, TypeVar
+from dataclasses import dataclass, replace
+from multiprocessing import cpu_count, get_context
+from threading import Lock, Thread
+from time import monotonic
+from typing import Any, Awaitable, Callable, Coroutine, Sequence, TypeVar, Union
 
 _T = TypeVar("_T")
 
 
+@dataclass(frozen=True)
+class PoolStats:
+    name: str
+    workers: int
+    queued: int
+    running: int
+    done: int
+    wait_avg: float
+    wait_max: float
+    run_avg: float
+
+
+class _Meter:
+    def __init__(self, name: str, workers: int) -> None:
+        self._name, self._workers = name, workers
+        self._lock = Lock()
+        self._queued = self._running = self._started = self._done = 0
+        self._wait = self._wait_max = self._run = 0.0
+
+    def queued(self) -> float:
+        with self._lock:
+            self._queued += 1
+        return monotonic()
+
+    def cancelled(self) -> None:
+        with self._lock:
+            self._queued -= 1
+
+    def started(self, t0: float) -> float:
+        t1 = monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._started += 1
+            self._wait += t1 - t0
+            self._wait_max = max(self._wait_max, t1 - t0)
+        return t1
+
+    def finished(self, t1: float) -> None:
+        with self._lock:
+            self._running -= 1
+            self._done += 1
+            self._run += monotonic() - t1
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            started, done = max(self._started, 1), max(self._done, 1)
+            return PoolStats(
+                name=self._name,
+                workers=self._workers,
+                queued=self._queued,
+                running=self._running,
+                done=self._done,
+                wait_avg=self._wait / started,
+                wait_max=self._wait_max,
+                run_avg=self._run / done,
+            )
+
+
+class MeteredPool(ThreadPoolExecutor):
+    """
+    Counts queue length, time spent waiting for a worker, and time spent running
+    """
+
+    def __init__(self, name: str, workers: int) -> None:
+        super().__init__(max_workers=workers, thread_name_prefix=name)
+        self.meter = _Meter(name, workers=workers)
+
+    def submit(self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any) -> Future:
+        t0 = self.meter.queued()
+
+        def cont() -> _T:
+            t1 = self.meter.started(t0)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.meter.finished(t1)
+
+        def done(fut: Future) -> None:
+            if fut.cancelled():
+                self.meter.cancelled()
+
+        fut = super().submit(cont)
+        fut.add_done_callback(done)
+        return fut
+
+
+class MeteredProcessPool(ProcessPoolExecutor):
+    """
+    Only the round trip is visible from this side, it all counts as run time
+    """
+
+    def __init__(self, name: str, workers: int) -> None:
+        super().__init__(max_workers=workers, mp_context=get_context("spawn"))
+        self.meter = _Meter(name, workers=workers)
+
+    def submit(self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any) -> Future:
+        t0 = self.meter.queued()
+
+        def done(fut: Future) -> None:
+            if fut.cancelled():
+                self.meter.cancelled()
+            else:
+                self.meter.started(monotonic())
+                self.meter.finished(t0)
+
+        fut = super().submit(fn, *args, **kwargs)
+        fut.add_done_callback(done)
+        return fut
+
+
+@dataclass(frozen=True)
+class Pools:
+    interactive: MeteredPool
+    walk: MeteredPool
+    fs: MeteredPool
+    vcs: Union[MeteredPool, MeteredProcessPool]
+
+    def stats(self) -> Sequence[PoolStats]:
+        pools = (self.interactive, self.walk, self.fs, self.vcs)
+        return tuple(pool.meter.stats() for pool in pools)
+
+
+def new_pools() -> Pools:
+    """
+    Quick lookups never wait behind tree walks, file operations or git parsing
+    """
+
+    cpus = cpu_count()
+    return Pools(
+        interactive=MeteredPool("interactive", workers=min(8, cpus + 4)),
+        walk=MeteredPool("walk", workers=min(32, cpus + 4)),
+        fs=MeteredPool("fs", workers=cpus),
+        vcs=MeteredPool("vcs", workers=2),
+    )
+
+
+def offload(pools: Pools) -> Pools:
+    """
+    Pure, CPU heavy parsing in worker processes, out of reach of the GIL
+    """
+
+    return replace(pools, vcs=MeteredProcessPool("vcs", workers=2))
+
+
 class AsyncExecutor:
-    def __init__(self, threadpool: ThreadPoolExecutor) -> None:
+    def __init__(self, pools: Pools) -> None:
         f: Future = Future()
         self._fut: Future = Future()
 
         async def cont() -> None:
             loop = get_running_loop()
-            loop.set_default_executor(threadpool)
+            loop.set_default_executor(pools.walk)
             f.set_result(loop)
             main: Coroutine = await wrap_future(self._fut)
             await main
 
         self._th = Thread(daemon=True, target=lambda: run(cont()))
         self._th.start()
-        self.threadpool = threadpool
+        self.pools = pools
         self.loop: AbstractEventLoop = f.result()
 
     def run(self, main: Awaitable[Any]) -> None:
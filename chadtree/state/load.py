@@ -1,30 +1,24 @@
 from asyncio import gather
-from concurrent.futures import ThreadPoolExecutor
-from pathlib import Path
 from uuid import uuid4
 
 from pynvim_pp.nvim import Nvim
 
-from ..consts import SESSION_DIR
 from ..fs.cartographer import new
+from ..fs.types import DiskUsage
 from ..nvim.markers import markers
+from ..nvim.types import Markers
+from ..settings.load import storage
 from ..settings.types import Settings
 from ..version_ctl.types import VCStatus
-from .executor import AsyncExecutor
+from .executor import AsyncExecutor, Pools, offload
 from .ops import load_session
 from .types import Selection, Session, State
 
 
-async def initial(settings: Settings, th: ThreadPoolExecutor) -> State:
-    executor = AsyncExecutor(threadpool=th)
-    cwd, marks = await gather(Nvim.getcwd(), markers())
-    storage = (
-        Path(await Nvim.fn.stdpath(str, "cache")) / "chad_sessions"
-        if settings.xdg
-        else SESSION_DIR
-    )
-
-    session = Session(workdir=cwd, storage=storage)
+async def initial(settings: Settings, pools: Pools) -> State:
+    executor = AsyncExecutor(pools=offload(pools) if settings.process_pool else pools)
+    cwd, storage_dir = await gather(Nvim.getcwd(), storage(settings.xdg))
+    session = Session(workdir=cwd, storage=storage_dir)
     stored = await load_session(session) if settings.session else None
     index = {cwd} | (stored.index if stored else frozenset())
 
@@ -40,8 +34,18 @@ async def initial(settings: Settings, th: ThreadPoolExecutor) -> State:
     )
 
     selection: Selection = frozenset()
-    node = await new(
-        executor, follow_links=settings.follow_links, root=cwd, index=index
+    node, marks = await gather(
+        new(
+            executor,
+            follow_links=settings.follow_links,
+            root=cwd,
+            index=index,
+            page_size=settings.max_children,
+            pages={},
+            show_hidden=show_hidden,
+            ignores=settings.ignores,
+        ),
+        markers(Markers(quick_fix={}, bookmarks={})),
     )
     vc = VCStatus()
 
@@ -55,8 +59,10 @@ async def initial(settings: Settings, th: ThreadPoolExecutor) -> State:
         session=session,
         vim_focus=True,
         index=index,
+        pages={},
         selection=selection,
         filter_pattern=filter_pattern,
+        grep=None,
         show_hidden=show_hidden,
         follow=settings.follow,
         follow_links=settings.follow_links,
@@ -66,6 +72,7 @@ async def initial(settings: Settings, th: ThreadPoolExecutor) -> State:
         root=node,
         markers=marks,
         diagnostics={},
+        disk_usage=DiskUsage(),
         vc=vc,
         current=current,
         window_order={},
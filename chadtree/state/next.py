@@ -5,11 +5,22 @@ from uuid import uuid4
 from pynvim_pp.rpc_types import ExtData
 from std2.types import Void, VoidType, or_else
 
+from ..fs.cartographer import reveal as reveal_pages
 from ..fs.cartographer import update
-from ..fs.types import Node
+from ..fs.types import DiskUsage, Node
 from ..nvim.types import Markers
+from ..timeit import timeit
 from ..version_ctl.types import VCStatus
-from .types import Diagnostics, FilterPattern, Index, Selection, Session, State
+from .types import (
+    Diagnostics,
+    FilterPattern,
+    Grep,
+    Index,
+    Pages,
+    Selection,
+    Session,
+    State,
+)
 
 
 async def forward(
@@ -17,8 +28,10 @@ async def forward(
     *,
     root: Union[Node, VoidType] = Void,
     index: Union[Index, VoidType] = Void,
+    pages: Union[Pages, VoidType] = Void,
     selection: Union[Selection, VoidType] = Void,
     filter_pattern: Union[Optional[FilterPattern], VoidType] = Void,
+    grep: Union[Optional[Grep], VoidType] = Void,
     show_hidden: Union[bool, VoidType] = Void,
     follow: Union[bool, VoidType] = Void,
     follow_links: Union[bool, VoidType] = Void,
@@ -27,61 +40,88 @@ async def forward(
     width: Union[int, VoidType] = Void,
     markers: Union[Markers, VoidType] = Void,
     diagnostics: Union[Diagnostics, VoidType] = Void,
+    disk_usage: Union[DiskUsage, VoidType] = Void,
     vc: Union[VCStatus, VoidType] = Void,
     current: Union[PurePath, VoidType] = Void,
     invalidate_dirs: Union[AbstractSet[PurePath], VoidType] = Void,
     window_order: Union[Mapping[ExtData, None], VoidType] = Void,
     session: Union[Session, VoidType] = Void,
     vim_focus: Union[bool, VoidType] = Void,
+    reveal: AbstractSet[PurePath] = frozenset(),
     trace: bool = True,
 ) -> State:
-    new_index = or_else(index, state.index)
-    new_selection = or_else(selection, state.selection)
-    new_filter_pattern = or_else(filter_pattern, state.filter_pattern)
-    new_current = or_else(current, state.current)
-    new_follow_links = or_else(follow_links, state.follow_links)
-    new_root = cast(
-        Node,
-        root
-        or (
-            await update(
+    with timeit("forward"):
+        new_index = or_else(index, state.index)
+        new_pages = or_else(pages, state.pages)
+        new_selection = or_else(selection, state.selection)
+        new_filter_pattern = or_else(filter_pattern, state.filter_pattern)
+        new_current = or_else(current, state.current)
+        new_follow_links = or_else(follow_links, state.follow_links)
+        new_hidden = or_else(show_hidden, state.show_hidden)
+        if not root and not isinstance(invalidate_dirs, VoidType):
+            targets = {*reveal, *new_selection, *filter(None, (new_current,))}
+            grown = await reveal_pages(
                 state.executor,
                 root=state.root,
-                follow_links=new_follow_links,
+                paths=targets,
                 index=new_index,
-                invalidate_dirs=invalidate_dirs,
+                page_size=state.settings.max_children,
+                pages=new_pages,
             )
-            if not isinstance(invalidate_dirs, VoidType)
-            else state.root
-        ),
-    )
-    new_markers = or_else(markers, state.markers)
-    new_vc = or_else(vc, state.vc)
-    new_hidden = or_else(show_hidden, state.show_hidden)
-    new_vim_focus = or_else(vim_focus, state.vim_focus)
+            if grown is not new_pages:
+                invalidate_dirs = {
+                    *invalidate_dirs,
+                    *(p for p, n in grown.items() if n != new_pages.get(p)),
+                }
+                new_pages = grown
+        new_root = cast(
+            Node,
+            root
+            or (
+                await update(
+                    state.executor,
+                    root=state.root,
+                    follow_links=new_follow_links,
+                    index=new_index,
+                    page_size=state.settings.max_children,
+                    pages=new_pages,
+                    show_hidden=new_hidden,
+                    ignores=state.settings.ignores,
+                    invalidate_dirs=invalidate_dirs,
+                )
+                if not isinstance(invalidate_dirs, VoidType)
+                else state.root
+            ),
+        )
+        new_markers = or_else(markers, state.markers)
+        new_vc = or_else(vc, state.vc)
+        new_vim_focus = or_else(vim_focus, state.vim_focus)
 
-    new_state = State(
-        id=uuid4(),
-        executor=state.executor,
-        settings=state.settings,
-        session=or_else(session, state.session),
-        vim_focus=new_vim_focus,
-        index=new_index,
-        selection=new_selection,
-        filter_pattern=new_filter_pattern,
-        show_hidden=new_hidden,
-        follow=or_else(follow, state.follow),
-        follow_links=new_follow_links,
-        follow_ignore=or_else(follow_ignore, state.follow_ignore),
-        enable_vc=or_else(enable_vc, state.enable_vc),
-        width=or_else(width, state.width),
-        root=new_root,
-        markers=new_markers,
-        diagnostics=or_else(diagnostics, state.diagnostics),
-        vc=new_vc,
-        current=new_current,
-        window_order=or_else(window_order, state.window_order),
-        node_row_lookup=state.node_row_lookup,
-    )
+        new_state = State(
+            id=uuid4(),
+            executor=state.executor,
+            settings=state.settings,
+            session=or_else(session, state.session),
+            vim_focus=new_vim_focus,
+            index=new_index,
+            pages=new_pages,
+            selection=new_selection,
+            filter_pattern=new_filter_pattern,
+            grep=or_else(grep, state.grep),
+            show_hidden=new_hidden,
+            follow=or_else(follow, state.follow),
+            follow_links=new_follow_links,
+            follow_ignore=or_else(follow_ignore, state.follow_ignore),
+            enable_vc=or_else(enable_vc, state.enable_vc),
+            width=or_else(width, state.width),
+            root=new_root,
+            markers=new_markers,
+            diagnostics=or_else(diagnostics, state.diagnostics),
+            disk_usage=or_else(disk_usage, state.disk_usage),
+            vc=new_vc,
+            current=new_current,
+            window_order=or_else(window_order, state.window_order),
+            node_row_lookup=state.node_row_lookup,
+        )
 
-    return new_state
+        return new_state
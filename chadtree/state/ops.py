@@ -1,3 +1,5 @@
+from asyncio import get_running_loop
+from concurrent.futures import Executor
 from hashlib import sha1
 from json import dumps, loads
 from os.path import normcase
@@ -10,6 +12,7 @@ from std2.asyncio import to_thread
 from std2.pickle.decoder import new_decoder
 from std2.pickle.encoder import new_encoder
 
+from ..fs.atlas import Atlas, decode_atlas, encode_atlas
 from .types import Session, State, StoredSession
 
 _DECODER = new_decoder[StoredSession](StoredSession)
@@ -22,6 +25,19 @@ def _session_path(cwd: PurePath, storage: Path) -> Path:
     return part.with_suffix(".json")
 
 
+def _atlas_path(cwd: PurePath, storage: Path) -> Path:
+    return _session_path(cwd, storage=storage).with_suffix(".atlas")
+
+
+def _dump(path: Path, data: bytes) -> None:
+    parent = path.parent
+    parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(dir=parent, delete=False) as f:
+        f.write(data)
+
+    Path(f.name).replace(path)
+
+
 async def _load_json(path: Path) -> Optional[Any]:
     def cont() -> Optional[Any]:
         try:
@@ -56,14 +72,32 @@ async def dump_session(state: State) -> None:
 
     json = _ENCODER(stored)
     path = _session_path(state.session.workdir, storage=state.session.storage)
-    parent = path.parent
     dumped = encode(dumps(json, ensure_ascii=False, check_circular=False, indent=2))
+    await to_thread(_dump, path, dumped)
+
+
+async def load_atlas(
+    th: Executor, session: Session, root: PurePath
+) -> Optional[Atlas]:
+    loop = get_running_loop()
+    path = _atlas_path(root, storage=session.storage)
+
+    def cont() -> Optional[Atlas]:
+        try:
+            atlas = decode_atlas(path.read_bytes())
+        except Exception:
+            return None
+        else:
+            return atlas if atlas.root == root else None
+
+    return await loop.run_in_executor(th, cont)
 
-    def cont() -> None:
-        parent.mkdir(parents=True, exist_ok=True)
-        with NamedTemporaryFile(dir=parent, delete=False) as f:
-            f.write(dumped)
 
-        Path(f.name).replace(path)
+async def dump_atlas(th: Executor, session: Session, atlas: Atlas) -> None:
+    """
+    Encoding is O(paths), kept off the interactive pool
+    """
 
-    await to_thread(cont)
+    loop = get_running_loop()
+    path = _atlas_path(atlas.root, storage=session.storage)
+    await loop.run_in_executor(th, lambda: _dump(path, data=encode_atlas(atlas)))
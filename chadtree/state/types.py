@@ -5,7 +5,7 @@ from uuid import UUID
 
 from pynvim_pp.rpc_types import ExtData
 
-from ..fs.types import Node
+from ..fs.types import DiskUsage, Node
 from ..nvim.types import Markers
 from ..settings.types import Settings
 from ..version_ctl.types import VCStatus
@@ -13,6 +13,7 @@ from .executor import AsyncExecutor
 
 Index = AbstractSet[PurePath]
 Selection = Index
+Pages = Mapping[PurePath, int]
 Diagnostics = Mapping[PurePath, Mapping[int, int]]
 
 
@@ -21,6 +22,15 @@ class FilterPattern:
     pattern: str
 
 
+@dataclass(frozen=True)
+class Grep:
+    run: UUID
+    pattern: str
+    base: PurePath
+    counts: Mapping[PurePath, int]
+    pending: bool
+
+
 @dataclass(frozen=True)
 class Session:
     workdir: PurePath
@@ -39,8 +49,10 @@ class State:
     current: Optional[PurePath]
     enable_vc: bool
     filter_pattern: Optional[FilterPattern]
+    grep: Optional[Grep]
     follow: bool
     index: Index
+    pages: Pages
     markers: Markers
     root: Node
     selection: Selection
@@ -48,6 +60,7 @@ class State:
     vc: VCStatus
     width: int
     diagnostics: Diagnostics
+    disk_usage: DiskUsage
     window_order: Mapping[ExtData, None]
     node_row_lookup: Sequence[Node]
 
@@ -1,35 +1,174 @@
+from collections import deque
 from contextlib import contextmanager
-from typing import Any, Iterator, MutableMapping, Optional, Tuple
+from contextvars import ContextVar
+from dataclasses import dataclass
+from itertools import count
+from os import getpid
+from threading import Lock, get_ident
+from time import perf_counter_ns
+from typing import (
+    Any,
+    Deque,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+)
 
 from pynvim_pp.logging import log
+from std2.cell import RefCell
 from std2.locale import si_prefixed_smol
-from std2.timeit import timeit as _timeit
 
 from .consts import DEBUG
 
-_RECORDS: MutableMapping[str, Tuple[int, float]] = {}
+# 5 significant bits, ie. buckets are at most ~6% wide
+_PRECISION = 5
+_RING = 10_000
+
+
+class Histogram:
+    """
+    Log linear buckets over nanoseconds, in the spirit of HDR histograms
+    """
+
+    def __init__(self) -> None:
+        self.buckets: MutableMapping[int, int] = {}
+        self.count = self.total = self.max = 0
+
+    def record(self, ns: int) -> None:
+        exp = max(ns.bit_length() - _PRECISION, 0)
+        idx = exp << _PRECISION | ns >> exp
+        self.buckets[idx] = self.buckets.get(idx, 0) + 1
+        self.count += 1
+        self.total += ns
+        self.max = max(self.max, ns)
+
+    def percentile(self, q: float) -> int:
+        seen, rank = 0, q * self.count
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen >= rank:
+                exp, mantissa = idx >> _PRECISION, idx & ((1 << _PRECISION) - 1)
+                return min(((mantissa + 1) << exp) - 1, self.max)
+        return self.max
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    trace: int
+    parent: Optional[int]
+    uid: int
+    tid: int
+    begin: int
+    end: int
+    args: Sequence[Any]
+
+
+@dataclass(frozen=True)
+class _Open:
+    trace: int
+    uid: int
+
+
+_TRACING = RefCell(False)
+_LOCK = Lock()
+_UIDS = count(1)
+_CURRENT: ContextVar[Optional[_Open]] = ContextVar("_CURRENT", default=None)
+_HISTOGRAMS: MutableMapping[str, Histogram] = {}
+_SPANS: Deque[Span] = deque(maxlen=_RING)
+
+
+def tracing() -> bool:
+    return _TRACING.val
+
+
+def trace(on: bool) -> None:
+    """
+    Toggled at runtime, costs one branch per `timeit` when off
+    """
+
+    _TRACING.val = on
+
+
+def histograms() -> Mapping[str, Histogram]:
+    with _LOCK:
+        return {**_HISTOGRAMS}
+
+
+def chrome_trace() -> Mapping[str, Any]:
+    """
+    https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+    """
+
+    pid = getpid()
+    with _LOCK:
+        spans = tuple(_SPANS)
+
+    events = tuple(
+        {
+            "name": span.name,
+            "ph": "X",
+            "pid": pid,
+            "tid": span.tid,
+            "ts": span.begin / 1000,
+            "dur": (span.end - span.begin) / 1000,
+            "args": {
+                "trace": span.trace,
+                "parent": span.parent,
+                "args": " ".join(map(str, span.args)),
+            },
+        }
+        for span in spans
+    )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _log(name: str, delta: int, avg: float, force: bool, *args: Any) -> None:
+    label = name.ljust(50)
+    time = f"{si_prefixed_smol(delta / 1e9, precision=0)}s".ljust(8)
+    ttime = f"{si_prefixed_smol(avg / 1e9, precision=0)}s".ljust(8)
+    msg = f"TIME -- {label} :: {time} @ {ttime} {' '.join(map(str, args))}"
+    if force:
+        log.info("%s", msg)
+    else:
+        log.debug("%s", msg)
 
 
 @contextmanager
 def timeit(
     name: str, *args: Any, force: bool = False, warn: Optional[float] = None
 ) -> Iterator[None]:
-    if DEBUG or force or warn is not None:
-        with _timeit() as t:
-            yield None
-        delta = t().total_seconds()
-        if DEBUG or force or delta >= (warn or 0):
-            times, cum = _RECORDS.get(name, (0, 0))
-            tt, c = times + 1, cum + delta
-            _RECORDS[name] = tt, c
-
-            label = name.ljust(50)
-            time = f"{si_prefixed_smol(delta, precision=0)}s".ljust(8)
-            ttime = f"{si_prefixed_smol(c / tt, precision=0)}s".ljust(8)
-            msg = f"TIME -- {label} :: {time} @ {ttime} {' '.join(map(str, args))}"
-            if force:
-                log.info("%s", msg)
-            else:
-                log.debug("%s", msg)
-    else:
+    if not (_TRACING.val or DEBUG or force or warn is not None):
         yield None
+    else:
+        parent = _CURRENT.get()
+        uid = next(_UIDS)
+        opened = _Open(trace=parent.trace if parent else uid, uid=uid)
+        token = _CURRENT.set(opened)
+        begin = perf_counter_ns()
+        try:
+            yield None
+        finally:
+            end = perf_counter_ns()
+            _CURRENT.reset(token)
+            delta = end - begin
+            with _LOCK:
+                hist = _HISTOGRAMS.setdefault(name, Histogram())
+                hist.record(delta)
+                avg = hist.total / hist.count
+                _SPANS.append(
+                    Span(
+                        name=name,
+                        trace=opened.trace,
+                        parent=parent.uid if parent else None,
+                        uid=uid,
+                        tid=get_ident(),
+                        begin=begin,
+                        end=end,
+                        args=args,
+                    )
+                )
+            if DEBUG or force or (warn is not None and delta >= warn * 1e9):
+                _log(name, delta, avg, force, *args)
@@ -1,19 +1,22 @@
 from __future__ import annotations
 from asyncio import Task, create_task, sleep
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from itertools import chain
+from pathlib import PurePath
 from typing import Optional
 
 from pynvim_pp.buffer import Buffer
 from pynvim_pp.nvim import Nvim
 from pynvim_pp.rpc_types import NvimError
+from pynvim_pp.types import NoneType
 from pynvim_pp.window import Window
 from std2.asyncio import cancel
 from std2.cell import RefCell
 
 from ..consts import FM_FILETYPE, URI_SCHEME
 from ..fs.ops import ancestors, is_file
-from ..lsp.diagnostics import poll
+from ..lsp.diagnostics import patch, poll, subscribe, subscribed
+from ..nvim.highlights import redefine
 from ..nvim.markers import markers
 from ..registry import NAMESPACE, autocmd, rpc
 from ..settings.types import Settings
@@ -46,6 +49,7 @@ async def setup(settings: Settings) -> None:
         buf = await win.get_buf()
         if await is_fm_buffer(buf):
             await _setup_fm_win(settings, win=win)
+    await subscribe(_diagnostics_changed.method)
 
 
 @rpc(blocking=False)
@@ -59,7 +63,8 @@ async def _when_idle(state: State) -> None:
         diagnostics = await poll(state.settings.min_diagnostics_severity)
         await forward(state, diagnostics=diagnostics)
 
-    _CELL.val = create_task(cont())
+    if not subscribed():
+        _CELL.val = create_task(cont())
 
 
 _ = autocmd("CursorHold", "CursorHoldI") << f"lua {NAMESPACE}.{_when_idle.method}()"
@@ -192,9 +197,42 @@ async def _update_markers(state: State) -> Stage:
     Update markers
     """
 
-    mks = await markers()
+    mks = await markers(state.markers)
     new_state = await forward(state, markers=mks)
     return Stage(new_state)
 
 
 _ = autocmd("QuickfixCmdPost") << f"lua {NAMESPACE}.{_update_markers.method}()"
+
+
+@rpc(blocking=False)
+async def _diagnostics_changed(
+    state: State, path: str, counts: Mapping[str, int]
+) -> Optional[Stage]:
+    """
+    Apply counts pushed by `DiagnosticChanged`, and zeros for renamed / wiped bufs
+    """
+
+    diagnostics = patch(
+        state.diagnostics,
+        path=PurePath(path),
+        counts=counts,
+        min_severity=state.settings.min_diagnostics_severity,
+    )
+    if diagnostics is state.diagnostics:
+        return None
+    else:
+        new_state = await forward(state, diagnostics=diagnostics)
+        return Stage(new_state)
+
+
+@rpc(blocking=False)
+async def _colour_scheme(state: State) -> None:
+    """
+    Restore highlights cleared by `:colorscheme`
+    """
+
+    await redefine(state.settings.view.hl_context).commit(NoneType)
+
+
+_ = autocmd("ColorScheme") << f"lua {NAMESPACE}.{_colour_scheme.method}()"
@@ -0,0 +1,38 @@
+from asyncio import Task, create_task
+from typing import Awaitable, Callable, MutableSet, Optional
+
+from pynvim_pp.logging import suppress_and_log
+
+from ..registry import enqueue_event, rpc
+from ..state.types import State
+from .types import Stage
+
+Settle = Callable[[State], Awaitable[Optional[Stage]]]
+
+_TASKS: MutableSet[Task] = set()
+
+
+@rpc(blocking=False)
+async def _settle(state: State, cont: Settle) -> Optional[Stage]:
+    """
+    Fold a finished fs operation into the state as it is by then
+    """
+
+    return await cont(state)
+
+
+def in_background(work: Awaitable[Settle]) -> None:
+    """
+    Run `work` off the transition lock, only its own path locks order it
+
+    What it returns runs as a transition of its own once it is done
+    """
+
+    async def cont() -> None:
+        with suppress_and_log():
+            settle = await work
+            await enqueue_event(True, method=_settle.method, params=(settle,))
+
+    task = create_task(cont())
+    _TASKS.add(task)
+    task.add_done_callback(_TASKS.discard)
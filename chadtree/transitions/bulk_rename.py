@@ -0,0 +1,183 @@
+from dataclasses import dataclass
+from itertools import chain
+from os import linesep, listdir
+from os.path import abspath, commonpath, normpath, relpath
+from pathlib import PurePath
+from typing import MutableMapping, Optional, Sequence
+from uuid import uuid4
+
+from pynvim_pp.buffer import Buffer
+from pynvim_pp.hold import hold_win
+from pynvim_pp.nvim import Nvim
+from pynvim_pp.window import Window
+from std2 import anext
+from std2.asyncio import to_thread
+from std2.locale import pathsort_key
+
+from ..consts import URI_SCHEME
+from ..fs.bulk import conflicts
+from ..fs.cartographer import act_like_dir
+from ..fs.ops import ancestors, exists_many, rename_many
+from ..lsp.notify import lsp_moved
+from ..registry import NAMESPACE, autocmd, rpc
+from ..settings.localization import LANG
+from ..state.next import forward
+from ..state.types import State
+from ..view.ops import display_path
+from .shared.index import indices
+from .shared.journal import current_journal
+from .shared.refresh import refresh
+from .shared.wm import kill_buffers
+from .types import Stage
+
+_SCHEME = f"{URI_SCHEME}-rename://"
+
+
+@dataclass(frozen=True)
+class _Pending:
+    base: PurePath
+    paths: Sequence[PurePath]
+
+
+_PENDING: MutableMapping[str, _Pending] = {}
+
+
+def _lines(pending: _Pending) -> Sequence[str]:
+    return tuple(normpath(relpath(path, pending.base)) for path in pending.paths)
+
+
+async def _targets(state: State, is_visual: bool) -> Sequence[PurePath]:
+    if state.selection:
+        return sorted(state.selection, key=pathsort_key)
+    elif node := await anext(indices(state, is_visual=is_visual), None):
+        parent = (
+            node.path
+            if act_like_dir(node, follow_links=state.follow_links)
+            else node.path.parent
+        )
+        names = await to_thread(lambda: listdir(parent))
+        return sorted((parent / name for name in names), key=pathsort_key)
+    else:
+        return ()
+
+
+@rpc(blocking=False)
+async def _bulk_rename(state: State, is_visual: bool) -> None:
+    """
+    Rename selection / folder contents by editing a buffer
+    """
+
+    if not (paths := await _targets(state, is_visual=is_visual)):
+        await Nvim.write(LANG("nothing_select"), error=True)
+    else:
+        base = PurePath(commonpath(tuple(path.parent for path in paths)))
+        pending = _Pending(base=base, paths=paths)
+        name = f"{_SCHEME}{uuid4().hex}"
+        _PENDING[name] = pending
+
+        buf = await Buffer.create(
+            listed=False, scratch=False, wipe=True, nofile=False, noswap=True
+        )
+        await buf.opts.set("buftype", val="acwrite")
+        await buf.set_lines(lines=_lines(pending))
+        await Nvim.exec("new")
+        win = await Window.get_current()
+        await win.set_buf(buf)
+        await Nvim.exec(f"file {await Nvim.fn.fnameescape(str, name)}")
+        await buf.opts.set("modified", val=False)
+
+
+@rpc(blocking=False)
+async def _bulk_rename_commit(state: State) -> Optional[Stage]:
+    """
+    Carry out the renames written to the buffer
+    """
+
+    buf = await Buffer.get_current()
+    name = await buf.get_name()
+    if not (pending := _PENDING.get(name)):
+        return None
+
+    lines = await buf.get_lines()
+    if len(lines) != len(pending.paths) or not all(lines):
+        await Nvim.write(LANG("bulk_rename_mismatch"), error=True)
+        return None
+
+    operations = {
+        src: PurePath(abspath(pending.base / line))
+        for src, line in zip(pending.paths, lines)
+        if PurePath(abspath(pending.base / line)) != src
+    }
+    existence = await exists_many(operations.values(), follow=False)
+    existing = {path for path, exists in existence.items() if exists}
+
+    if taken := conflicts(operations, existing=existing):
+        msg = linesep.join(
+            display_path(path, state=state) for path in sorted(taken, key=pathsort_key)
+        )
+        await Nvim.write(
+            LANG("paths already exist", operation=LANG("pencil"), paths=msg),
+            error=True,
+        )
+        return None
+    elif not operations:
+        await buf.opts.set("modified", val=False)
+        return None
+    else:
+        killed = await kill_buffers(
+            last_used=state.window_order,
+            paths=operations.keys(),
+            reopen=operations,
+        )
+        try:
+            await rename_many(operations, journal=current_journal(state))
+        except Exception as e:
+            await Nvim.write(e, error=True)
+            return await refresh(state)
+        else:
+            async with hold_win(win=None):
+                for win, new_path in killed.items():
+                    await Window.set_current(win)
+                    escaped = await Nvim.fn.fnameescape(str, normpath(new_path))
+                    await Nvim.exec(f"edit! {escaped}")
+
+            renamed = _Pending(
+                base=pending.base,
+                paths=tuple(operations.get(path, path) for path in pending.paths),
+            )
+            _PENDING[name] = renamed
+            await buf.set_lines(lines=_lines(renamed))
+            await buf.opts.set("modified", val=False)
+
+            await lsp_moved(operations)
+            invalidate_dirs = {
+                path.parent for path in chain(operations.keys(), operations.values())
+            }
+            new_state = await forward(
+                state,
+                index=state.index | ancestors(*operations.values()),
+                invalidate_dirs=invalidate_dirs,
+                selection=frozenset(),
+            )
+            return Stage(new_state)
+
+
+_ = (
+    autocmd("BufWriteCmd", modifiers=(f"{_SCHEME}*",))
+    << f"lua {NAMESPACE}.{_bulk_rename_commit.method}()"
+)
+
+
+@rpc(blocking=False)
+async def _bulk_rename_wipe(state: State, name: str) -> None:
+    """
+    Forget the plan of a rename buffer that is gone
+    """
+
+    _PENDING.pop(name, None)
+
+
+_ = (
+    autocmd("BufWipeout", modifiers=(f"{_SCHEME}*",))
+    << f"lua {NAMESPACE}.{_bulk_rename_wipe.method}(vim.fn.expand('<afile>'))"
+)
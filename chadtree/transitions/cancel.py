@@ -0,0 +1,17 @@
+from pynvim_pp.nvim import Nvim
+
+from ..fs.progress import cancel_all
+from ..registry import interrupt, rpc
+from ..settings.localization import LANG
+from ..state.types import State
+
+
+@interrupt
+@rpc(blocking=False)
+async def _cancel(state: State, is_visual: bool) -> None:
+    """
+    Cancel running file operations
+    """
+
+    if not cancel_all():
+        await Nvim.write(LANG("nothing_to_cancel"), error=True)
@@ -3,7 +3,7 @@ from typing import Optional
 from pynvim_pp.nvim import Nvim
 from std2 import anext
 
-from ..fs.cartographer import is_dir
+from ..fs.cartographer import is_dir, is_more
 from ..fs.types import Mode
 from ..registry import rpc
 from ..settings.localization import LANG
@@ -18,10 +18,15 @@ from .types import ClickType, Stage
 async def _click(
     state: State, is_visual: bool, click_type: ClickType
 ) -> Optional[Stage]:
-    node = await anext(indices(state, is_visual=is_visual), None)
+    node = await anext(indices(state, is_visual=is_visual, more=True), None)
 
     if not node:
         return None
+    elif is_more(node):
+        parent = node.path.parent
+        pages = {**state.pages, parent: state.pages.get(parent, 1) + 1}
+        new_state = await forward(state, pages=pages, invalidate_dirs={parent})
+        return Stage(new_state)
     else:
         if Mode.orphan_link in node.mode:
             await Nvim.write(LANG("dead_link", name=node.path.name), error=True)
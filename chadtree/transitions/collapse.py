@@ -33,6 +33,13 @@ async def _collapse(state: State, is_visual: bool) -> Optional[Stage]:
         }
 
         index = (state.index - paths) | {state.root.path}
+        pages = {
+            indexed: page
+            for indexed, page in state.pages.items()
+            if indexed not in paths
+        }
         invalidate_dirs = {path}
-        new_state = await forward(state, index=index, invalidate_dirs=invalidate_dirs)
+        new_state = await forward(
+            state, index=index, pages=pages, invalidate_dirs=invalidate_dirs
+        )
         return Stage(new_state, focus=path)
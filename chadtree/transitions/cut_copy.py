@@ -1,3 +1,5 @@
+from concurrent.futures import Executor
+from functools import partial
 from itertools import chain
 from os import linesep
 from pathlib import PurePath
@@ -8,7 +10,8 @@ from std2 import anext
 from std2.locale import pathsort_key
 
 from ..fs.cartographer import act_like_dir
-from ..fs.ops import ancestors, copy, cut, exists, unify_ancestors
+from ..fs.ops import ancestors, copy, exists, move, unify_ancestors
+from ..fs.progress import Cancelled, Progress
 from ..fs.types import Node
 from ..lsp.notify import lsp_created, lsp_moved
 from ..registry import rpc
@@ -16,7 +19,10 @@ from ..settings.localization import LANG
 from ..state.next import forward
 from ..state.types import State
 from ..view.ops import display_path
+from .background import Settle, in_background
 from .shared.index import indices
+from .shared.journal import current_journal
+from .shared.progress import with_progress
 from .shared.refresh import refresh
 from .shared.wm import kill_buffers
 from .types import Stage
@@ -37,7 +43,9 @@ async def _operation(
     nono: AbstractSet[PurePath],
     op_name: str,
     is_move: bool,
-    action: Callable[[Mapping[PurePath, PurePath]], Awaitable[None]],
+    action: Callable[
+        [Executor, Mapping[PurePath, PurePath], Progress], Awaitable[None]
+    ],
 ) -> Optional[Stage]:
     node = await anext(indices(state, is_visual=is_visual), None)
     selection = state.selection
@@ -102,12 +110,8 @@ async def _operation(
             if not ans:
                 return None
             else:
-                try:
-                    await action(operations)
-                except Exception as e:
-                    await Nvim.write(e, error=True)
-                    return await refresh(state)
-                else:
+
+                async def settle(state: State) -> Optional[Stage]:
                     parents = {
                         p.parent for p in chain(operations.keys(), operations.values())
                     }
@@ -117,7 +121,7 @@ async def _operation(
                     new_state = await forward(
                         state,
                         index=index,
-                        selection=new_selection if is_move else selection,
+                        selection=new_selection if is_move else state.selection,
                         invalidate_dirs=invalidate_dirs,
                     )
                     focus = next(
@@ -136,6 +140,27 @@ async def _operation(
                         await lsp_created(new_selection)
                     return Stage(new_state, focus=focus)
 
+                async def work() -> Settle:
+                    try:
+                        await with_progress(
+                            op_name,
+                            work=lambda progress: action(
+                                state.executor.pools.fs, operations, progress
+                            ),
+                        )
+                    except Cancelled:
+                        msg = LANG("cancelled", operation=op_name)
+                        await Nvim.write(msg, error=True)
+                        return refresh
+                    except Exception as e:
+                        await Nvim.write(e, error=True)
+                        return refresh
+                    else:
+                        return settle
+
+                in_background(work())
+                return None
+
 
 @rpc(blocking=False)
 async def _cut(state: State, is_visual: bool) -> Optional[Stage]:
@@ -150,7 +175,7 @@ async def _cut(state: State, is_visual: bool) -> Optional[Stage]:
         is_visual=is_visual,
         nono=nono,
         op_name=LANG("cut"),
-        action=cut,
+        action=partial(move, journal=current_journal(state)),
         is_move=True,
     )
 
@@ -166,6 +191,6 @@ async def _copy(state: State, is_visual: bool) -> Optional[Stage]:
         is_visual=is_visual,
         nono=frozenset(),
         op_name=LANG("copy"),
-        action=copy,
+        action=partial(copy, journal=current_journal(state)),
         is_move=False,
     )
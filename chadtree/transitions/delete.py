@@ -1,3 +1,4 @@
+from functools import partial
 from locale import strxfrm
 from os import linesep
 from pathlib import PurePath
@@ -5,16 +6,24 @@ from subprocess import CalledProcessError
 from typing import Awaitable, Callable, Iterable, Optional
 
 from pynvim_pp.nvim import Nvim
+from std2.asyncio import to_thread
 from std2.asyncio.subprocess import call
+from std2.platform import OS, os
 
-from ..fs.ops import ancestors, remove, unify_ancestors, which
-from ..lsp.notify import lsp_removed
+from ..fs.ops import ancestors, remove, restore, trash, unify_ancestors, which
+from ..fs.progress import Cancelled
+from ..fs.trash import listing
+from ..lsp.notify import lsp_created, lsp_removed
 from ..registry import rpc
 from ..settings.localization import LANG
 from ..state.next import forward
 from ..state.types import State
 from ..view.ops import display_path
+from .background import Settle, in_background
+from .shared.current import maybe_path_above
 from .shared.index import indices
+from .shared.journal import current_journal, schedule_purge
+from .shared.progress import with_progress
 from .shared.refresh import refresh
 from .shared.wm import kill_buffers
 from .types import Stage
@@ -53,12 +62,8 @@ async def _remove(
         if not ans:
             return None
         else:
-            try:
-                await yeet(unified)
-            except Exception as e:
-                await Nvim.write(e, error=True)
-                return await refresh(state)
-            else:
+
+            async def settle(state: State) -> Stage:
                 invalidate_dirs = {path.parent for path in unified}
                 new_state = await forward(
                     state, selection=frozenset(), invalidate_dirs=invalidate_dirs
@@ -70,6 +75,22 @@ async def _remove(
                 await lsp_removed(unified)
                 return Stage(new_state)
 
+            async def work() -> Settle:
+                try:
+                    await yeet(unified)
+                except Cancelled:
+                    msg = LANG("cancelled", operation=LANG("delete"))
+                    await Nvim.write(msg, error=True)
+                    return refresh
+                except Exception as e:
+                    await Nvim.write(e, error=True)
+                    return refresh
+                else:
+                    return settle
+
+            in_background(work())
+            return None
+
 
 @rpc(blocking=False)
 async def _delete(state: State, is_visual: bool) -> Optional[Stage]:
@@ -77,7 +98,18 @@ async def _delete(state: State, is_visual: bool) -> Optional[Stage]:
     Delete selected
     """
 
-    return await _remove(state, is_visual=is_visual, yeet=remove)
+    journal = current_journal(state)
+
+    async def yeet(paths: Iterable[PurePath]) -> None:
+        await with_progress(
+            LANG("delete"),
+            work=lambda progress: remove(
+                state.executor.pools.fs, paths, progress, journal=journal
+            ),
+        )
+        schedule_purge(state)
+
+    return await _remove(state, is_visual=is_visual, yeet=yeet)
 
 
 async def _sys_trash(paths: Iterable[PurePath]) -> None:
@@ -99,4 +131,46 @@ async def _trash(state: State, is_visual: bool) -> Optional[Stage]:
     Delete selected
     """
 
-    return await _remove(state, is_visual=is_visual, yeet=_sys_trash)
+    if os in {OS.macos, OS.windows}:
+        yeet = _sys_trash
+    else:
+        yeet = partial(trash, journal=current_journal(state))
+    return await _remove(state, is_visual=is_visual, yeet=yeet)
+
+
+@rpc(blocking=False)
+async def _untrash(state: State, is_visual: bool) -> Optional[Stage]:
+    """
+    Restore from trash
+    """
+
+    items = await to_thread(lambda: listing((state.root.path,)))
+    if not items:
+        await Nvim.write(LANG("trash_empty"), error=True)
+        return None
+    else:
+        fmt = state.settings.view.time_fmt
+        opts = {
+            f"{idx}. {display_path(item.original, state=state)} "
+            f"({item.deleted.strftime(fmt)})": item
+            for idx, item in enumerate(items, start=1)
+        }
+        if not (item := await Nvim.input_list(opts)):
+            return None
+        else:
+            try:
+                await restore((item,))
+            except Exception as e:
+                await Nvim.write(e, error=True)
+                return await refresh(state)
+            else:
+                path = item.original
+                new_state = await maybe_path_above(state, paths={path}) or state
+                next_state = await forward(
+                    new_state,
+                    index=state.index | ancestors(path),
+                    invalidate_dirs={path.parent},
+                    reveal={path},
+                )
+                await lsp_created((path,))
+                return Stage(next_state, focus=path)
@@ -0,0 +1,82 @@
+from asyncio import Task, create_task
+from multiprocessing import cpu_count
+from pathlib import PurePath
+from time import monotonic
+from typing import AbstractSet, Iterator, Optional, Tuple
+
+from std2.asyncio import cancel
+from std2.cell import RefCell
+
+from ..fs.cartographer import is_dir
+from ..fs.du import disk_usage
+from ..fs.types import DiskUsage, Node
+from ..registry import enqueue_event, rpc
+from ..state.next import forward
+from ..state.types import State
+from ..view.types import Column
+from .types import Stage
+
+_INTERVAL = 0.5
+
+_Job = Tuple[AbstractSet[PurePath], Task, RefCell[Optional[float]]]
+_CELL = RefCell[Optional[_Job]](None)
+
+
+def _visible_dirs(node: Node) -> Iterator[PurePath]:
+    if is_dir(node) and not node.pointed:
+        yield node.path
+        for child in node.children.values():
+            yield from _visible_dirs(child)
+
+
+@rpc(blocking=False)
+async def _disk_usage(state: State, du: DiskUsage) -> Stage:
+    """
+    Stream in disk usage
+    """
+
+    sizes = {**state.disk_usage.sizes, **du.sizes} if du.pending else du.sizes
+    new_state = await forward(
+        state, disk_usage=DiskUsage(sizes=sizes, pending=du.pending)
+    )
+    return Stage(new_state)
+
+
+async def schedule_du(state: State) -> None:
+    enabled = Column.size in state.settings.view.columns
+    roots = frozenset(_visible_dirs(state.root)) if enabled else frozenset()
+
+    rerun = False
+    if job := _CELL.val:
+        prev, task, finished = job
+        rerun = prev == roots
+        stale = (
+            finished.val is not None
+            and monotonic() - finished.val >= state.settings.polling_rate
+        )
+        if rerun and not stale:
+            return
+        else:
+            _CELL.val = None
+            await cancel(task)
+
+    if roots:
+        finished = RefCell[Optional[float]](None)
+
+        async def report(du: DiskUsage) -> None:
+            await enqueue_event(True, method=_disk_usage.method, params=(du,))
+
+        async def quiet(_: DiskUsage) -> None: ...
+
+        async def cont() -> None:
+            du = await disk_usage(
+                state.executor.pools.walk,
+                roots=roots,
+                concurrency=cpu_count(),
+                interval=_INTERVAL,
+                report=quiet if rerun else report,
+            )
+            await report(du)
+            finished.val = monotonic()
+
+        _CELL.val = roots, create_task(cont()), finished
@@ -0,0 +1,158 @@
+from asyncio import get_running_loop
+from heapq import nlargest
+from itertools import islice
+from os.path import sep
+from pathlib import PurePath
+from re import compile, escape
+from threading import Event
+from typing import Iterator, MutableSequence, Optional, Sequence, Tuple
+
+from pynvim_pp.nvim import Nvim
+from std2.cell import RefCell
+
+from ..fs.atlas import Atlas
+from ..fs.ops import ancestors
+from ..registry import rpc
+from ..settings.localization import LANG
+from ..state.next import forward
+from ..state.types import State
+from ..view.ops import display_path
+from .shared.atlas import warm_atlas
+from .shared.current import maybe_path_above
+from .types import Stage
+
+_TOP_K = 50
+_CHUNK = 4096
+_BOUNDARIES = frozenset((sep, "/", "_", "-", ".", " "))
+
+_LAST = RefCell[Tuple[Optional[Atlas], str, Sequence[str]]]((None, "", ()))
+_STOP = RefCell[Optional[Event]](None)
+
+
+def _fold(candidate: str) -> Tuple[str, Sequence[int]]:
+    """
+    `casefold` can grow a string (`ß` -> `ss`), keep where each char came from
+    """
+
+    lowered = candidate.casefold()
+    if len(lowered) == len(candidate):
+        return lowered, range(len(candidate))
+    else:
+        origins = tuple(
+            idx for idx, char in enumerate(candidate) for _ in char.casefold()
+        )
+        return lowered, origins
+
+
+def _score(query: str, candidate: str) -> float:
+    lowered, origins = _fold(candidate)
+    name_at = lowered.rstrip(sep).rfind(sep) + 1
+
+    def run(begin: int) -> Optional[float]:
+        score, prev = 0.0, begin - 1
+        for char in query:
+            pos = lowered.find(char, prev + 1)
+            if pos == -1:
+                return None
+            at = origins[pos]
+            if pos == prev + 1:
+                score += 3
+            elif pos == begin or candidate[at - 1] in _BOUNDARIES:
+                score += 2
+            elif candidate[at].isupper() and candidate[at - 1].islower():
+                score += 2
+            else:
+                score += 1 - min(pos - prev, 10) / 10
+            prev = pos
+        return score
+
+    in_name = run(name_at)
+    if in_name is not None:
+        return in_name + len(query) - len(candidate) / 100
+    else:
+        return (run(0) or 0) - len(candidate) / 100
+
+
+def _search(atlas: Atlas, query: str, stop: Event) -> Optional[Sequence[str]]:
+    """
+    Runs off the main loop, gives up with `None` once `stop` is set
+    """
+
+    prev_atlas, prev_query, prev_matches = _LAST.val
+    narrowing = prev_atlas is atlas and prev_query and query.startswith(prev_query)
+    pool = prev_matches if narrowing else atlas.paths
+
+    folded = query.casefold()
+    regex = compile(".*?".join(map(escape, folded)))
+
+    def chunks() -> Iterator[Sequence[str]]:
+        it = iter(pool)
+        while chunk := tuple(islice(it, _CHUNK)):
+            yield chunk
+
+    acc: MutableSequence[str] = []
+    for chunk in chunks():
+        if stop.is_set():
+            return None
+        acc.extend(path for path in chunk if regex.search(path.casefold()))
+
+    matches = tuple(acc)
+    top = nlargest(_TOP_K, matches, key=lambda path: _score(folded, path))
+    if stop.is_set():
+        return None
+    else:
+        _LAST.val = atlas, query, matches
+        return top
+
+
+async def _reveal(state: State, path: PurePath) -> Stage:
+    if new_state := await maybe_path_above(state, paths={path}):
+        return Stage(new_state, focus=path)
+    else:
+        index = state.index | ancestors(path)
+        new_state = await forward(
+            state, index=index, invalidate_dirs=index - state.index, reveal={path}
+        )
+        return Stage(new_state, focus=path)
+
+
+@rpc(blocking=False)
+async def _fuzzy(state: State, is_visual: bool) -> Optional[Stage]:
+    """
+    Fuzzy find across workdir, a cold workdir is indexed in the background first
+    """
+
+    if not (atlas := warm_atlas(state)):
+        path = display_path(state.root.path, state=state)
+        await Nvim.write(LANG("indexing", path=path))
+        return None
+
+    _, last_query, _ = _LAST.val
+    query = await Nvim.input(question=LANG("new_search"), default=last_query)
+    if prev := _STOP.val:
+        prev.set()
+    if not query:
+        return None
+
+    _STOP.val = stop = Event()
+    loop = get_running_loop()
+    try:
+        matches = await loop.run_in_executor(
+            state.executor.pools.walk, _search, atlas, query, stop
+        )
+    finally:
+        stop.set()
+    if matches is None:
+        return None
+    elif not matches:
+        await Nvim.write(LANG("no_matches"), error=True)
+        return None
+    else:
+        opts = {
+            f"{idx}. {rel}": atlas.root / rel
+            for idx, rel in enumerate(matches, start=1)
+        }
+        if path := await Nvim.input_list(opts):
+            return await _reveal(state, path=path)
+        else:
+            return None
@@ -0,0 +1,134 @@
+from asyncio import Task, create_task
+from dataclasses import replace
+from multiprocessing import cpu_count
+from os.path import sep
+from pathlib import PurePath
+from re import MULTILINE, compile, error
+from typing import Mapping, MutableMapping, Optional
+from uuid import UUID, uuid4
+
+from pynvim_pp.nvim import Nvim
+from std2 import anext
+from std2.asyncio import cancel
+from std2.cell import RefCell
+from std2.pathlib import is_relative_to
+
+from ..fs.cartographer import act_like_dir
+from ..fs.grep import grep
+from ..fs.ops import ancestors
+from ..registry import enqueue_event, rpc
+from ..settings.localization import LANG
+from ..state.next import forward
+from ..state.types import Grep, State
+from .shared.atlas import current_atlas
+from .shared.index import indices
+from .types import Stage
+
+_INTERVAL = 0.3
+
+_CELL = RefCell[Optional[Task]](None)
+
+
+@rpc(blocking=False)
+async def _grep_results(
+    state: State, run: UUID, found: Mapping[PurePath, int], pending: bool
+) -> Optional[Stage]:
+    """
+    Stream in grep matches
+    """
+
+    if not (prev := state.grep) or prev.run != run:
+        return None
+    else:
+        counts: MutableMapping[PurePath, int] = {}
+        for path, count in found.items():
+            counts[path] = count
+            for parent in path.parents:
+                if parent == prev.base.parent:
+                    break
+                counts[parent] = counts.get(parent, 0) + count
+
+        root = state.root.path
+        dirs = {
+            parent
+            for path in found
+            for parent in ancestors(path)
+            if is_relative_to(parent, root)
+        }
+        index = state.index | dirs
+        new_state = await forward(
+            state,
+            grep=replace(prev, counts=counts, pending=pending),
+            index=index,
+            invalidate_dirs=index - state.index,
+        )
+        return Stage(new_state)
+
+
+@rpc(blocking=False)
+async def _grep(state: State, is_visual: bool) -> Optional[Stage]:
+    """
+    Grep file contents
+    """
+
+    node = await anext(indices(state, is_visual=is_visual), None)
+    if not node:
+        return None
+    else:
+        old_p = state.grep.pattern if state.grep else ""
+        pattern = await Nvim.input(question=LANG("new_grep"), default=old_p)
+
+        if task := _CELL.val:
+            _CELL.val = None
+            await cancel(task)
+
+        if not pattern:
+            new_state = await forward(state, grep=None)
+            return Stage(new_state)
+
+        try:
+            regex = compile(pattern.encode("UTF-8"), MULTILINE)
+        except error as e:
+            await Nvim.write(e, error=True)
+            return None
+        else:
+            base = (
+                node.path
+                if act_like_dir(node, follow_links=state.follow_links)
+                else node.path.parent
+            )
+            atlas = await current_atlas(state)
+            prefix = (
+                "" if base == atlas.root else f"{base.relative_to(atlas.root)}{sep}"
+            )
+            paths = tuple(
+                atlas.root / rel
+                for rel in atlas.paths
+                if rel.startswith(prefix) and not rel.endswith(sep)
+            )
+            run = uuid4()
+
+            async def report(found: Mapping[PurePath, int], pending: bool) -> None:
+                await enqueue_event(
+                    True,
+                    method=_grep_results.method,
+                    params=(run, found, pending),
+                )
+
+            async def cont() -> None:
+                found = await grep(
+                    state.executor.pools.walk,
+                    paths=paths,
+                    regex=regex,
+                    concurrency=cpu_count(),
+                    interval=_INTERVAL,
+                    report=lambda found: report(found, pending=True),
+                )
+                await report(found, pending=False)
+
+            _CELL.val = create_task(cont())
+            new_grep = Grep(
+                run=run, pattern=pattern, base=base, counts={}, pending=True
+            )
+            new_state = await forward(state, grep=new_grep)
+            return Stage(new_state, focus=node.path)
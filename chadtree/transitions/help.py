@@ -2,10 +2,7 @@ from enum import Enum, auto
 from pathlib import Path
 from typing import Sequence, Tuple
 from uuid import uuid4
-from webbrowser import open as open_w
 
-from pynvim_pp.buffer import Buffer
-from pynvim_pp.float_win import list_floatwins, open_float_win
 from pynvim_pp.nvim import Nvim
 from std2.argparse import ArgparseError, ArgParser
 from std2.types import never
@@ -26,6 +23,7 @@ from ..consts import (
 )
 from ..registry import rpc
 from ..state.types import State
+from .shared.float import show_float
 
 _NS = uuid4()
 
@@ -81,15 +79,12 @@ async def _help(state: State, args: Sequence[str]) -> None:
         await Nvim.write(e, error=True)
     else:
         md, uri = _directory(topic)
-        web_d = open_w(uri) if use_web else False
+        if use_web:
+            from webbrowser import open as open_w
+
+            web_d = open_w(uri)
+        else:
+            web_d = False
         if not web_d:
-            async for win in list_floatwins(_NS):
-                await win.close()
             lines = md.read_text("UTF-8").splitlines()
-            buf = await Buffer.create(
-                listed=False, scratch=True, wipe=True, nofile=True, noswap=True
-            )
-            await buf.set_lines(lines=lines)
-            await buf.opts.set("modifiable", val=False)
-            await buf.opts.set("syntax", val="markdown")
-            await open_float_win(_NS, margin=0, relsize=0.95, buf=buf, border="rounded")
+            await show_float(_NS, lines=lines, syntax="markdown")
@@ -16,6 +16,7 @@ from ..state.types import State
 from ..view.ops import display_path
 from .shared.current import maybe_path_above
 from .shared.index import indices
+from .shared.journal import current_journal
 from .shared.refresh import refresh
 from .types import Stage
 
@@ -60,7 +61,7 @@ async def _link(state: State, is_visual: bool) -> Optional[Stage]:
                 return None
 
         try:
-            await link(operations)
+            await link(operations, journal=current_journal(state))
         except Exception as e:
             await Nvim.write(e, error=True)
             return await refresh(state)
@@ -105,7 +106,7 @@ async def _new_link(state: State, is_visual: bool) -> Optional[Stage]:
             operations = {parent / src: PurePath(dst)}
 
         try:
-            await link(operations)
+            await link(operations, journal=current_journal(state))
         except Exception as e:
             await Nvim.write(e, error=True)
             return await refresh(state)
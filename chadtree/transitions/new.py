@@ -15,6 +15,7 @@ from ..state.next import forward
 from ..state.types import State
 from .shared.current import maybe_path_above
 from .shared.index import indices
+from .shared.journal import current_journal
 from .shared.refresh import refresh
 from .types import Stage
 
@@ -48,10 +49,11 @@ async def _new(state: State, is_visual: bool) -> Optional[Stage]:
                 return None
             else:
                 try:
+                    journal = current_journal(state)
                     if child.endswith(sep):
-                        await mkdir((path,))
+                        await mkdir((path,), journal=journal)
                     else:
-                        await new((path,))
+                        await new((path,), journal=journal)
                 except Exception as e:
                     await Nvim.write(e, error=True)
                     return await refresh(state=state)
@@ -63,6 +65,7 @@ async def _new(state: State, is_visual: bool) -> Optional[Stage]:
                         new_state,
                         index=index,
                         invalidate_dirs=invalidate_dirs,
+                        reveal={path},
                     )
                     await lsp_created((path,))
                     return Stage(next_state, focus=path)
@@ -0,0 +1,140 @@
+import tracemalloc
+from asyncio import Event, Task, TimeoutError, create_task, wait_for, wrap_future
+from cProfile import Profile
+from contextlib import suppress
+from datetime import datetime
+from io import StringIO
+from itertools import islice
+from os import linesep
+from pathlib import Path
+from pstats import SortKey, Stats
+from typing import Iterator, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from pynvim_pp.logging import suppress_and_log
+from pynvim_pp.nvim import Nvim
+from std2.argparse import ArgparseError, ArgParser
+from std2.asyncio import to_thread
+from std2.cell import RefCell
+
+from ..registry import interrupt, rpc
+from ..settings.localization import LANG
+from ..state.types import State
+from .shared.float import show_float
+
+_NS = uuid4()
+_TOP = 20
+_RUNNING = RefCell[Optional[Tuple[Event, Task]]](None)
+
+
+def _parse_args(args: Sequence[str]) -> float:
+    parser = ArgParser()
+    parser.add_argument("seconds", nargs="?", type=float, default=10.0)
+    ns = parser.parse_args(args)
+    return ns.seconds
+
+
+def _enable(prof: Profile) -> bool:
+    """
+    Python 3.12+ profiles every thread from one `Profile`, and refuses a second
+    """
+
+    try:
+        prof.enable()
+    except ValueError:
+        return False
+    else:
+        return True
+
+
+def _hot(profs: Sequence[Profile]) -> Iterator[str]:
+    io = StringIO()
+    Stats(*profs, stream=io).sort_stats(SortKey.TIME).print_stats(_TOP)
+    lines = io.getvalue().splitlines()
+    start = next(
+        (idx for idx, line in enumerate(lines) if "ncalls" in line), len(lines)
+    )
+    yield from (line for line in lines[start:] if line.strip())
+
+
+def _mem(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot
+) -> Iterator[str]:
+    yield from (str(stat) for stat in islice(after.compare_to(before, "lineno"), _TOP))
+
+
+def _report(
+    dest: Path, profs: Sequence[Profile], snapshots: Tuple[tracemalloc.Snapshot, ...]
+) -> Sequence[str]:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    Stats(*profs).dump_stats(dest.with_suffix(".pstats"))
+
+    with dest.with_suffix(".txt").open("w", encoding="UTF-8") as fd:
+        Stats(*profs, stream=fd).sort_stats(SortKey.CUMULATIVE).print_stats()
+
+    before, after = snapshots
+    mem = tuple(_mem(before, after))
+    dest.with_suffix(".mem.txt").write_text(linesep.join(mem), encoding="UTF-8")
+
+    return (
+        f"# {dest.with_suffix('.pstats')}",
+        "",
+        *_hot(profs),
+        "",
+        f"# {dest.with_suffix('.mem.txt')}",
+        "",
+        *mem,
+    )
+
+
+async def _session(state: State, seconds: float, stop: Event) -> None:
+    try:
+        with suppress_and_log():
+            main, loop = Profile(), Profile()
+            tracing = tracemalloc.is_tracing()
+            if not tracing:
+                tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+
+            _enable(main)
+            on_loop = await wrap_future(state.executor.fsubmit(_enable, loop))
+            try:
+                with suppress(TimeoutError):
+                    await wait_for(stop.wait(), timeout=seconds)
+            finally:
+                main.disable()
+                if on_loop:
+                    await wrap_future(state.executor.fsubmit(loop.disable))
+                after = tracemalloc.take_snapshot()
+                if not tracing:
+                    tracemalloc.stop()
+
+            profs = (main, loop) if on_loop else (main,)
+            name = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
+            dest = state.session.storage / "profiles" / name
+            lines = await to_thread(_report, dest, profs, (before, after))
+            await show_float(_NS, lines=lines, syntax=None)
+    finally:
+        _RUNNING.val = None
+
+
+@interrupt
+@rpc(blocking=False)
+async def _profile(state: State, args: Sequence[str]) -> None:
+    """
+    Profile CPU and memory for a few seconds, run again to stop early
+    """
+
+    if running := _RUNNING.val:
+        stop, _ = running
+        stop.set()
+    else:
+        try:
+            seconds = _parse_args(args)
+        except ArgparseError as e:
+            await Nvim.write(e, error=True)
+        else:
+            stop = Event()
+            task = create_task(_session(state, seconds=seconds, stop=stop))
+            _RUNNING.val = (stop, task)
+            await Nvim.write(LANG("profiling", seconds=f"{seconds:g}"))
@@ -0,0 +1,85 @@
+from enum import Enum, auto
+from os import linesep
+from typing import Optional
+
+from pynvim_pp.nvim import Nvim
+from std2.asyncio import to_thread
+
+from ..fs.journal import Op, Phase, orphans, unfinished
+from ..fs.ops import discard, finish_move, resume_move, rollback, rollback_move
+from ..fs.progress import Cancelled
+from ..registry import rpc
+from ..settings.localization import LANG
+from ..state.types import State
+from ..view.ops import display_path
+from .shared.journal import current_journal, schedule_purge
+from .shared.progress import with_progress
+from .shared.refresh import refresh
+from .types import Stage
+
+
+class _Choice(Enum):
+    resume = auto()
+    rollback = auto()
+
+
+@rpc(blocking=False)
+async def recover(state: State) -> Optional[Stage]:
+    """
+    Finish or roll back operations interrupted by a previous instance
+    """
+
+    journal = current_journal(state)
+    found = await to_thread(lambda: tuple(orphans(state.session.storage)))
+
+    touched = False
+    for orphan in found:
+        for step in await to_thread(lambda: unfinished(orphan)):
+            operations = dict(step.operations)
+            if step.op is not Op.move:
+                await rollback(orphan, step=step)
+                touched = True
+            elif step.phase is Phase.copied:
+                await finish_move(
+                    state.executor.pools.fs,
+                    journal=orphan,
+                    batch=step.batch,
+                    operations=operations,
+                )
+                touched = True
+            else:
+                msg = linesep.join(
+                    f"{display_path(s, state=state)} -> {display_path(d, state=state)}"
+                    for s, d in step.operations
+                )
+                ans = await Nvim.confirm(
+                    question=LANG("ask_recover", paths=msg),
+                    answers=LANG("recover_answers"),
+                    answer_key={1: _Choice.resume, 2: _Choice.rollback},
+                )
+                if ans is _Choice.resume:
+                    touched = True
+                    try:
+                        await with_progress(
+                            LANG("cut"),
+                            work=lambda progress: resume_move(
+                                state.executor.pools.fs,
+                                orphan=orphan,
+                                step=step,
+                                progress=progress,
+                                journal=journal,
+                            ),
+                        )
+                    except Cancelled:
+                        await Nvim.write(
+                            LANG("cancelled", operation=LANG("cut")), error=True
+                        )
+                    except Exception as e:
+                        await Nvim.write(e, error=True)
+                elif ans is _Choice.rollback:
+                    await rollback_move(orphan, batch=step.batch, operations=operations)
+                    touched = True
+        await discard(orphan)
+
+    schedule_purge(state)
+    return await refresh(state) if touched else None
@@ -1,10 +1,11 @@
 from pathlib import Path, PurePath
 from posixpath import sep
-from typing import Optional, Sequence
+from typing import AbstractSet, MutableSet, Optional, Sequence, Tuple
 from uuid import uuid4
 
 from pynvim_pp.atomic import Atomic
 from pynvim_pp.buffer import Buffer
+from pynvim_pp.highlight import highlight
 from pynvim_pp.nvim import Nvim
 from pynvim_pp.operators import operator_marks
 from pynvim_pp.rpc_types import NvimError
@@ -14,7 +15,9 @@ from std2.pickle.decoder import new_decoder
 from std2.pickle.types import DecodeError
 
 from ..consts import URI_SCHEME
+from ..nvim.highlights import mark_defined, undefined
 from ..state.types import State
+from ..timeit import timeit
 from ..view.render import render
 from ..view.types import Derived
 from .shared.wm import find_fm_windows
@@ -29,19 +32,22 @@ _HOME = Path.home()
 
 
 async def _derived(state: State) -> Derived:
-    return await render(
-        state.root,
-        settings=state.settings,
-        index=state.index,
-        selection=state.selection,
-        filter_pattern=state.filter_pattern,
-        markers=state.markers,
-        diagnostics=state.diagnostics,
-        vc=state.vc,
-        follow_links=state.follow_links,
-        show_hidden=state.show_hidden,
-        current=state.current,
-    )
+    with timeit("render"):
+        return await render(
+            state.root,
+            settings=state.settings,
+            index=state.index,
+            selection=state.selection,
+            filter_pattern=state.filter_pattern,
+            markers=state.markers,
+            diagnostics=state.diagnostics,
+            disk_usage=state.disk_usage,
+            grep=state.grep,
+            vc=state.vc,
+            follow_links=state.follow_links,
+            show_hidden=state.show_hidden,
+            current=state.current,
+        )
 
 
 def _buf_name(root: PurePath) -> str:
@@ -61,8 +67,9 @@ def _update(
     ns: int,
     derived: Derived,
     hashed_lines: Sequence[str],
-) -> Atomic:
+) -> Tuple[Atomic, AbstractSet[str]]:
     atomic = Atomic()
+    groups: MutableSet[str] = set()
     for (i1, i2), (j1, j2) in trans_inplace(
         src=hashed_lines, dest=derived.hashed, unifying=10
     ):
@@ -71,10 +78,12 @@ def _update(
 
         for idx, highlights in enumerate(derived.highlights[j1:j2], start=i1):
             for hl in highlights:
+                groups.add(hl.group)
                 atomic.buf_add_highlight(buf, ns, hl.group, idx, hl.begin, hl.end)
 
         for idx, badges in enumerate(derived.badges[j1:j2], start=i1):
             vtxt = tuple((bdg.text, bdg.group) for bdg in badges)
+            groups.update(group for _, group in vtxt)
             if use_extmarks:
                 atomic.buf_set_extmark(
                     buf, ns, idx, -1, {"virt_text": vtxt, "hl_mode": "combine"}
@@ -83,7 +92,7 @@ def _update(
                 atomic.buf_set_virtual_text(buf, ns, idx, vtxt, {})
 
     atomic.buf_set_var(buf, str(_NS), derived.hashed)
-    return atomic
+    return atomic, groups
 
 
 async def redraw(state: State, focus: Optional[PurePath]) -> Derived:
@@ -119,7 +128,7 @@ async def redraw(state: State, focus: Optional[PurePath]) -> Derived:
         a1 = Atomic()
         a1.buf_set_option(buf, "modifiable", True)
 
-        a2 = _update(
+        a2, groups = _update(
             use_extmarks,
             buf=buf,
             ns=ns,
@@ -153,10 +162,14 @@ async def redraw(state: State, focus: Optional[PurePath]) -> Derived:
             for key, val in state.settings.win_local_opts.items():
                 a3.win_set_option(win, key, val)
 
-        a4 = a1 + a2 + a3
+        fresh = undefined(state.settings.view.hl_context, groups=groups)
+        a4 = highlight(*fresh) + a1 + a2 + a3
         try:
-            await a4.commit(NoneType)
+            with timeit("redraw->commit"):
+                await a4.commit(NoneType)
         except NvimError as e:
             raise UnrecoverableError(e)
+        else:
+            mark_defined(fresh)
 
     return derived
@@ -7,7 +7,8 @@ from pynvim_pp.nvim import Nvim
 from pynvim_pp.window import Window
 from std2 import anext
 
-from ..fs.ops import ancestors, exists, rename
+from ..fs.ops import ancestors, exists, move
+from ..fs.progress import Cancelled
 from ..lsp.notify import lsp_moved
 from ..registry import rpc
 from ..settings.localization import LANG
@@ -15,6 +16,8 @@ from ..state.next import forward
 from ..state.types import State
 from .shared.current import maybe_path_above
 from .shared.index import indices
+from .shared.journal import current_journal
+from .shared.progress import with_progress
 from .shared.refresh import refresh
 from .shared.wm import kill_buffers
 from .types import Stage
@@ -48,8 +51,22 @@ async def _rename(state: State, is_visual: bool) -> Optional[Stage]:
                     paths={old_path},
                     reopen={old_path: new_path},
                 )
+                journal = current_journal(state)
                 try:
-                    await rename(operations)
+                    await with_progress(
+                        LANG("pencil"),
+                        work=lambda progress: move(
+                            state.executor.pools.fs,
+                            operations=operations,
+                            progress=progress,
+                            journal=journal,
+                        ),
+                    )
+                except Cancelled:
+                    await Nvim.write(
+                        LANG("cancelled", operation=LANG("pencil")), error=True
+                    )
+                    return await refresh(state=state)
                 except Exception as e:
                     await Nvim.write(e, error=True)
                     return await refresh(state=state)
@@ -70,6 +87,7 @@ async def _rename(state: State, is_visual: bool) -> Optional[Stage]:
                         index=index,
                         invalidate_dirs=invalidate_dirs,
                         selection=new_selection,
+                        reveal={new_path},
                     )
                     await lsp_moved(operations)
                     return Stage(next_state, focus=new_path)
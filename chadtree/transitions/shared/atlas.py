@@ -0,0 +1,149 @@
+from asyncio import CancelledError, Task, create_task
+from multiprocessing import cpu_count
+from pathlib import PurePath
+from typing import Awaitable, Callable, Iterator, Mapping, Optional, Tuple
+
+from pynvim_pp.nvim import Nvim
+from std2.cell import RefCell
+
+from ...fs.atlas import Atlas, build, update
+from ...fs.cartographer import is_dir
+from ...fs.types import Node
+from ...settings.localization import LANG
+from ...state.ops import dump_atlas, load_atlas
+from ...state.types import State
+from ...view.ops import display_path
+
+_Step = Callable[[Optional[Atlas]], Awaitable[Optional[Atlas]]]
+
+_CELL = RefCell[Optional[Tuple[PurePath, Task]]](None)
+_LATEST = RefCell[Optional[Atlas]](None)
+_BUILD = RefCell[Optional[Task]](None)
+
+
+def _visible_dirs(node: Node) -> Iterator[Tuple[PurePath, int]]:
+    if is_dir(node) and not node.pointed:
+        yield node.path, node.st_mtime_ns
+        for child in node.children.values():
+            yield from _visible_dirs(child)
+
+
+def _chain(state: State, step: _Step) -> Task:
+    root = state.root.path
+    cell = _CELL.val
+    prev = cell[1] if cell and cell[0] == root else None
+
+    async def cont() -> Optional[Atlas]:
+        atlas = None
+        if prev:
+            try:
+                atlas = await prev
+            except CancelledError:
+                raise
+            except Exception:
+                pass
+
+        new_atlas = await step(atlas)
+        if new_atlas and new_atlas is not atlas and new_atlas is not _LATEST.val:
+            _LATEST.val = new_atlas
+            await dump_atlas(
+                state.executor.pools.walk, session=state.session, atlas=new_atlas
+            )
+        return new_atlas
+
+    task = create_task(cont())
+    _CELL.val = root, task
+    return task
+
+
+def _update(
+    state: State, mtimes: Optional[Mapping[PurePath, int]], create: bool
+) -> _Step:
+    root = state.root.path
+
+    async def step(atlas: Optional[Atlas]) -> Optional[Atlas]:
+        if atlas and atlas.root == root:
+            return await update(
+                state.executor.pools.walk,
+                atlas=atlas,
+                ignores=state.settings.ignores,
+                concurrency=cpu_count(),
+                mtimes=mtimes,
+            )
+        elif create:
+            return await build(
+                state.executor.pools.walk,
+                root=root,
+                ignores=state.settings.ignores,
+                concurrency=cpu_count(),
+            )
+        else:
+            return None
+
+    return step
+
+
+def _load(state: State) -> _Step:
+    root = state.root.path
+
+    async def step(_: Optional[Atlas]) -> Optional[Atlas]:
+        if atlas := await load_atlas(
+            state.executor.pools.walk, session=state.session, root=root
+        ):
+            _LATEST.val = atlas
+        return atlas
+
+    return step
+
+
+def sync_atlas(state: State) -> None:
+    """
+    Pick up a persisted index for new roots, then fold in the mtimes the walker already has
+    """
+
+    root = state.root.path
+    cell = _CELL.val
+    if not cell or cell[0] != root:
+        _chain(state, step=_load(state))
+        _chain(state, step=_update(state, mtimes=None, create=False))
+    elif (latest := _LATEST.val) and latest.root == root and cell[1].done():
+        mtimes = dict(_visible_dirs(state.root))
+        _chain(state, step=_update(state, mtimes=mtimes, create=False))
+
+
+def latest_atlas(state: State) -> Optional[Atlas]:
+    """
+    Whatever is loaded for the current root, never waits on a walk
+    """
+
+    latest = _LATEST.val
+    return latest if latest and latest.root == state.root.path else None
+
+
+def warm_atlas(state: State) -> Optional[Atlas]:
+    """
+    The loaded atlas, or `None` with a build started in the background
+    """
+
+    if latest := latest_atlas(state):
+        if (cell := _CELL.val) and cell[1].done():
+            _chain(state, step=_update(state, mtimes=None, create=False))
+        return latest
+    else:
+        if not (task := _BUILD.val) or task.done():
+            step = _update(state, mtimes=None, create=True)
+            _BUILD.val = _chain(state, step=step)
+        return None
+
+
+async def current_atlas(state: State) -> Atlas:
+    root = state.root.path
+    if (latest := _LATEST.val) and latest.root == root:
+        if (cell := _CELL.val) and cell[1].done():
+            _chain(state, step=_update(state, mtimes=None, create=False))
+        return latest
+    else:
+        await Nvim.write(LANG("indexing", path=display_path(root, state=state)))
+        atlas = await _chain(state, step=_update(state, mtimes=None, create=True))
+        assert atlas
+        return atlas
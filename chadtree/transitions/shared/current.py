@@ -40,7 +40,14 @@ async def new_root(
 ) -> State:
     index = state.index | ancestors(new_cwd) | {new_cwd} | indices
     root = await new(
-        state.executor, follow_links=state.follow_links, root=new_cwd, index=index
+        state.executor,
+        follow_links=state.follow_links,
+        root=new_cwd,
+        index=index,
+        page_size=state.settings.max_children,
+        pages=state.pages,
+        show_hidden=state.show_hidden,
+        ignores=state.settings.ignores,
     )
     selection = {path for path in state.selection if root.path in ancestors(path)}
     return await forward(state, root=root, selection=selection, index=index)
@@ -62,4 +69,5 @@ async def maybe_path_above(
         ordered = sorted(cont(), key=pathsort_key)
         indices = ancestors(*ordered)
         new_cwd, *_ = ordered
-        return await new_root(state=state, new_cwd=new_cwd, indices=indices)
+        new_state = await new_root(state=state, new_cwd=new_cwd, indices=indices)
+        return await forward(new_state, invalidate_dirs=frozenset(), reveal=paths)
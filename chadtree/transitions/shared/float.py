@@ -0,0 +1,18 @@
+from typing import Optional, Sequence
+from uuid import UUID
+
+from pynvim_pp.buffer import Buffer
+from pynvim_pp.float_win import list_floatwins, open_float_win
+
+
+async def show_float(ns: UUID, lines: Sequence[str], syntax: Optional[str]) -> None:
+    async for win in list_floatwins(ns):
+        await win.close()
+    buf = await Buffer.create(
+        listed=False, scratch=True, wipe=True, nofile=True, noswap=True
+    )
+    await buf.set_lines(lines=lines)
+    await buf.opts.set("modifiable", val=False)
+    if syntax:
+        await buf.opts.set("syntax", val=syntax)
+    await open_float_win(ns, margin=0, relsize=0.95, buf=buf, border="rounded")
@@ -3,6 +3,7 @@ from typing import AsyncIterator, Optional
 from pynvim_pp.operators import operator_marks
 from pynvim_pp.window import Window
 
+from ...fs.cartographer import is_more
 from ...fs.types import Node
 from ...state.types import State
 from .wm import is_fm_buffer
@@ -15,7 +16,13 @@ def _row_index(state: State, row: int) -> Optional[Node]:
         return None
 
 
-async def indices(state: State, is_visual: bool) -> AsyncIterator[Node]:
+async def indices(
+    state: State, is_visual: bool, more: bool = False
+) -> AsyncIterator[Node]:
+    """
+    The "… N more" rows are not real paths, only `click` asks for them
+    """
+
     win = await Window.get_current()
     buf = await win.get_buf()
 
@@ -23,7 +30,7 @@ async def indices(state: State, is_visual: bool) -> AsyncIterator[Node]:
         return
     else:
         row, _ = await win.get_cursor()
-        if node := _row_index(state, row):
+        if (node := _row_index(state, row)) and (more or not is_more(node)):
             yield node
 
         if is_visual:
@@ -31,5 +38,6 @@ async def indices(state: State, is_visual: bool) -> AsyncIterator[Node]:
 
             for r in range(row1, row2 + 1):
                 if r != row:
-                    if node := _row_index(state, r):
+                    node = _row_index(state, r)
+                    if node and (more or not is_more(node)):
                         yield node
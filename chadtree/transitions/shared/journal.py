@@ -0,0 +1,24 @@
+from asyncio import Task, create_task
+from typing import Optional
+
+from std2.cell import RefCell
+
+from ...fs.journal import Journal, open_journal
+from ...fs.ops import purge
+from ...state.types import State
+
+_CELL = RefCell[Optional[Task]](None)
+
+
+def current_journal(state: State) -> Journal:
+    return open_journal(state.session.storage, keep=state.settings.undo_levels)
+
+
+def schedule_purge(state: State) -> None:
+    """
+    Actually delete staging that fell off the undo history, in the background
+    """
+
+    if not (task := _CELL.val) or task.done():
+        th, journal = state.executor.pools.fs, current_journal(state)
+        _CELL.val = create_task(purge(th, journal=journal))
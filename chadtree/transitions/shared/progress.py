@@ -0,0 +1,47 @@
+from asyncio import create_task
+from typing import Awaitable, Callable, TypeVar
+
+from pynvim_pp.nvim import Nvim
+from std2.asyncio import cancel
+from std2.locale import si_prefixed
+from std2.sched import aticker
+
+from ...fs.progress import Progress, track, untrack
+from ...settings.localization import LANG
+
+_T = TypeVar("_T")
+
+_INTERVAL = 0.5
+
+
+async def _report(operation: str, progress: Progress) -> None:
+    msg = LANG(
+        "progress",
+        operation=operation,
+        files=progress.done_files,
+        total_files=progress.total_files,
+        size=si_prefixed(progress.done_bytes, precision=1),
+        total_size=si_prefixed(progress.total_bytes, precision=1),
+    )
+    await Nvim.write(msg)
+
+
+async def with_progress(
+    operation: str, work: Callable[[Progress], Awaitable[_T]]
+) -> _T:
+    """
+    Show progress in the status line while `work` is running
+    """
+
+    progress = track()
+
+    async def cont() -> None:
+        async for _ in aticker(_INTERVAL, immediately=False):
+            await _report(operation, progress=progress)
+
+    ticker = create_task(cont())
+    try:
+        return await work(progress)
+    finally:
+        untrack(progress)
+        await cancel(ticker)
@@ -10,6 +10,7 @@ from ...fs.ops import ancestors, exists_many
 from ...nvim.markers import markers
 from ...state.next import forward
 from ...state.types import State
+from ..shared.atlas import latest_atlas
 from ..shared.wm import find_current_buffer_path
 from ..types import Stage
 
@@ -17,7 +18,11 @@ from ..types import Stage
 async def _index(state: State, paths: AbstractSet[PurePath]) -> AbstractSet[PurePath]:
     index = {
         path
-        for path, exists in (await exists_many(state.index, follow=True)).items()
+        for path, exists in (
+            await exists_many(
+                state.index, follow=True, tree=state.root, atlas=latest_atlas(state)
+            )
+        ).items()
         if exists
     } | paths
 
@@ -53,7 +58,7 @@ async def refresh(state: State) -> Stage:
         _index(state, paths=invalidate_dirs),
         _selection(state),
         _window_order(state),
-        markers(),
+        markers(state.markers),
     )
     current_ancestors = ancestors(current) if current else frozenset()
     new_current = current if cwd in current_ancestors else None
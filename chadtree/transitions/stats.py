@@ -0,0 +1,90 @@
+from datetime import datetime
+from json import dump
+from os import linesep
+from pathlib import Path
+from typing import Iterator, Sequence
+
+from pynvim_pp.nvim import Nvim
+from std2.asyncio import to_thread
+from std2.locale import si_prefixed_smol
+
+from ..registry import interrupt, rpc
+from ..settings.localization import LANG
+from ..state.types import State
+from ..timeit import chrome_trace, histograms, trace, tracing
+
+_POOLS = ("pool", "workers", "queued", "running", "done", "wait", "max", "run")
+_SPANS = ("span", "count", "p50", "p90", "p99", "max")
+
+
+def _secs(seconds: float) -> str:
+    return f"{si_prefixed_smol(seconds, precision=0)}s"
+
+
+def _pools(state: State) -> Iterator[Sequence[str]]:
+    yield _POOLS
+    for stats in state.executor.pools.stats():
+        yield (
+            stats.name,
+            str(stats.workers),
+            str(stats.queued),
+            str(stats.running),
+            str(stats.done),
+            _secs(stats.wait_avg),
+            _secs(stats.wait_max),
+            _secs(stats.run_avg),
+        )
+
+
+def _spans() -> Iterator[Sequence[str]]:
+    yield _SPANS
+    for name, hist in sorted(histograms().items()):
+        yield (
+            name,
+            str(hist.count),
+            *(_secs(hist.percentile(q) / 1e9) for q in (0.5, 0.9, 0.99)),
+            _secs(hist.max / 1e9),
+        )
+
+
+def _table(rows: Sequence[Sequence[str]]) -> Iterator[str]:
+    widths = tuple(max(map(len, col)) for col in zip(*rows))
+    for row in rows:
+        yield "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+
+
+@interrupt
+@rpc(blocking=False)
+async def _stats(state: State, args: Sequence[str]) -> None:
+    """
+    Print thread pool queue lengths and latencies, and span timings if any
+    """
+
+    pools = tuple(_table(tuple(_pools(state))))
+    spans = tuple(_spans())
+    lines = (*pools, "", *_table(spans)) if len(spans) > 1 else pools
+    await Nvim.write(linesep.join(lines))
+
+
+@interrupt
+@rpc(blocking=False)
+async def _trace(state: State, args: Sequence[str]) -> None:
+    """
+    Toggle tracing, save a chrome trace when stopped
+    """
+
+    if not tracing():
+        trace(True)
+        await Nvim.write(LANG("tracing"))
+    else:
+        trace(False)
+        name = f"{datetime.now().strftime('%Y-%m-%dT%H-%M-%S')}.json"
+        path = Path(state.session.storage) / "traces" / name
+
+        def cont() -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("w", encoding="UTF-8") as fd:
+                dump(chrome_trace(), fd, check_circular=False)
+
+        await to_thread(cont)
+        await Nvim.write(LANG("trace_saved", path=str(path)))
@@ -16,6 +16,7 @@ from ..settings.types import Settings
 from ..state.types import State
 from ..version_ctl.git import root as version_ctl_toplv
 from .shared.current import maybe_path_above, new_current_file, new_root
+from .shared.journal import current_journal
 from .shared.open_file import open_file
 from .shared.wm import (
     find_current_buffer_path,
@@ -152,7 +153,7 @@ async def _open(state: State, args: Sequence[str]) -> Optional[Stage]:
                 else await Nvim.getcwd() / opts.path
             )
             if not await exists(path, follow=True):
-                await new((path,))
+                await new((path,), journal=current_journal(state))
             next_state = await maybe_path_above(new_state, paths={path}) or new_state
             await _open_fm_window(
                 state.settings,
@@ -26,7 +26,12 @@ async def _toggle_hidden(state: State, is_visual: bool) -> Optional[Stage]:
         focus = node.path
         show_hidden = not state.show_hidden
         selection: Selection = state.selection if show_hidden else frozenset()
-        new_state = await forward(state, show_hidden=show_hidden, selection=selection)
+        new_state = await forward(
+            state,
+            show_hidden=show_hidden,
+            selection=selection,
+            invalidate_dirs={state.root.path},
+        )
         return Stage(new_state, focus=focus)
 
 
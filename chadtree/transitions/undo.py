@@ -0,0 +1,46 @@
+from typing import Optional
+
+from pynvim_pp.nvim import Nvim
+from std2.locale import pathsort_key
+
+from ..fs.ops import ancestors, exists_many, undo
+from ..registry import rpc
+from ..settings.localization import LANG
+from ..state.next import forward
+from ..state.types import State
+from .shared.journal import current_journal
+from .shared.refresh import refresh
+from .types import Stage
+
+
+@rpc(blocking=False)
+async def _undo(state: State, is_visual: bool) -> Optional[Stage]:
+    """
+    Undo last file operation
+    """
+
+    try:
+        step = await undo(current_journal(state))
+    except Exception as e:
+        await Nvim.write(e, error=True)
+        return await refresh(state)
+    else:
+        if not step:
+            await Nvim.write(LANG("nothing_to_undo"), error=True)
+            return None
+        else:
+            srcs = {src for src, _ in step.operations}
+            invalidate_dirs = {
+                path.parent for operation in step.operations for path in operation
+            }
+            existing = await exists_many(srcs, follow=False)
+            restored = sorted((p for p, e in existing.items() if e), key=pathsort_key)
+            new_state = await forward(
+                state,
+                index=state.index | ancestors(*restored),
+                invalidate_dirs=invalidate_dirs,
+                selection=frozenset(),
+                reveal={*restored},
+            )
+            await Nvim.write(LANG("undone", operation=step.op.name))
+            return Stage(new_state, focus=next(iter(restored), None))
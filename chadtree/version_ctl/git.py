@@ -1,4 +1,5 @@
-from asyncio import CancelledError, gather
+from asyncio import CancelledError, gather, get_running_loop
+from concurrent.futures import Executor, ProcessPoolExecutor
 from functools import lru_cache
 from itertools import chain
 from locale import strxfrm
@@ -8,6 +9,7 @@ from pathlib import PurePath
 from string import whitespace
 from subprocess import CalledProcessError
 from typing import (
+    AbstractSet,
     Iterable,
     Iterator,
     MutableMapping,
@@ -21,11 +23,14 @@ from std2.asyncio import Cancellation, to_thread
 from std2.pathlib import ROOT
 from std2.string import removeprefix, removesuffix
 
+from ..fs.ignore import Rules, inherit, is_ignored, load
 from ..fs.ops import ancestors, which
+from ..fs.types import Mode, Node
 from .nice import nice_call
 from .types import VCStatus
 
 _Stats = Iterable[Tuple[str, PurePath]]
+_Compact = Tuple[Sequence[str], Sequence[Tuple[str, str]]]
 
 _WHITE_SPACES = {*whitespace}
 _GIT_LIST_CMD = (
@@ -176,8 +181,55 @@ def _parse(root: PurePath, stats: _Stats) -> VCStatus:
     return VCStatus(ignored=ignored, status=trimmed)
 
 
+def _vc_status(root: PurePath, main: str, submodules: str) -> VCStatus:
+    stats = chain(_parse_stats_main(main), _parse_sub_modules(submodules))
+    return _parse(root, stats=stats)
+
+
+def _compact(root: str, main: str, submodules: str) -> _Compact:
+    """
+    Flat strings instead of `PurePath`s, cheaper to pickle across processes
+    """
+
+    vc = _vc_status(PurePath(root), main=main, submodules=submodules)
+    ignored = tuple(map(str, vc.ignored))
+    status = tuple((str(path), stat) for path, stat in vc.status.items())
+    return ignored, status
+
+
+def _hydrate(compact: _Compact, prev: VCStatus) -> VCStatus:
+    """
+    Reuse the previous `PurePath`s and ignore set, most of them would not have changed
+    """
+
+    known = {str(path): path for path in chain(prev.ignored, prev.status)}
+
+    def cont(path: str) -> PurePath:
+        return known.get(path) or PurePath(path)
+
+    ignored, status = compact
+    new_ignored = {*map(cont, ignored)}
+    return VCStatus(
+        ignored=prev.ignored if new_ignored == prev.ignored else new_ignored,
+        status={cont(path): stat for path, stat in status},
+    )
+
+
+async def parse(
+    th: Executor, root: PurePath, main: str, submodules: str, prev: VCStatus
+) -> VCStatus:
+    loop = get_running_loop()
+    if isinstance(th, ProcessPoolExecutor):
+        compact = await loop.run_in_executor(th, _compact, str(root), main, submodules)
+        return await to_thread(lambda: _hydrate(compact, prev=prev))
+    else:
+        return await loop.run_in_executor(
+            th, lambda: _vc_status(root, main=main, submodules=submodules)
+        )
+
+
 @_die
-async def _status(cwd: PurePath) -> VCStatus:
+async def _status(th: Executor, cwd: PurePath, prev: VCStatus) -> VCStatus:
     if git := which("git"):
         bin = PurePath(git)
         try:
@@ -186,17 +238,42 @@ async def _status(cwd: PurePath) -> VCStatus:
                 _stat_main(bin, cwd=cwd),
                 _stat_sub_modules(bin, cwd=cwd),
             )
-            stats = chain((_parse_stats_main(main)), _parse_sub_modules(submodules))
         except CalledProcessError:
             return VCStatus()
         else:
-            return await to_thread(lambda: _parse(raw_root, stats=stats))
+            return await parse(
+                th, root=raw_root, main=main, submodules=submodules, prev=prev
+            )
     else:
         return VCStatus()
 
 
-async def status(cwd: PurePath, prev: VCStatus) -> VCStatus:
+def _ignored(root: Node) -> AbstractSet[PurePath]:
+    def cont(node: Node, rules: Rules) -> Iterator[PurePath]:
+        for child in node.children.values():
+            is_dir = Mode.folder in child.mode and not child.pointed
+            if is_ignored(rules, path=child.path, is_dir=is_dir):
+                yield child.path
+            elif child.children:
+                yield from cont(child, rules=(*rules, *load(child.path)))
+
+    return {*cont(root, rules=inherit(root.path))}
+
+
+async def prelim(th: Executor, root: Node) -> VCStatus:
+    """
+    Cheap first pass, from `.gitignore` files alone
+
+    Walks the live `Node` tree, so `th` has to be a thread pool, never `vcs`
+    """
+
+    loop = get_running_loop()
+    ignored = await loop.run_in_executor(th, lambda: _ignored(root))
+    return VCStatus(ignored=ignored)
+
+
+async def status(th: Executor, cwd: PurePath, prev: VCStatus) -> VCStatus:
     try:
-        return await _status(cwd)
+        return await _status(th, cwd=cwd, prev=prev)
     except CancelledError:
         return prev
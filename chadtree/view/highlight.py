@@ -1,5 +1,5 @@
-from typing import Iterator, Mapping, Tuple
-from uuid import uuid4
+from hashlib import blake2b
+from typing import Any, Iterator, Mapping, Tuple
 
 from pynvim_pp.highlight import HLgroup
 
@@ -18,10 +18,19 @@ LEGAL_CTERM = {
 LEGAL_CTERM_COLOURS = range(8)
 
 
+def hl_name(name_prefix: str, *attrs: Any) -> str:
+    """
+    Same attributes, same name, across restarts
+    """
+
+    digest = blake2b(repr(attrs).encode("UTF-8"), digest_size=8).hexdigest()
+    return f"{FM_HL_PREFIX}_{name_prefix}_{digest}"
+
+
 def gen_hl(name_prefix: str, mapping: Mapping[str, str]) -> Mapping[str, HLgroup]:
     def cont() -> Iterator[Tuple[str, HLgroup]]:
         for key, val in mapping.items():
-            name = f"{FM_HL_PREFIX}_{name_prefix}_{uuid4().hex}"
+            name = hl_name(name_prefix, val)
             yield key, HLgroup(name=name, guifg=val)
 
     return {k: v for k, v in cont()}
@@ -1,8 +1,11 @@
+from fnmatch import translate
 from itertools import chain
 from os import environ
+from re import IGNORECASE, compile
 from typing import Mapping, Tuple, TypeVar, Union
 
 from pynvim_pp.highlight import HLgroup
+from std2.platform import OS, os
 from std2.types import never
 
 from chad_types import (
@@ -17,7 +20,7 @@ from chad_types import (
 from ..consts import FM_HL_PREFIX
 from .highlight import gen_hl
 from .ls_colours import parse_lsc
-from .types import HLcontext, HLGroups
+from .types import GlobMatcher, HLcontext, HLGroups
 
 T = TypeVar("T")
 
@@ -26,6 +29,19 @@ def _trans(mapping: Mapping[T, HLgroup]) -> Mapping[T, str]:
     return {k: v.name for k, v in mapping.items()}
 
 
+def _globs(mapping: Mapping[str, HLgroup]) -> GlobMatcher:
+    """
+    One regex for all the globs, first match wins like looping `fnmatch`
+    """
+
+    globs = {
+        f"_{idx}": (glob, hl.name) for idx, (glob, hl) in enumerate(mapping.items())
+    }
+    alts = "|".join(f"(?P<{key}>{translate(glob)})" for key, (glob, _) in globs.items())
+    regex = compile(alts or "(?!)", flags=IGNORECASE if os is OS.windows else 0)
+    return GlobMatcher(regex=regex, values={key: hl for key, (_, hl) in globs.items()})
+
+
 def load_theme(
     artifact: Artifact,
     particular_mappings: HLGroups,
@@ -93,16 +109,17 @@ def load_theme(
     else:
         never(icon_colour_set)
 
-    groups = tuple(
-        chain(
+    groups = {
+        group.name: group
+        for group in chain(
             icon_exts.values(),
             mode_pre.values(),
             mode_post.values(),
             ext_exact.values(),
             name_exact.values(),
             name_glob.values(),
-        ),
-    )
+        )
+    }
 
     context = HLcontext(
         groups=groups,
@@ -111,7 +128,7 @@ def load_theme(
         mode_post=_trans(mode_post),
         ext_exact=_trans(ext_exact),
         name_exact=_trans(name_exact),
-        name_glob=_trans(name_glob),
+        name_glob=_globs(name_glob),
         particular_mappings=particular_mappings,
     )
 
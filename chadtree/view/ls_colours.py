@@ -12,13 +12,12 @@ from typing import (
     Tuple,
     Union,
 )
-from uuid import uuid4
 
 from pynvim_pp.highlight import HLgroup
 from std2.coloursys import rgb_to_hex
 
-from ..consts import FM_HL_PREFIX
 from ..fs.types import Mode
+from .highlight import hl_name
 
 
 class _Style(IntEnum):
@@ -249,7 +248,6 @@ def _parse_styling(codes: str) -> _Styling:
 
 def _parseHLGroup(styling: _Styling, discrete_colours: Mapping[str, str]) -> HLgroup:
     fg, bg = styling.foreground, styling.background
-    name = f"{FM_HL_PREFIX}_ls_{uuid4().hex}"
     cterm = {
         style
         for style in (_HL_STYLE_TABLE.get(style) for style in styling.styles)
@@ -268,7 +266,7 @@ def _parseHLGroup(styling: _Styling, discrete_colours: Mapping[str, str]) -> HLg
         else (discrete_colours.get(bg.name) if isinstance(bg, _AnsiColour) else None)
     )
     group = HLgroup(
-        name=name,
+        name=hl_name("ls", sorted(cterm), ctermfg, ctermbg, guifg, guibg),
         cterm=cterm,
         ctermfg=ctermfg,
         ctermbg=ctermbg,
@@ -5,6 +5,7 @@ from functools import lru_cache
 from locale import strxfrm
 from os.path import extsep, sep
 from pathlib import PurePath
+from time import time_ns
 from typing import (
     Any,
     AsyncIterator,
@@ -19,17 +20,19 @@ from typing import (
 )
 
 from pynvim_pp.lib import encode
+from std2.locale import si_prefixed
 from std2.platform import OS, os
 from std2.types import never
 
-from ..fs.cartographer import is_dir, user_ignored
-from ..fs.types import Mode, Node
+from ..fs.cartographer import is_dir, more_node, user_ignored
+from ..fs.types import DiskUsage, Mode, Node
 from ..nvim.types import Markers
+from ..settings.localization import LANG
 from ..settings.types import Settings
-from ..state.types import Diagnostics, FilterPattern, Index, Selection
+from ..state.types import Diagnostics, FilterPattern, Grep, Index, Selection
 from ..version_ctl.types import VCStatus
 from .ops import encode_for_display
-from .types import Badge, Derived, Highlight, Sortby
+from .types import Badge, Column, Derived, Highlight, Sortby
 
 
 class _CompVals(IntEnum):
@@ -81,6 +84,10 @@ def _gen_comp(sortby: Sequence[Sortby]) -> Callable[[Node], Any]:
                         yield strxfrm(node.path.name.casefold())
                     elif sb is Sortby.file_name:
                         yield strxfrm(node.path.name)
+                    elif sb is Sortby.mtime:
+                        yield -node.st_mtime_ns
+                    elif sb is Sortby.size:
+                        yield 0 if is_dir(node) else -node.st_size
                     else:
                         never(sb)
 
@@ -100,16 +107,42 @@ def _vc_ignored(node: Node, vc: VCStatus) -> bool:
         return ignored
 
 
+def _relative_time(now: int, then: int) -> str:
+    delta = max(0, now - then) // 10**9
+    for unit, secs in (("y", 31536000), ("w", 604800), ("d", 86400), ("h", 3600)):
+        if delta >= secs:
+            return f"{delta // secs}{unit}"
+    else:
+        return f"{delta // 60}m"
+
+
 def _gen_spacer(depth: int) -> str:
     return (depth * 2 - 1) * " "
 
 
+def _paint_more(settings: Settings, node: Node, depth: int) -> _NRender:
+    icons = settings.view.icons
+    context = settings.view.hl_context
+
+    pre = f"{_gen_spacer(depth)}{icons.status.not_selected}{icons.status.inactive} "
+    text = LANG("truncated", count=f"{node.truncated:,}")
+    begin = len(encode(pre))
+    hl = Highlight(
+        group=context.particular_mappings.ignored,
+        begin=begin,
+        end=begin + len(encode(text)),
+    )
+    return more_node(node), f"{pre}{text}", (hl,), ()
+
+
 def _paint(
     settings: Settings,
     index: Index,
     selection: Selection,
     markers: Markers,
     diagnostics: Diagnostics,
+    disk_usage: DiskUsage,
+    grep: Optional[Grep],
     vc: VCStatus,
     follow_links: bool,
     show_hidden: bool,
@@ -117,6 +150,7 @@ def _paint(
 ) -> Callable[[Node, int], Awaitable[Optional[_Render]]]:
     icons = settings.view.icons
     context = settings.view.hl_context
+    now = time_ns()
 
     def search_icon_hl(node: Node, ignored: bool) -> Optional[str]:
         if ignored:
@@ -138,9 +172,8 @@ def _paint(
         if hl := context.name_exact.get(node.path.name):
             return hl
 
-        for pattern, hl in context.name_glob.items():
-            if fnmatch(node.path.name, pattern):
-                return hl
+        if match := context.name_glob.regex.match(node.path.name):
+            return context.name_glob.values[cast(str, match.lastgroup)]
 
         if hl := context.ext_exact.get(_lax_suffix(node.path)):
             return hl
@@ -210,7 +243,8 @@ def _paint(
             else:
                 yield icons.link.normal
 
-    def gen_badges(path: PurePath) -> Iterator[Badge]:
+    def gen_badges(node: Node) -> Iterator[Badge]:
+        path = node.path
         l = ""
         if diagnostic := diagnostics.get(path, {}):
             l = " "
@@ -250,6 +284,26 @@ def _paint(
                 group=context.particular_mappings.version_control,
             )
 
+        if grep and (count := grep.counts.get(path)):
+            yield Badge(text=f" #{count}", group=context.particular_mappings.grep)
+
+        for column in settings.view.columns:
+            if column is Column.size:
+                if not is_dir(node):
+                    text = f" {si_prefixed(node.st_size, precision=1)}b"
+                elif (size := disk_usage.sizes.get(path)) is not None:
+                    pending = "…" if path in disk_usage.pending else ""
+                    text = f" {si_prefixed(size, precision=1)}b{pending}"
+                else:
+                    continue
+            elif column is Column.mtime:
+                if not node.st_mtime_ns:
+                    continue
+                text = f" {_relative_time(now, then=node.st_mtime_ns)}"
+            else:
+                never(column)
+            yield Badge(text=text, group=context.particular_mappings.columns)
+
     def gen_highlights(
         node: Node, pre: str, icon: str, name: str, ignored: bool
     ) -> Iterator[Highlight]:
@@ -280,7 +334,7 @@ def _paint(
             post = "".join(gen_decor_post(node))
 
             line = f"{pre}{icon}{name}{post}"
-            badges = tuple(gen_badges(node.path))
+            badges = tuple(gen_badges(node))
             highlights = tuple(
                 gen_highlights(node, pre=pre, icon=icon, name=name, ignored=ignored)
             )
@@ -298,6 +352,8 @@ async def render(
     filter_pattern: Optional[FilterPattern],
     markers: Markers,
     diagnostics: Diagnostics,
+    disk_usage: DiskUsage,
+    grep: Optional[Grep],
     vc: VCStatus,
     follow_links: bool,
     show_hidden: bool,
@@ -309,6 +365,8 @@ async def render(
         selection=selection,
         markers=markers,
         diagnostics=diagnostics,
+        disk_usage=disk_usage,
+        grep=grep,
         vc=vc,
         follow_links=follow_links,
         show_hidden=show_hidden,
@@ -336,6 +394,8 @@ async def render(
                 yield (node, *shown)
             for child in children:
                 yield child
+            if node.truncated and (clear or children):
+                yield _paint_more(settings, node=node, depth=depth + 1)
 
     rendered = [r async for r in rend(node, depth=0, cleared=False)]
     _nodes, _lines, _highlights, _badges = zip(*rendered)
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from enum import Enum, auto
 from pathlib import PurePath
-from typing import Mapping, Optional, Sequence
+from typing import Mapping, Optional, Pattern, Sequence
 
 from pynvim_pp.highlight import HLgroup
 
@@ -20,16 +20,24 @@ class HLGroups:
     diagnostic_unknown: str
     diagnostic_context: str
     version_control: str
+    columns: str
+    grep: str
+
+
+@dataclass(frozen=True)
+class GlobMatcher:
+    regex: Pattern[str]
+    values: Mapping[str, str]
 
 
 @dataclass(frozen=True)
 class HLcontext:
-    groups: Sequence[HLgroup]
+    groups: Mapping[str, HLgroup]
     icon_exts: Mapping[str, str]
     mode_pre: Mapping[Mode, str]
     mode_post: Mapping[Optional[Mode], str]
     name_exact: Mapping[str, str]
-    name_glob: Mapping[str, str]
+    name_glob: GlobMatcher
     ext_exact: Mapping[str, str]
     particular_mappings: HLGroups
 
@@ -39,12 +47,20 @@ class Sortby(Enum):
     ext = auto()
     file_name_lower = auto()
     file_name = auto()
+    mtime = auto()
+    size = auto()
+
+
+class Column(Enum):
+    size = auto()
+    mtime = auto()
 
 
 @dataclass(frozen=True)
 class ViewOptions:
     hl_context: HLcontext
     icons: IconGlyphs
+    columns: Sequence[Column]
     sort_by: Sequence[Sortby]
     time_fmt: str
     use_icons: bool
@@ -195,6 +195,15 @@ vim.api.nvim_command [[command! -nargs=* CHADhelp lua chad.Help(<f-args>)]]
 set_chad_call("Restore")
 vim.api.nvim_command [[command! -nargs=0 CHADrestore lua chad.Restore(<f-args>)]]
 
+set_chad_call("Stats")
+vim.api.nvim_command [[command! -nargs=0 CHADstats lua chad.Stats(<f-args>)]]
+
+set_chad_call("Trace")
+vim.api.nvim_command [[command! -nargs=0 CHADtrace lua chad.Trace(<f-args>)]]
+
+set_chad_call("Profile")
+vim.api.nvim_command [[command! -nargs=? CHADprofile lua chad.Profile(<f-args>)]]
+
 chad.lsp_ensure_capabilities = function(cfg)
   local spec1 = {
     capabilities = vim.lsp.protocol.make_client_capabilities()
@@ -0,0 +1,39 @@
+from asyncio import run
+from concurrent.futures import ThreadPoolExecutor
+from os import readlink, symlink
+from pathlib import Path, PurePath
+from tempfile import TemporaryDirectory
+from typing import Mapping
+from unittest import TestCase
+
+from chadtree.fs.copy import copy_tree
+from chadtree.fs.progress import Progress
+
+
+async def _copy(operations: Mapping[PurePath, PurePath]) -> None:
+    with ThreadPoolExecutor() as th:
+        await copy_tree(th, operations=operations, concurrency=2, progress=Progress())
+
+
+class CopyTree(TestCase):
+    def test_link_outside_tree(self) -> None:
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            outside = root / "outside"
+            outside.mkdir()
+            (outside / "big").write_bytes(b"1" * 10)
+
+            src = root / "src"
+            src.mkdir()
+            (src / "file").write_bytes(b"2")
+            symlink(outside, src / "dir_link")
+            symlink(outside / "big", src / "file_link")
+
+            dst = root / "dst"
+            run(_copy({src: dst}))
+
+            self.assertEqual((dst / "file").read_bytes(), b"2")
+            for name in ("dir_link", "file_link"):
+                self.assertTrue((dst / name).is_symlink())
+                self.assertEqual(readlink(dst / name), readlink(src / name))
+            self.assertEqual({*outside.iterdir()}, {outside / "big"})
@@ -0,0 +1,35 @@
+from asyncio import run
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePath
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from chadtree.fs.du import disk_usage
+from chadtree.fs.types import DiskUsage
+
+
+async def _du(root: PurePath) -> int:
+    async def report(_: DiskUsage) -> None:
+        pass
+
+    with ThreadPoolExecutor() as th:
+        usage = await disk_usage(
+            th, roots={root}, concurrency=2, interval=1, report=report
+        )
+    return usage.sizes[root]
+
+
+class DiskUsageTest(TestCase):
+    def test_grown_file(self) -> None:
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "sub").mkdir()
+            file = root / "sub" / "file"
+            file.write_bytes(b"1" * 10)
+            self.assertEqual(run(_du(root)), 10)
+
+            mtime = (root / "sub").stat().st_mtime_ns
+            with file.open("ab") as fd:
+                fd.write(b"2" * 5)
+            self.assertEqual((root / "sub").stat().st_mtime_ns, mtime)
+            self.assertEqual(run(_du(root)), 15)
@@ -0,0 +1,65 @@
+from asyncio import gather, run, sleep
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePath
+from tempfile import TemporaryDirectory
+from typing import Any, Mapping, MutableSequence
+from unittest import TestCase
+from unittest.mock import patch
+
+from chadtree.fs.journal import Journal
+from chadtree.fs.ops import copy
+from chadtree.fs.progress import Progress
+
+
+async def _overlap(root: Path, *operations: Mapping[PurePath, PurePath]) -> int:
+    """
+    Most copies seen in flight at once
+    """
+
+    journal = Journal(
+        path=root / "journal" / "current.jsonl", staging=root / "staging", keep=0
+    )
+    active: MutableSequence[None] = []
+    peak = 0
+
+    async def copy_tree(*_: Any, **__: Any) -> None:
+        nonlocal peak
+        active.append(None)
+        peak = max(peak, len(active))
+        await sleep(0.05)
+        active.pop()
+
+    with ThreadPoolExecutor() as th, patch("chadtree.fs.ops.copy_tree", copy_tree):
+        await gather(
+            *(
+                copy(th, operations=ops, progress=Progress(), journal=journal)
+                for ops in operations
+            )
+        )
+    return peak
+
+
+class Locks(TestCase):
+    def test_separate_subtrees_overlap(self) -> None:
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            peak = run(
+                _overlap(
+                    root,
+                    {root / "a" / "src": root / "a" / "dst"},
+                    {root / "b" / "src": root / "b" / "dst"},
+                )
+            )
+            self.assertEqual(peak, 2)
+
+    def test_overlapping_subtrees_serialize(self) -> None:
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            peak = run(
+                _overlap(
+                    root,
+                    {root / "a" / "src": root / "a" / "dst"},
+                    {root / "b" / "src": root / "a" / "dst" / "nested"},
+                )
+            )
+            self.assertEqual(peak, 1)
@@ -0,0 +1,93 @@
+from asyncio import run
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePath
+from tempfile import TemporaryDirectory
+from typing import Any, Mapping
+from unittest import TestCase
+from unittest.mock import patch
+
+from chadtree.fs.journal import (
+    Journal,
+    Op,
+    Phase,
+    Step,
+    advance,
+    advanced,
+    new_batch,
+    record,
+)
+from chadtree.fs.ops import move, resume_move
+from chadtree.fs.progress import Progress
+
+
+def _journal(root: Path, name: str) -> Journal:
+    return Journal(
+        path=root / "journal" / f"{name}.jsonl", staging=root / "staging", keep=0
+    )
+
+
+def _across(*_: Any) -> bool:
+    return False
+
+
+async def _move(operations: Mapping[PurePath, PurePath], journal: Journal) -> None:
+    with ThreadPoolExecutor() as th:
+        await move(th, operations=operations, progress=Progress(), journal=journal)
+
+
+async def _resume(orphan: Journal, step: Step, journal: Journal) -> None:
+    with ThreadPoolExecutor() as th:
+        await resume_move(
+            th, orphan=orphan, step=step, progress=Progress(), journal=journal
+        )
+
+
+@patch("chadtree.fs.ops._same_device", _across)
+class Move(TestCase):
+    def test_rollback_removes_made_parents(self) -> None:
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            src = root / "src"
+            src.write_bytes(b"1")
+            dst = root / "a" / "b" / "dst"
+
+            with patch("chadtree.fs.ops._verify", side_effect=OSError):
+                with self.assertRaises(OSError):
+                    run(_move({src: dst}, journal=_journal(root, "current")))
+
+            self.assertEqual(src.read_bytes(), b"1")
+            self.assertFalse((root / "a").exists())
+
+    def test_resume_skips_copied(self) -> None:
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            src, dst = root / "src", root / "dst"
+            src.mkdir()
+            (src / "done").write_bytes(b"1")
+            (src / "todo").write_bytes(b"2")
+            dst.mkdir()
+            (dst / "done").write_bytes(b"X")
+
+            orphan, journal = _journal(root, "orphan"), _journal(root, "current")
+            step = Step(
+                batch=new_batch(),
+                op=Op.move,
+                phase=Phase.planned,
+                operations=((src, dst),),
+            )
+            record(
+                orphan,
+                batch=step.batch,
+                op=step.op,
+                phase=step.phase,
+                operations=dict(step.operations),
+            )
+            advance(orphan, batch=step.batch, files={src / "done": dst / "done"})
+
+            run(_resume(orphan, step=step, journal=journal))
+
+            self.assertFalse(src.exists())
+            self.assertEqual((dst / "done").read_bytes(), b"X")
+            self.assertEqual((dst / "todo").read_bytes(), b"2")
+            self.assertFalse(advanced(orphan, batch=step.batch).files)
+            self.assertFalse([*(root / "journal").glob("*.progress")])